@@ -1,2 +1,134 @@
 ## @file app/config.py
-# Configuration file for the FastAPI application
\ No newline at end of file
+# Configuration file for the FastAPI application
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Lee una variable de entorno booleana ('1', 'true', 'yes', 'on')"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Modelo de emociones
+EMOTION_MODEL_PATH = os.getenv(
+    "EMOTION_MODEL_PATH", "models/RESNET50/emotion_recognition_resnet50v2.keras"
+)
+EMOTION_MODEL_VERSION = os.getenv("EMOTION_MODEL_VERSION", "resnet50v2")
+# /models/reload sólo acepta ficheros dentro de este directorio
+EMOTION_MODELS_DIR = os.getenv("EMOTION_MODELS_DIR", "models")
+EMOTION_MODEL_WARMUP = _env_bool("EMOTION_MODEL_WARMUP", True)
+# Backend del clasificador: auto (por la extensión del fichero), keras o tflite
+EMOTION_MODEL_BACKEND = os.getenv("EMOTION_MODEL_BACKEND", "auto")
+EMOTION_MODEL_TFLITE_THREADS = int(os.getenv("EMOTION_MODEL_TFLITE_THREADS", "0"))  # 0 = lo que decida TFLite
+
+# Micro-batching de inferencia entre peticiones concurrentes
+INFERENCE_BATCHING_ENABLED = _env_bool("INFERENCE_BATCHING_ENABLED", True)
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))
+
+# Executor para las etapas de CPU (decodificación, detección, clasificación, codificación)
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")  # thread | process
+INFERENCE_EXECUTOR_WORKERS = int(os.getenv("INFERENCE_EXECUTOR_WORKERS", str(os.cpu_count() or 1)))
+
+# Pool de procesos de inferencia con traspaso de frames por memoria compartida
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))  # 0 = desactivado
+INFERENCE_WORKER_SLOTS = int(os.getenv("INFERENCE_WORKER_SLOTS", "0"))  # 0 = 2 por worker
+INFERENCE_WORKER_SLOT_BYTES = int(os.getenv("INFERENCE_WORKER_SLOT_BYTES", str(1920 * 1080 * 3)))
+
+# Post-procesado de la detección de rostros
+FACE_CONFIDENCE_THRESHOLD = float(os.getenv("FACE_CONFIDENCE_THRESHOLD", "0.4"))
+FACE_NMS_THRESHOLD = float(os.getenv("FACE_NMS_THRESHOLD", "0.3"))
+FACE_MIN_SIZE = int(os.getenv("FACE_MIN_SIZE", "20"))
+FACE_MAX_PER_FRAME = int(os.getenv("FACE_MAX_PER_FRAME", "20"))
+
+# Detector de rostros por defecto: ssd, haar, ssd-downscaled o haar-downscaled
+# (cada petición puede elegir otro con el parámetro `detector`)
+FACE_DETECTOR = os.getenv("FACE_DETECTOR", "ssd")
+FACE_SSD_INPUT_SIZE = int(os.getenv("FACE_SSD_INPUT_SIZE", "300"))  # lado de la entrada de la red SSD
+FACE_HAAR_CASCADE_PATH = os.getenv("FACE_HAAR_CASCADE_PATH", "face_detector/haarcascade_frontalface2.xml")
+FACE_HAAR_SCALE_FACTOR = float(os.getenv("FACE_HAAR_SCALE_FACTOR", "1.1"))
+FACE_HAAR_MIN_NEIGHBORS = int(os.getenv("FACE_HAAR_MIN_NEIGHBORS", "5"))
+FACE_DOWNSCALE_MAX_SIDE = int(os.getenv("FACE_DOWNSCALE_MAX_SIDE", "320"))  # lado mayor del frame reducido
+
+# Procesamiento por lotes de imágenes (/process-images)
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_MAX_IMAGE_BYTES = int(os.getenv("BATCH_MAX_IMAGE_BYTES", str(20 * 1024 * 1024)))
+
+# Análisis de ficheros de vídeo subidos
+VIDEO_DEFAULT_SAMPLE_FPS = float(os.getenv("VIDEO_DEFAULT_SAMPLE_FPS", "2"))
+VIDEO_MAX_CONCURRENCY = int(os.getenv("VIDEO_MAX_CONCURRENCY", str(os.cpu_count() or 1)))
+VIDEO_UPLOAD_CHUNK_BYTES = int(os.getenv("VIDEO_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+# Seguimiento de rostros entre frames de la webcam
+TRACKING_ENABLED = _env_bool("TRACKING_ENABLED", True)
+TRACKER_IOU_THRESHOLD = float(os.getenv("TRACKER_IOU_THRESHOLD", "0.3"))
+TRACKER_RECLASSIFY_IOU = float(os.getenv("TRACKER_RECLASSIFY_IOU", "0.6"))
+TRACKER_REFRESH_FRAMES = int(os.getenv("TRACKER_REFRESH_FRAMES", "15"))
+TRACKER_MAX_MISSES = int(os.getenv("TRACKER_MAX_MISSES", "3"))
+TRACKER_SMOOTHING = float(os.getenv("TRACKER_SMOOTHING", "0.6"))
+
+# Reutilización de resultados en escenas estáticas (webcam)
+MOTION_GATE_ENABLED = _env_bool("MOTION_GATE_ENABLED", True)
+MOTION_THRESHOLD = float(os.getenv("MOTION_THRESHOLD", "4.0"))  # diferencia media (0-255)
+MOTION_GATE_MAX_AGE_S = float(os.getenv("MOTION_GATE_MAX_AGE_S", "5"))
+
+# Caché de resultados de /process-image por contenido
+RESULT_CACHE_ENABLED = _env_bool("RESULT_CACHE_ENABLED", True)
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+RESULT_CACHE_TTL_S = float(os.getenv("RESULT_CACHE_TTL_S", "3600"))
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "")  # vacío = sin nivel en disco
+RESULT_CACHE_DISK_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_DISK_MAX_ENTRIES", "10000"))
+
+# Snapshots del historial (JPEG deduplicado por contenido)
+SNAPSHOT_JPEG_QUALITY = int(os.getenv("SNAPSHOT_JPEG_QUALITY", "70"))
+SNAPSHOT_THUMBNAIL_SIZE = int(os.getenv("SNAPSHOT_THUMBNAIL_SIZE", "320"))  # lado mayor; 0 = sin miniatura
+
+# Backend del historial
+HISTORY_BACKEND = os.getenv("HISTORY_BACKEND", "memory")  # memory | sqlite
+HISTORY_MEMORY_MAX_RECORDS = int(os.getenv("HISTORY_MEMORY_MAX_RECORDS", "100"))
+HISTORY_SQLITE_PATH = os.getenv("HISTORY_SQLITE_PATH", "data/history.sqlite3")
+HISTORY_MAX_RECORDS = int(os.getenv("HISTORY_MAX_RECORDS", "0"))  # SQLite; 0 = sin límite
+HISTORY_RETENTION_DAYS = float(os.getenv("HISTORY_RETENTION_DAYS", "0"))  # 0 = sin caducidad
+
+# Escritura diferida del historial (fuera del camino de la petición)
+HISTORY_WRITE_BEHIND = _env_bool("HISTORY_WRITE_BEHIND", True)
+HISTORY_QUEUE_MAX_SIZE = int(os.getenv("HISTORY_QUEUE_MAX_SIZE", "128"))  # trabajos (cada uno puede llevar un frame)
+HISTORY_QUEUE_FULL_POLICY = os.getenv("HISTORY_QUEUE_FULL_POLICY", "drop")  # drop | block
+HISTORY_WRITE_BATCH_SIZE = int(os.getenv("HISTORY_WRITE_BATCH_SIZE", "32"))
+HISTORY_FLUSH_TIMEOUT_S = float(os.getenv("HISTORY_FLUSH_TIMEOUT_S", "10"))
+
+# Agregados incrementales de emociones (/history/stats)
+ROLLUP_MINUTE_RETENTION_H = float(os.getenv("ROLLUP_MINUTE_RETENTION_H", "48"))
+ROLLUP_HOUR_RETENTION_D = float(os.getenv("ROLLUP_HOUR_RETENTION_D", "90"))
+
+# Exportación del historial
+HISTORY_EXPORT_BATCH_SIZE = int(os.getenv("HISTORY_EXPORT_BATCH_SIZE", "500"))  # registros leídos por lote
+
+# Difusión MJPEG de la webcam (una codificación por frame y calidad)
+MJPEG_QUALITY_TIERS = os.getenv("MJPEG_QUALITY_TIERS", "low:50,medium:70,high:80")  # nombre:calidad JPEG
+MJPEG_DEFAULT_TIER = os.getenv("MJPEG_DEFAULT_TIER", "high")
+MJPEG_MAX_FPS = float(os.getenv("MJPEG_MAX_FPS", "30"))
+MJPEG_SUBSCRIBER_QUEUE = int(os.getenv("MJPEG_SUBSCRIBER_QUEUE", "2"))  # frames pendientes por cliente
+
+# WebSocket de frames enviados por el cliente (/api/v1/realtime/ws)
+REALTIME_MAX_CONNECTIONS = int(os.getenv("REALTIME_MAX_CONNECTIONS", "100"))
+REALTIME_MAX_FPS = float(os.getenv("REALTIME_MAX_FPS", "15"))  # frames por segundo y conexión
+REALTIME_BURST = int(os.getenv("REALTIME_BURST", "5"))
+REALTIME_MAX_FRAME_BYTES = int(os.getenv("REALTIME_MAX_FRAME_BYTES", str(2 * 1024 * 1024)))
+
+# Inferencia continua de la webcam en segundo plano
+WEBCAM_BACKGROUND_INFERENCE = _env_bool("WEBCAM_BACKGROUND_INFERENCE", False)
+WEBCAM_INFERENCE_FPS = float(os.getenv("WEBCAM_INFERENCE_FPS", "5"))
+WEBCAM_LONG_POLL_TIMEOUT_S = float(os.getenv("WEBCAM_LONG_POLL_TIMEOUT_S", "30"))  # espera máxima de after_seq
+WEBCAM_FRAME_SLOTS = int(os.getenv("WEBCAM_FRAME_SLOTS", "4"))  # buffers preasignados por fuente
+
+# Fuentes de vídeo (id=origen separados por comas). Origen: índice de cámara,
+# ruta o URL de vídeo, o "loop:ruta" para repetir un clip local indefinidamente
+CAMERA_SOURCES = os.getenv("CAMERA_SOURCES", "default=0")
+CAMERA_MAX_CONCURRENT_INFERENCES = int(os.getenv("CAMERA_MAX_CONCURRENT_INFERENCES", "2"))
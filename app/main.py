@@ -2,18 +2,24 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import history_router, image_processing_router, video_processing_router
-from app.middleware.serialization_middleware import serialization_middleware
+from app.routes import history_router, image_processing_router, video_processing_router, model_router, metrics_router, video_analysis_router, realtime_router
+from app.models.model_registry import model_registry
+from app.services.inference_scheduler import inference_scheduler
+from app.services.executor import cpu_executor
+from app.services.inference_workers import inference_workers
+from app.services.history_repository import history_repo
+from app.services.history_writer import history_writer
+from app.config import EMOTION_MODEL_PATH, EMOTION_MODEL_VERSION
+from app.utils.responses import FastJSONResponse
 
 app = FastAPI(
     title="Emotion Detection API",
     description="API for real-time emotion detection using RESNET50V2 model",
-    version="1.0.0"
+    version="1.0.0",
+    # Serialización JSON en una sola pasada con soporte nativo de tipos NumPy
+    default_response_class=FastJSONResponse
 )
 
-# Middleware to convert NumPy types to native Python types
-app.middleware("http")(serialization_middleware)
-
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +34,10 @@ app.add_middleware(
 app.include_router(image_processing_router.router, prefix="/api/v1/detection", tags=["detection"])
 app.include_router(history_router.router, prefix="/api/v1/history", tags=["history"])
 app.include_router(video_processing_router.router, prefix="/api/v1/webcam", tags=["webcam"])
+app.include_router(video_analysis_router.router, prefix="/api/v1/video", tags=["video"])
+app.include_router(realtime_router.router, prefix="/api/v1/realtime", tags=["realtime"])
+app.include_router(model_router.router, prefix="/api/v1/models", tags=["models"])
+app.include_router(metrics_router.router, prefix="/api/v1/metrics", tags=["metrics"])
 
 @app.get("/")
 async def root():
@@ -35,10 +45,18 @@ async def root():
 
 @app.on_event("startup")
 async def startup_event():
-    # Puedes inicializar recursos costosos aquí
-    pass
+    # Cargar los modelos una sola vez por proceso (incluye warm-up)
+    model_registry.load(EMOTION_MODEL_VERSION, EMOTION_MODEL_PATH)
+    cpu_executor.start()
+    inference_scheduler.start()
+    inference_workers.start(EMOTION_MODEL_PATH, EMOTION_MODEL_VERSION)
+    history_writer.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    # Limpieza de recursos
-    pass
\ No newline at end of file
+    # Limpieza de recursos (primero se vacía la cola del historial)
+    await history_writer.stop()
+    await inference_scheduler.stop()
+    inference_workers.stop()
+    cpu_executor.shutdown()
+    await history_repo.close()
\ No newline at end of file
@@ -0,0 +1,87 @@
+## @file app/models/classifiers.py
+
+import threading
+from typing import Optional
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model # type: ignore
+from app.config import EMOTION_MODEL_BACKEND, EMOTION_MODEL_TFLITE_THREADS
+
+CLASSIFIER_BACKENDS = ("keras", "tflite")
+
+def resolve_backend(model_path: str, backend: str = EMOTION_MODEL_BACKEND) -> str:
+    """'auto' elige por la extensión del fichero: .tflite -> tflite, el resto -> keras"""
+    if backend == "auto":
+        return "tflite" if model_path.lower().endswith(".tflite") else "keras"
+    if backend not in CLASSIFIER_BACKENDS:
+        raise ValueError(f"Backend de clasificador no válido: {backend} (disponibles: auto, {', '.join(CLASSIFIER_BACKENDS)})")
+    return backend
+
+class EmotionClassifier:
+    """Interfaz común: `predict(batch)` recibe (N, 224, 224, 3) float32 y devuelve (N, 7)"""
+
+    backend = "base"
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+class KerasClassifier(EmotionClassifier):
+    backend = "keras"
+
+    def __init__(self, model_path: str):
+        self.model = load_model(model_path)
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        return self.model.predict(faces, verbose=0)
+
+class TFLiteClassifier(EmotionClassifier):
+    """Modelo exportado con `app.models.export_tflite` (float, float16 o cuantizado).
+
+    El intérprete no admite llamadas concurrentes, así que se serializan con
+    un lock; el tamaño del lote se ajusta solo cuando cambia. Si el modelo
+    tiene entrada/salida enteras (int8) se cuantiza y descuantiza aquí.
+    """
+
+    backend = "tflite"
+
+    def __init__(self, model_path: str, num_threads: int = EMOTION_MODEL_TFLITE_THREADS):
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads or None)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size: Optional[int] = int(self._input["shape"][0])
+        self._lock = threading.Lock()
+
+    def _quantize(self, faces: np.ndarray) -> np.ndarray:
+        dtype = self._input["dtype"]
+        if dtype == np.float32:
+            return faces.astype(np.float32, copy=False)
+        scale, zero_point = self._input["quantization"]
+        info = np.iinfo(dtype)
+        return np.clip(np.round(faces / scale + zero_point), info.min, info.max).astype(dtype)
+
+    def _dequantize(self, preds: np.ndarray) -> np.ndarray:
+        if self._output["dtype"] == np.float32:
+            return preds
+        scale, zero_point = self._output["quantization"]
+        return (preds.astype(np.float32) - zero_point) * scale
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        with self._lock:
+            if len(faces) != self._batch_size:
+                self.interpreter.resize_tensor_input(
+                    self._input["index"], [len(faces), *faces.shape[1:]], strict=False
+                )
+                self.interpreter.allocate_tensors()
+                self._input = self.interpreter.get_input_details()[0]
+                self._output = self.interpreter.get_output_details()[0]
+                self._batch_size = len(faces)
+            self.interpreter.set_tensor(self._input["index"], self._quantize(faces))
+            self.interpreter.invoke()
+            preds = self.interpreter.get_tensor(self._output["index"])
+        return self._dequantize(preds)
+
+def load_classifier(model_path: str, backend: str = EMOTION_MODEL_BACKEND) -> EmotionClassifier:
+    if resolve_backend(model_path, backend) == "tflite":
+        return TFLiteClassifier(model_path)
+    return KerasClassifier(model_path)
@@ -1,94 +1,148 @@
 ## @file app/models/emotion_model.py
 
-import cv2
+import threading
 import numpy as np
-from tensorflow.keras.models import load_model # type: ignore
-from tensorflow.keras.utils import img_to_array # type: ignore
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.config import EMOTION_MODEL_BACKEND, FACE_DETECTOR
+from app.models.classifiers import EmotionClassifier, load_classifier, resolve_backend
+from app.models.face_detectors import FACE_DETECTOR_NAMES, FaceDetector, create_face_detector
+from app.utils.image_processing import preprocess_faces
+
+# Mapear a los nombres de emociones que espera tu frontend
+EMOTION_MAPPING = {
+    'angry': 'anger',
+    'disgust': 'disgust',
+    'fear': 'fear',
+    'happy': 'joy',
+    'neutral': 'neutral',
+    'sad': 'sadness',
+    'surprise': 'surprise'
+}
 
 class EmotionModel:
-    def __init__(self, model_path: str = "models/RESNET50/emotion_recognition_resnet50v2.keras"):
-        # Cargar modelo de emociones
-        self.emotion_model = load_model(model_path)
+    def __init__(
+        self,
+        model_path: str = "models/RESNET50/emotion_recognition_resnet50v2.keras",
+        version: str = "default",
+        backend: str = EMOTION_MODEL_BACKEND,
+        classifier: Optional[EmotionClassifier] = None,
+        detectors: Optional[Dict[str, FaceDetector]] = None,
+        default_detector: str = FACE_DETECTOR,
+        lazy: bool = False
+    ):
+        """`classifier` y `detectors` permiten inyectar instancias ya construidas
+        (p. ej. los modelos simulados de los benchmarks) en lugar de cargar ficheros.
+        Con `lazy=True` no se carga nada hasta el primer uso (el proceso principal
+        cuando la inferencia corre en `inference_workers`)."""
+        # Cargar modelo de emociones (Keras o TFLite exportado)
+        self.model_path = model_path
+        self.version = version
+        self._backend = backend
+        self._classifier = classifier
+        self._classifier_lock = threading.Lock()
+        if classifier is None and not lazy:
+            self._classifier = load_classifier(model_path, backend)
+        # Los procesos de inferencia reconstruyen el modelo desde model_path
+        self.from_files = classifier is None and not detectors
+        self.backend = classifier.backend if classifier is not None else resolve_backend(model_path, backend)
         self.classes = ['angry', 'disgust', 'fear', 'happy', 'neutral', 'sad', 'surprise']
-        
-        # Cargar modelo de detección de rostros
-        self.prototxt_path = "face_detector/deploy.prototxt"
-        self.weights_path = "face_detector/res10_300x300_ssd_iter_140000.caffemodel"
-        self.face_net = cv2.dnn.readNet(self.prototxt_path, self.weights_path)
-    
-    def detect_faces(self, frame):
-        (h, w) = frame.shape[:2]
-        blob = cv2.dnn.blobFromImage(frame, 1.0, (300, 300), (104.0, 177.0, 123.0))
-        self.face_net.setInput(blob)
-        detections = self.face_net.forward()
-        return detections, h, w
-    
-    def predict_emotion(self, frame):
-        # Detectar rostros
-        detections, h, w = self.detect_faces(frame)
-        
-        faces = []
-        locs = []
-        preds = []
-        
-        for i in range(0, detections.shape[2]):
-            confidence = detections[0, 0, i, 2]
-            
-            if confidence > 0.4:
-                box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-                (Xi, Yi, Xf, Yf) = box.astype("int")
-
-                Xi, Yi = max(0, Xi), max(0, Yi)
-                Xf, Yf = min(w - 1, Xf), min(h - 1, Yf)
-                
-                face = frame[Yi:Yf, Xi:Xf]
-                if face.size == 0:
-                    continue
-                    
-                # Preprocesamiento para el modelo RESNET50V2
-                face = cv2.cvtColor(face, cv2.COLOR_BGR2RGB)
-                face = cv2.resize(face, (224, 224))
-                face = img_to_array(face)
-                face = np.expand_dims(face, axis=0)
-                face = face / 255.0
-
-                # Predecir emociones
-                pred = self.emotion_model.predict(face, verbose=0)[0]
-                
-                # Mapear a los nombres de emociones que espera tu frontend
-                emotion_mapping = {
-                    'angry': 'anger',
-                    'disgust': 'disgust',
-                    'fear': 'fear',
-                    'happy': 'joy',
-                    'neutral': 'neutral',
-                    'sad': 'sadness',
-                    'surprise': 'surprise'
-                }
-                
-                # Convertir predicción al formato esperado
-                emotion_scores = {
-                    emotion_mapping[self.classes[i]]: float(pred[i]) 
-                    for i in range(len(self.classes))
-                }
-                
-                # Normalizar scores para que sumen 1
-                total = sum(emotion_scores.values())
-                normalized_scores = {k: v/total for k, v in emotion_scores.items()}
-                
-                # Determinar emoción dominante
-                dominant_idx = np.argmax(pred)
-                dominant_emotion = emotion_mapping[self.classes[dominant_idx]]
-                
-                faces.append({
-                    "box": {
-                        "x": Xi,
-                        "y": Yi,
-                        "width": Xf - Xi,
-                        "height": Yf - Yi
-                    },
-                    "scores": normalized_scores,
-                    "dominant_emotion": dominant_emotion
-                })
-        
-        return faces
\ No newline at end of file
+        self.labels = [EMOTION_MAPPING[c] for c in self.classes]
+
+        # Detectores de rostros: el de por defecto se carga ya, el resto al primer uso
+        self.default_detector = default_detector
+        self._detectors: Dict[str, FaceDetector] = dict(detectors or {})
+        self._detectors_lock = threading.Lock()
+        if not lazy:
+            self.get_detector()
+
+    @property
+    def classifier(self) -> EmotionClassifier:
+        if self._classifier is None:
+            with self._classifier_lock:
+                if self._classifier is None:
+                    self._classifier = load_classifier(self.model_path, self._backend)
+        return self._classifier
+
+    def detector_name(self, name: Optional[str] = None) -> str:
+        """Valida el nombre del detector sin construirlo (None = el de la configuración)"""
+        name = name or self.default_detector
+        if name not in self._detectors and name not in FACE_DETECTOR_NAMES:
+            raise ValueError(
+                f"Detector de rostros no válido: {name} (disponibles: {', '.join(FACE_DETECTOR_NAMES)})"
+            )
+        return name
+
+    def get_detector(self, name: Optional[str] = None) -> FaceDetector:
+        """Detector por nombre (None = el de la configuración); ValueError si no existe"""
+        name = self.detector_name(name)
+        detector = self._detectors.get(name)
+        if detector is None:
+            with self._detectors_lock:
+                detector = self._detectors.get(name)
+                if detector is None:
+                    detector = create_face_detector(name)
+                    self._detectors[name] = detector
+        return detector
+
+    def warmup(self) -> None:
+        """Ejecuta una inferencia en vacío para inicializar los grafos de ambos modelos"""
+        self.get_detector().warmup()
+        self.classifier.predict(np.zeros((1, 224, 224, 3), dtype=np.float32))
+
+    def locate_faces(self, frame, detector: Optional[str] = None) -> List[Tuple[int, int, int, int]]:
+        """Devuelve las cajas (Xi, Yi, Xf, Yf) de los rostros detectados"""
+        boxes, _ = self.get_detector(detector).detect(frame)
+        return [tuple(box) for box in boxes.tolist()]
+
+    def extract_faces(
+        self,
+        frame,
+        detector: Optional[str] = None
+    ) -> Tuple[List[Tuple[int, int, int, int]], np.ndarray]:
+        """Detecta los rostros y devuelve sus cajas junto al lote preprocesado"""
+        boxes = self.locate_faces(frame, detector)
+        return boxes, preprocess_faces(frame, boxes)
+
+    def classify_faces(self, faces: np.ndarray) -> np.ndarray:
+        """Clasifica un lote (N, 224, 224, 3) con una sola pasada del modelo"""
+        if len(faces) == 0:
+            return np.empty((0, len(self.classes)), dtype=np.float32)
+        return self.classifier.predict(faces)
+
+    def build_results(
+        self,
+        boxes: Sequence[Tuple[int, int, int, int]],
+        preds: np.ndarray
+    ) -> List[Dict]:
+        """Convierte la matriz de predicciones (N, 7) al formato esperado"""
+        if len(boxes) == 0:
+            return []
+
+        # Normalizar scores para que sumen 1 y determinar la emoción dominante
+        probs = np.asarray(preds, dtype=np.float64)
+        normalized = probs / probs.sum(axis=1, keepdims=True)
+        dominant_idx = np.argmax(preds, axis=1)
+
+        return [
+            {
+                "box": {
+                    "x": Xi,
+                    "y": Yi,
+                    "width": Xf - Xi,
+                    "height": Yf - Yi
+                },
+                "scores": dict(zip(self.labels, scores)),
+                "dominant_emotion": self.labels[idx]
+            }
+            for (Xi, Yi, Xf, Yf), scores, idx in zip(boxes, normalized.tolist(), dominant_idx.tolist())
+        ]
+
+    def predict_emotion(self, frame, detector: Optional[str] = None):
+        # Detectar rostros y clasificar todas las caras del frame en un único lote
+        boxes = self.locate_faces(frame, detector)
+        if not boxes:
+            return []
+
+        faces = preprocess_faces(frame, boxes)
+        preds = self.classify_faces(faces)
+        return self.build_results(boxes, preds)
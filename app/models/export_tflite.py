@@ -0,0 +1,124 @@
+## @file app/models/export_tflite.py
+"""Exporta el clasificador de emociones (.keras) a TFLite, con cuantización opcional.
+
+Uso:
+    python -m app.models.export_tflite --model models/RESNET50/emotion_recognition_resnet50v2.keras
+        --output models/RESNET50/emotion_recognition_resnet50v2_int8.tflite
+        [--quantization none|dynamic|float16|int8] [--calibration-dir caras/]
+        [--calibration-samples 200] [--detect-faces]
+
+- none: float32, mismo resultado que Keras salvo redondeos.
+- dynamic: pesos en int8 y activaciones en float (no necesita datos).
+- float16: pesos en float16.
+- int8: pesos y activaciones en int8, calibradas con imágenes de `--calibration-dir`.
+  Por defecto cada imagen se toma como el recorte de una cara; con
+  `--detect-faces` se buscan las caras en imágenes completas con el detector
+  configurado. La entrada y la salida del modelo siguen siendo float32.
+
+El modelo exportado se carga con EMOTION_MODEL_PATH=<fichero>.tflite (o con
+/api/v1/models/reload). Antes de pasarlo a producción conviene comparar sus
+resultados con `python -m benchmarks.bench_classifier_parity`.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+from typing import Iterator, List
+import cv2
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model # type: ignore
+from app.utils.image_processing import preprocess_faces
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("none", "dynamic", "float16", "int8")
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+def iter_calibration_faces(
+    directory: str,
+    max_samples: int = 200,
+    detect_faces: bool = False
+) -> Iterator[np.ndarray]:
+    """Caras preprocesadas (1, 224, 224, 3) igual que en inferencia, una por paso"""
+    detector = None
+    if detect_faces:
+        from app.config import FACE_DETECTOR
+        from app.models.face_detectors import create_face_detector
+        detector = create_face_detector(FACE_DETECTOR)
+
+    produced = 0
+    for name in sorted(os.listdir(directory)):
+        if produced >= max_samples:
+            return
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        frame = cv2.imread(os.path.join(directory, name))
+        if frame is None:
+            continue
+        if detector is not None:
+            boxes = [tuple(box) for box in detector.detect(frame)[0].tolist()]
+        else:
+            boxes = [(0, 0, frame.shape[1], frame.shape[0])]
+        for box in boxes[:max_samples - produced]:
+            yield preprocess_faces(frame, [box])
+            produced += 1
+
+def convert(
+    model_path: str,
+    quantization: str = "none",
+    calibration: List[np.ndarray] = None
+) -> bytes:
+    """Convierte el modelo Keras y devuelve el flatbuffer TFLite"""
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Cuantización no válida: {quantization} (disponibles: {', '.join(QUANTIZATION_MODES)})")
+    if quantization == "int8" and not calibration:
+        raise ValueError("La cuantización int8 necesita imágenes de calibración")
+
+    model = load_model(model_path)
+    # Keras 3 no se convierte directamente: se pasa por un SavedModel temporal
+    with tempfile.TemporaryDirectory() as saved_model_dir:
+        model.export(saved_model_dir)
+        converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+
+        if quantization != "none":
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantization == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+        if quantization == "int8":
+            converter.representative_dataset = lambda: ([sample] for sample in calibration)
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        return converter.convert()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Fichero .keras de origen")
+    parser.add_argument("--output", required=True, help="Fichero .tflite de destino")
+    parser.add_argument("--quantization", choices=QUANTIZATION_MODES, default="none")
+    parser.add_argument("--calibration-dir", help="Imágenes para calibrar la cuantización int8")
+    parser.add_argument("--calibration-samples", type=int, default=200, help="Caras de calibración como máximo")
+    parser.add_argument("--detect-faces", action="store_true", help="Buscar las caras en imágenes completas")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    calibration = None
+    if args.quantization == "int8":
+        if not args.calibration_dir:
+            parser.error("--quantization int8 necesita --calibration-dir")
+        calibration = list(iter_calibration_faces(args.calibration_dir, args.calibration_samples, args.detect_faces))
+        if not calibration:
+            parser.error(f"No se encontraron caras de calibración en {args.calibration_dir}")
+        logger.info(f"{len(calibration)} caras de calibración")
+
+    flatbuffer = convert(args.model, args.quantization, calibration)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "wb") as f:
+        f.write(flatbuffer)
+    logger.info(
+        f"Modelo exportado a {args.output} ({args.quantization}): "
+        f"{os.path.getsize(args.model) / 1e6:.1f} MB -> {len(flatbuffer) / 1e6:.1f} MB"
+    )
+
+if __name__ == "__main__":
+    main()
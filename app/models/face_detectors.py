@@ -0,0 +1,171 @@
+## @file app/models/face_detectors.py
+
+import cv2
+import numpy as np
+from typing import Tuple
+from app.config import (
+    FACE_CONFIDENCE_THRESHOLD,
+    FACE_DOWNSCALE_MAX_SIDE,
+    FACE_HAAR_CASCADE_PATH,
+    FACE_HAAR_MIN_NEIGHBORS,
+    FACE_HAAR_SCALE_FACTOR,
+    FACE_MAX_PER_FRAME,
+    FACE_MIN_SIZE,
+    FACE_NMS_THRESHOLD,
+    FACE_SSD_INPUT_SIZE
+)
+from app.utils.face_detection import postprocess_boxes, postprocess_detections
+
+SSD_PROTOTXT_PATH = "face_detector/deploy.prototxt"
+SSD_WEIGHTS_PATH = "face_detector/res10_300x300_ssd_iter_140000.caffemodel"
+
+# Detectores base; cualquiera admite el sufijo "-downscaled"
+BASE_DETECTORS = ("ssd", "haar")
+DOWNSCALED_SUFFIX = "-downscaled"
+FACE_DETECTOR_NAMES = BASE_DETECTORS + tuple(f"{name}{DOWNSCALED_SUFFIX}" for name in BASE_DETECTORS)
+
+Detections = Tuple[np.ndarray, np.ndarray]
+
+class FaceDetector:
+    """Interfaz común de los detectores de rostros.
+
+    `detect(frame)` devuelve las cajas (N, 4) en píxeles (Xi, Yi, Xf, Yf) del
+    frame original y sus scores, ya filtradas, depuradas con NMS y ordenadas.
+    """
+
+    name = "base"
+
+    def __init__(
+        self,
+        nms_threshold: float = FACE_NMS_THRESHOLD,
+        min_face_size: int = FACE_MIN_SIZE,
+        max_faces: int = FACE_MAX_PER_FRAME
+    ):
+        self.nms_threshold = nms_threshold
+        self.min_face_size = min_face_size
+        self.max_faces = max_faces
+
+    def detect(self, frame: np.ndarray) -> Detections:
+        raise NotImplementedError
+
+    def warmup(self) -> None:
+        self.detect(np.zeros((300, 300, 3), dtype=np.uint8))
+
+    def _finish(self, boxes: np.ndarray, scores: np.ndarray, width: int, height: int) -> Detections:
+        return postprocess_boxes(
+            boxes, scores, width, height,
+            nms_threshold=self.nms_threshold,
+            min_face_size=self.min_face_size,
+            max_faces=self.max_faces
+        )
+
+class SSDFaceDetector(FaceDetector):
+    """Red Caffe ResNet-10 SSD; `input_size` menor que 300 acelera a costa de las caras pequeñas"""
+
+    name = "ssd"
+
+    def __init__(
+        self,
+        prototxt_path: str = SSD_PROTOTXT_PATH,
+        weights_path: str = SSD_WEIGHTS_PATH,
+        input_size: int = FACE_SSD_INPUT_SIZE,
+        confidence_threshold: float = FACE_CONFIDENCE_THRESHOLD,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.net = cv2.dnn.readNet(prototxt_path, weights_path)
+        self.input_size = input_size
+        self.confidence_threshold = confidence_threshold
+
+    def forward(self, frame: np.ndarray) -> np.ndarray:
+        """Salida cruda (1, 1, K, 7) de la red"""
+        size = (self.input_size, self.input_size)
+        blob = cv2.dnn.blobFromImage(frame, 1.0, size, (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        return self.net.forward()
+
+    def detect(self, frame: np.ndarray) -> Detections:
+        (h, w) = frame.shape[:2]
+        return postprocess_detections(
+            self.forward(frame), w, h,
+            confidence_threshold=self.confidence_threshold,
+            nms_threshold=self.nms_threshold,
+            min_face_size=self.min_face_size,
+            max_faces=self.max_faces
+        )
+
+class HaarFaceDetector(FaceDetector):
+    """Cascada Haar incluida en el repositorio: mucho más barata que la SSD en CPU, peor con caras giradas"""
+
+    name = "haar"
+
+    def __init__(
+        self,
+        cascade_path: str = FACE_HAAR_CASCADE_PATH,
+        scale_factor: float = FACE_HAAR_SCALE_FACTOR,
+        min_neighbors: int = FACE_HAAR_MIN_NEIGHBORS,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            raise ValueError(f"No se pudo cargar la cascada Haar: {cascade_path}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+    def detect(self, frame: np.ndarray) -> Detections:
+        (h, w) = frame.shape[:2]
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        gray = cv2.equalizeHist(gray)
+        min_side = max(1, self.min_face_size)
+        # outputRejectLevels devuelve un peso por caja que sirve de score para el NMS
+        rects, _, weights = self.cascade.detectMultiScale3(
+            gray,
+            scaleFactor=self.scale_factor,
+            minNeighbors=self.min_neighbors,
+            minSize=(min_side, min_side),
+            outputRejectLevels=True
+        )
+        if len(rects) == 0:
+            return np.empty((0, 4), dtype=int), np.empty(0, dtype=np.float64)
+        rects = np.asarray(rects, dtype=int)
+        boxes = np.column_stack((rects[:, :2], rects[:, :2] + rects[:, 2:]))
+        return self._finish(boxes, np.asarray(weights, dtype=np.float64).ravel(), w, h)
+
+class DownscaledFaceDetector(FaceDetector):
+    """Ejecuta otro detector sobre el frame reducido a `max_side` y reescala las cajas al original"""
+
+    def __init__(self, inner: FaceDetector, max_side: int = FACE_DOWNSCALE_MAX_SIDE, **kwargs):
+        super().__init__(**kwargs)
+        self.inner = inner
+        self.max_side = max_side
+        self.name = f"{inner.name}{DOWNSCALED_SUFFIX}"
+        # El tamaño mínimo se aplica al volver a la resolución original
+        self.inner.min_face_size = 0
+        self.inner.max_faces = 0
+
+    def detect(self, frame: np.ndarray) -> Detections:
+        (h, w) = frame.shape[:2]
+        scale = self.max_side / max(h, w)
+        if scale >= 1.0:
+            small = frame
+            scale = 1.0
+        else:
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        boxes, scores = self.inner.detect(small)
+        boxes = np.rint(np.asarray(boxes, dtype=np.float64) / scale).astype(int)
+        return self._finish(boxes, scores, w, h)
+
+def create_face_detector(name: str) -> FaceDetector:
+    """Crea un detector por nombre: 'ssd', 'haar' o cualquiera de ellos con '-downscaled'"""
+    base = name[:-len(DOWNSCALED_SUFFIX)] if name.endswith(DOWNSCALED_SUFFIX) else name
+    if base == "ssd":
+        detector = SSDFaceDetector()
+    elif base == "haar":
+        detector = HaarFaceDetector()
+    else:
+        raise ValueError(
+            f"Detector de rostros no válido: {name} (disponibles: {', '.join(FACE_DETECTOR_NAMES)})"
+        )
+    return DownscaledFaceDetector(detector) if base != name else detector
@@ -0,0 +1,128 @@
+## @file app/models/model_registry.py
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+from app.config import EMOTION_MODEL_PATH, EMOTION_MODEL_VERSION, EMOTION_MODEL_WARMUP, EMOTION_MODELS_DIR, INFERENCE_WORKERS
+from app.models.emotion_model import EmotionModel
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Registro de modelos a nivel de proceso.
+
+    Cada versión se carga una sola vez y se comparte entre todas las peticiones.
+    El cambio de versión activa es atómico: las peticiones en curso terminan con
+    la instancia que ya tenían y las nuevas reciben la versión recién activada.
+    """
+
+    def __init__(self, lazy: bool = INFERENCE_WORKERS > 0):
+        # Con el pool de procesos, la inferencia no ocurre aquí: no se cargan los pesos
+        self.lazy = lazy
+        self._models: Dict[str, EmotionModel] = {}
+        self._active_version: Optional[str] = None
+        self._lock = threading.Lock()
+        # Serializa las cargas para no leer el mismo fichero dos veces en paralelo
+        self._load_lock = threading.Lock()
+
+    def load(
+        self,
+        version: str,
+        model_path: str,
+        activate: bool = True,
+        warmup: bool = EMOTION_MODEL_WARMUP
+    ) -> EmotionModel:
+        """Carga (o reutiliza) una versión del modelo y opcionalmente la activa"""
+        with self._load_lock:
+            with self._lock:
+                model = self._models.get(version)
+
+            if model is None or model.model_path != model_path:
+                logger.info(f"Cargando modelo '{version}' desde {model_path}")
+                model = EmotionModel(model_path=model_path, version=version, lazy=self.lazy)
+                if warmup and not self.lazy:
+                    model.warmup()
+                    logger.info(f"Warm-up completado para el modelo '{version}'")
+
+            with self._lock:
+                self._models[version] = model
+                if activate or self._active_version is None:
+                    self._active_version = version
+            return model
+
+    def register(self, version: str, model: EmotionModel, activate: bool = True) -> EmotionModel:
+        """Registra una instancia ya construida (p. ej. los modelos simulados de los benchmarks)"""
+        with self._lock:
+            self._models[version] = model
+            if activate or self._active_version is None:
+                self._active_version = version
+        return model
+
+    def swap(self, model_path: str, version: str) -> EmotionModel:
+        """Carga un nuevo fichero de modelo, lo activa y descarga la versión anterior"""
+        model = self.load(version, model_path, activate=True)
+        with self._lock:
+            for old_version in [v for v in self._models if v != version]:
+                del self._models[old_version]
+        logger.info(f"Modelo activo cambiado a '{version}'")
+        return model
+
+    def activate(self, version: str) -> EmotionModel:
+        with self._lock:
+            if version not in self._models:
+                raise KeyError(f"Versión de modelo no cargada: {version}")
+            self._active_version = version
+            return self._models[version]
+
+    def unload(self, version: str) -> None:
+        with self._lock:
+            if version == self._active_version:
+                raise ValueError("No se puede descargar la versión activa")
+            self._models.pop(version, None)
+
+    def get(self, version: Optional[str] = None) -> EmotionModel:
+        """Devuelve la instancia compartida (carga la versión por defecto si hace falta)"""
+        with self._lock:
+            key = version or self._active_version
+            model = self._models.get(key) if key else None
+        if model is not None:
+            return model
+        if version is not None:
+            raise KeyError(f"Versión de modelo no cargada: {version}")
+        return self.load(EMOTION_MODEL_VERSION, EMOTION_MODEL_PATH)
+
+    @property
+    def active_version(self) -> Optional[str]:
+        return self._active_version
+
+    def list_models(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {
+                    "version": version,
+                    "model_path": model.model_path,
+                    "backend": model.backend,
+                    "active": version == self._active_version
+                }
+                for version, model in self._models.items()
+            ]
+
+def resolve_model_path(model_path: str, models_dir: str = EMOTION_MODELS_DIR) -> str:
+    """Ruta real del fichero si está dentro de `models_dir`; si no, PermissionError.
+
+    Cargar un .keras/.h5 puede ejecutar código (capas Lambda), así que las rutas
+    recibidas por la API nunca pueden salir del directorio de modelos.
+    """
+    root = os.path.realpath(models_dir)
+    path = os.path.realpath(model_path)
+    if os.path.commonpath([root, path]) != root:
+        raise PermissionError(f"El modelo debe estar dentro de {models_dir}")
+    return path
+
+# Instancia singleton
+model_registry = ModelRegistry()
+
+def get_emotion_model() -> EmotionModel:
+    """Función de dependencia que devuelve el modelo activo compartido"""
+    return model_registry.get()
@@ -1,9 +1,15 @@
 ## @file app/routes/history_router.py
 
-from fastapi import APIRouter, Query, HTTPException
-from app.schemas.api.history import HistoryResponse
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Query, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from app.schemas.api.history import HistoryResponse, HistoryStatsResponse
+from app.services.emotion_rollups import emotion_rollups
+from app.services.history_export_service import export_csv, export_ndjson
 from app.services.history_repository import history_repo
-from typing import Optional
+from app.utils.responses import FastJSONResponse
+from app.utils.timestamps import from_epoch, to_epoch
+from typing import Literal, Optional
 from app.schemas.core import DetectionType 
 
 router = APIRouter()
@@ -15,26 +21,123 @@ async def read_history(
     detection_type: Optional[DetectionType] = Query(
         None, 
         description="Filtrar por tipo de detección: 'image' o 'video'"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Id del último registro recibido (paginación por clave, alternativa a 'page')"
     )
 ):
     try:
+        type_filter = detection_type.value if detection_type else None
+        # Por clave se pide un registro de más para saber si hay página siguiente
+        keyset = (cursor is not None or page is None) and per_page is not None
         records = await history_repo.get_history(
             page=page,
-            per_page=per_page,
-            detection_type=detection_type.value if detection_type else None
+            per_page=per_page + 1 if keyset else per_page,
+            detection_type=type_filter,
+            cursor=cursor
         )
-        total = len(history_repo._history)
+        total = await history_repo.count(type_filter)
+        if keyset:
+            has_more = len(records) > per_page
+            records = records[:per_page]
+        else:
+            has_more = per_page is not None and (page - 1) * per_page + len(records) < total
+        next_cursor = records[-1].id if has_more and records else None
         
-        return HistoryResponse(
+        # Los registros ya están validados: se serializan sin volver a validar
+        return FastJSONResponse(HistoryResponse(
             records=records,
             total=total,
             page=page,
-            per_page=per_page
-        )
+            per_page=per_page,
+            next_cursor=next_cursor
+        ).dict())
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/stats", response_model=HistoryStatsResponse)
+async def read_history_stats(
+    start: Optional[datetime] = Query(None, description="Inicio del rango (por defecto, una hora antes de 'end')"),
+    end: Optional[datetime] = Query(None, description="Fin del rango (por defecto, ahora)"),
+    detection_type: Optional[DetectionType] = Query(None, description="Filtrar por tipo de detección"),
+    granularity: Optional[str] = Query(
+        None,
+        regex="^(minute|hour)$",
+        description="Tamaño de los intervalos: 'minute' u 'hour' (por defecto según el rango)"
+    )
+):
+    """Distribución de emociones por intervalos a partir de los agregados incrementales"""
+    end_s = to_epoch(end) if end is not None else to_epoch(datetime.utcnow())
+    start_s = to_epoch(start) if start is not None else end_s - timedelta(hours=1).total_seconds()
+    if start_s >= end_s:
+        raise HTTPException(status_code=400, detail="'start' debe ser anterior a 'end'")
+
+    stats = emotion_rollups.query(
+        start_s,
+        end_s,
+        detection_type.value if detection_type else None,
+        granularity
+    )
+    for bucket in stats["buckets"]:
+        bucket["start"] = from_epoch(bucket.pop("start_s"))
+    return HistoryStatsResponse(
+        start=from_epoch(start_s),
+        end=from_epoch(end_s),
+        detection_type=detection_type,
+        **stats
+    )
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}}
+)
+async def export_history(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Formato de exportación: 'ndjson' o 'csv'"),
+    start: Optional[datetime] = Query(None, description="Incluir registros desde esta fecha"),
+    end: Optional[datetime] = Query(None, description="Incluir registros anteriores a esta fecha"),
+    detection_type: Optional[DetectionType] = Query(None, description="Filtrar por tipo de detección"),
+    include_snapshots: bool = Query(False, description="Incluir el snapshot JPEG en base64"),
+    thumbnail: bool = Query(False, description="Con 'include_snapshots', exportar la miniatura")
+):
+    """Exporta el historial en streaming, de más antiguo a más reciente, con memoria constante"""
+    export = export_csv if format == "csv" else export_ndjson
+    stream = export(
+        start,
+        end,
+        detection_type.value if detection_type else None,
+        include_snapshots,
+        thumbnail
+    )
+    extension = "csv" if format == "csv" else "ndjson"
+    return StreamingResponse(
+        stream,
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="history.{extension}"'}
+    )
+
 @router.delete("/", status_code=204)
 async def delete_history():
     await history_repo.clear_history()
-    return None
\ No newline at end of file
+    return None
+
+@router.get(
+    "/{record_id}/snapshot",
+    response_class=Response,
+    responses={200: {"content": {"image/jpeg": {}}}}
+)
+async def read_snapshot(
+    record_id: str,
+    thumbnail: bool = Query(False, description="Devolver la miniatura en lugar del frame completo")
+):
+    """Sirve directamente los bytes JPEG del snapshot de un registro"""
+    data = await history_repo.get_snapshot(record_id, thumbnail=thumbnail)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Snapshot no encontrado")
+    return Response(
+        content=data,
+        media_type="image/jpeg",
+        # El contenido de un snapshot no cambia nunca
+        headers={"Cache-Control": "private, max-age=86400, immutable"}
+    )
@@ -1,30 +1,81 @@
 ## @file app/routes/image_processing_router.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+import zipfile
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.config import BATCH_MAX_IMAGE_BYTES
 from app.models.emotion_model import EmotionModel
-from app.services.image_processing_service import process_image
-from app.schemas.api.image_processing import DetectionResponse
-from typing import Annotated
+from app.models.model_registry import get_emotion_model
+from app.utils.responses import FastJSONResponse
+from app.services.image_processing_service import process_image, process_images, iter_zip_images
+from app.schemas.api.image_processing import DetectionResponse, BatchImageResult
+from typing import Annotated, AsyncIterator, List, Optional, Tuple
 
 router = APIRouter()
 
-# Dependency para el modelo de emociones
-def get_emotion_model():
-    return EmotionModel()
+DETECTOR_QUERY = Query(None, description="Detector de rostros: ssd, haar, ssd-downscaled o haar-downscaled")
 
 @router.post("/process-image", response_model=DetectionResponse)
 async def process_image_route(
     file: Annotated[UploadFile, File(description="Imagen para analizar emociones")],
-    emotion_model: Annotated[EmotionModel, Depends(get_emotion_model)]
+    emotion_model: Annotated[EmotionModel, Depends(get_emotion_model)],
+    detector: Optional[str] = DETECTOR_QUERY
 ):
     try:
         image = await file.read()
-        result = await process_image(image, emotion_model)
-        return result
+        result = await process_image(image, emotion_model, detector)
+        # El resultado ya tiene la forma de DetectionResponse: se serializa directamente
+        return FastJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error al procesar la imagen: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+def _is_zip(upload: UploadFile) -> bool:
+    return (
+        upload.content_type in ("application/zip", "application/x-zip-compressed")
+        or (upload.filename or "").lower().endswith(".zip")
+    )
+
+async def _iter_uploads(files: List[UploadFile]) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+    """Recorre los ficheros subidos (y el contenido de los zip) leyendo uno cada vez"""
+    for upload in files:
+        if _is_zip(upload):
+            try:
+                async for item in iter_zip_images(upload.file, BATCH_MAX_IMAGE_BYTES):
+                    yield item
+            except zipfile.BadZipFile:
+                # Se reporta como imagen no decodificable en su línea del stream
+                yield upload.filename, b""
+            continue
+
+        # Nunca se lee más de un byte por encima del límite, sea cual sea el fichero
+        image = await upload.read(BATCH_MAX_IMAGE_BYTES + 1)
+        yield upload.filename, image if len(image) <= BATCH_MAX_IMAGE_BYTES else None
+
+@router.post(
+    "/process-images",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+async def process_images_route(
+    files: Annotated[List[UploadFile], File(description="Imágenes o un archivo .zip para analizar")],
+    emotion_model: Annotated[EmotionModel, Depends(get_emotion_model)],
+    detector: Optional[str] = DETECTOR_QUERY
+):
+    """Procesa varias imágenes y devuelve un `BatchImageResult` por línea (NDJSON) según terminan"""
+    if not files:
+        raise HTTPException(status_code=400, detail="No se recibió ninguna imagen")
+    try:
+        emotion_model.detector_name(detector)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def generate_lines():
+        async for item in process_images(_iter_uploads(files), emotion_model, detector=detector):
+            yield BatchImageResult(**item).json() + "\n"
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
@@ -0,0 +1,26 @@
+## @file app/routes/metrics_router.py
+
+from fastapi import APIRouter
+from app.services.history_writer import history_writer
+from app.services.inference_gate import inference_gate
+from app.services.inference_scheduler import inference_scheduler
+from app.services.inference_workers import inference_workers
+from app.services.realtime_service import realtime_manager
+from app.services.result_cache import result_cache
+from app.services.snapshot_store import snapshot_store
+from app.utils.responses import FastJSONResponse
+
+router = APIRouter()
+
+@router.get("/")
+async def read_metrics():
+    """Métricas internas de los componentes de inferencia"""
+    return FastJSONResponse({
+        "inference_scheduler": inference_scheduler.stats(),
+        "inference_workers": inference_workers.stats(),
+        "result_cache": result_cache.stats(),
+        "snapshot_store": snapshot_store.stats(),
+        "history_writer": history_writer.stats(),
+        "realtime": realtime_manager.stats(),
+        "inference_gate": inference_gate.stats()
+    })
@@ -0,0 +1,39 @@
+## @file app/routes/model_router.py
+
+import logging
+from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.models.model_registry import model_registry, resolve_model_path
+from app.schemas.api.models import ModelRegistryResponse, ModelReloadRequest
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/", response_model=ModelRegistryResponse)
+async def list_models():
+    return ModelRegistryResponse(
+        active_version=model_registry.active_version,
+        models=model_registry.list_models()
+    )
+
+@router.post("/reload", response_model=ModelRegistryResponse)
+async def reload_model(request: ModelReloadRequest):
+    """Carga un nuevo fichero de modelo y lo activa sin reiniciar el servidor"""
+    try:
+        model_path = resolve_model_path(request.model_path)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    try:
+        # La carga y el warm-up son costosos: se ejecutan fuera del event loop
+        await run_in_threadpool(model_registry.swap, model_path, request.version)
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"No se pudo cargar el modelo: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error al recargar el modelo: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error al recargar el modelo: {str(e)}")
+
+    return ModelRegistryResponse(
+        active_version=model_registry.active_version,
+        models=model_registry.list_models()
+    )
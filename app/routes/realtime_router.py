@@ -0,0 +1,12 @@
+## @file app/routes/realtime_router.py
+
+from typing import Optional
+from fastapi import APIRouter, WebSocket
+from app.services.realtime_service import realtime_manager
+
+router = APIRouter()
+
+@router.websocket("/ws")
+async def realtime_ws(websocket: WebSocket, detector: Optional[str] = None):
+    """Recibe frames JPEG en mensajes binarios y responde con un JSON de detección por frame procesado"""
+    await realtime_manager.handle(websocket, detector)
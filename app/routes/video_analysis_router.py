@@ -0,0 +1,71 @@
+## @file app/routes/video_analysis_router.py
+
+import json
+import logging
+import os
+from contextlib import aclosing
+from typing import Annotated, Dict, Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from app.config import VIDEO_DEFAULT_SAMPLE_FPS
+from app.models.emotion_model import EmotionModel
+from app.models.model_registry import get_emotion_model
+from app.schemas.api.video_analysis import VideoAnalysisSummary, VideoFrameResult
+from app.services.video_analysis_service import VideoReader, analyze_video, save_upload
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _serialize(item: Dict) -> str:
+    model = VideoFrameResult if item["type"] == "frame" else VideoAnalysisSummary
+    return model(**item).json()
+
+@router.post(
+    "/analyze",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/event-stream": {}}}}
+)
+async def analyze_video_route(
+    file: Annotated[UploadFile, File(description="Fichero de vídeo para analizar")],
+    emotion_model: Annotated[EmotionModel, Depends(get_emotion_model)],
+    sample_fps: float = Query(VIDEO_DEFAULT_SAMPLE_FPS, gt=0, le=120, description="Frames analizados por segundo de vídeo"),
+    timeline_interval: float = Query(1.0, gt=0, description="Duración en segundos de cada intervalo del timeline"),
+    format: Literal["ndjson", "sse"] = Query("ndjson", description="Formato del stream: 'ndjson' o 'sse'"),
+    detector: Optional[str] = Query(None, description="Detector de rostros: ssd, haar, ssd-downscaled o haar-downscaled")
+):
+    """Analiza un vídeo subido y emite un resultado por frame muestreado y un resumen final"""
+    try:
+        emotion_model.detector_name(detector)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    path = await save_upload(file)
+    try:
+        reader = VideoReader(path)
+    except ValueError as e:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def generate():
+        try:
+            # aclosing: si el cliente se desconecta, el análisis se cierra aquí y no al recolectarse
+            async with aclosing(
+                analyze_video(reader, emotion_model, sample_fps, timeline_interval, detector=detector)
+            ) as items:
+                async for item in items:
+                    payload = _serialize(item)
+                    if format == "sse":
+                        yield f"event: {item['type']}\ndata: {payload}\n\n"
+                    else:
+                        yield payload + "\n"
+        except Exception as e:
+            logger.error(f"Error al analizar el vídeo: {str(e)}", exc_info=True)
+            error = json.dumps({"type": "error", "detail": f"Error al analizar el vídeo: {str(e)}"})
+            yield f"event: error\ndata: {error}\n\n" if format == "sse" else error + "\n"
+        finally:
+            reader.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache"}
+    )
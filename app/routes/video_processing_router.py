@@ -1,54 +1,44 @@
 ## @file app/routes/video_processing_router.py
 
-import asyncio
-import cv2
 import logging
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from fastapi.responses import StreamingResponse
-from app.services.video_processing_service import WebcamService
-from app.models.emotion_model import EmotionModel 
-from typing import Annotated
+from app.config import WEBCAM_LONG_POLL_TIMEOUT_S
+from app.services.camera_manager import CameraSource, camera_manager
+from app.models.emotion_model import EmotionModel
+from app.models.model_registry import get_emotion_model
+from app.services.mjpeg_broadcaster import MJPEGSubscriber
+from app.utils.responses import FastJSONResponse
+from typing import Annotated, Optional
 from app.schemas.api.video_processing import ProcessResponse
 
 router = APIRouter()
-webcam_service = WebcamService()
-
-def get_emotion_model() -> EmotionModel:
-    """Función de dependencia para obtener una instancia del modelo de emociones"""
-    return EmotionModel()
 
 logger = logging.getLogger(__name__)
 
-async def generate_frames():
-    """Generador de frames para el stream MJPEG"""
-    while True:
-        try:
-            frame = webcam_service.get_latest_frame()
-            if frame is None:
-                logger.warning("Frame vacío recibido")
-                await asyncio.sleep(0.1)
-                continue
-                
-            # Preprocesamiento
-            frame = cv2.resize(frame, (640, 480))
-            _, buffer = cv2.imencode('.jpg', frame, [
-                cv2.IMWRITE_JPEG_QUALITY, 80
-            ])
-            
+def _get_source(source_id: Optional[str] = None) -> CameraSource:
+    try:
+        return camera_manager.get(source_id or camera_manager.default_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Fuente de vídeo no encontrada: {source_id}")
+
+async def generate_frames(source: CameraSource, subscriber: MJPEGSubscriber):
+    """Generador de frames para el stream MJPEG: solo reenvía bytes ya codificados"""
+    try:
+        while True:
+            jpeg = await subscriber.get()
             yield (b'--frame\r\n'
-                  b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-            
-            await asyncio.sleep(0.033)  # Control de FPS
-            
-        except Exception as e:
-            logger.error(f"Error en generate_frames: {str(e)}")
-            await asyncio.sleep(1)
+                  b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+    finally:
+        source.hub.unsubscribe(subscriber)
 
-@router.get("/stream")
-async def video_stream():
-    """Endpoint para streaming de video"""
+def _stream(source: CameraSource, fps: Optional[float], quality: Optional[str], annotated: bool):
+    try:
+        subscriber = source.hub.subscribe(quality, fps, annotated)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return StreamingResponse(
-        generate_frames(),
+        generate_frames(source, subscriber),
         media_type="multipart/x-mixed-replace; boundary=frame",
         headers={
             "Cache-Control": "no-cache",
@@ -56,22 +46,35 @@ async def video_stream():
         }
     )
 
-@router.on_event("startup")
-async def startup_event():
-    webcam_service.start()
-
-@router.on_event("shutdown")
-async def shutdown_event():
-    webcam_service.stop()
-
-@router.get("/process-latest-frame", response_model=ProcessResponse)
-async def process_latest_frame(
-    emotion_model: Annotated[EmotionModel, Depends(get_emotion_model)]
+async def _process_latest_frame(
+    source: CameraSource,
+    emotion_model: EmotionModel,
+    after_seq: Optional[int],
+    timeout: float
 ):
+    service = source.service
     try:
+        if service.background_inference:
+            # Con inferencia continua se devuelve el último resultado sin pasar por el modelo
+            result = await service.wait_result(after_seq, timeout)
+            if result is not None:
+                return FastJSONResponse(result)
+            if after_seq is not None:
+                # Venció la espera sin un resultado nuevo: el cliente repite con el mismo 'after_seq'
+                return Response(status_code=204)
+            raise HTTPException(status_code=503, detail="Todavía no hay resultados disponibles")
+        if after_seq is not None:
+            # Sin inferencia continua no hay resultados numerados que esperar
+            raise HTTPException(
+                status_code=409,
+                detail="'after_seq' requiere la inferencia continua (WEBCAM_BACKGROUND_INFERENCE)"
+            )
+
         # Usamos el método process_frame que ya incluye la lógica para guardar en el historial
-        result = await webcam_service.process_frame(emotion_model)
-        return result
+        result = await service.process_frame(emotion_model)
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -79,4 +82,69 @@ async def process_latest_frame(
         raise HTTPException(
             status_code=500,
             detail=f"Error al procesar emociones: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+FPS_QUERY = Query(None, gt=0, description="FPS máximos para este cliente")
+QUALITY_QUERY = Query(None, description="Nivel de calidad JPEG (p. ej. 'low', 'medium', 'high')")
+ANNOTATED_QUERY = Query(False, description="Dibujar cajas y emociones del último resultado")
+AFTER_SEQ_QUERY = Query(
+    None, ge=0, description="Esperar a un resultado con 'seq' mayor (requiere inferencia continua)"
+)
+TIMEOUT_QUERY = Query(
+    WEBCAM_LONG_POLL_TIMEOUT_S, gt=0, le=WEBCAM_LONG_POLL_TIMEOUT_S,
+    description="Espera máxima en segundos para 'after_seq'"
+)
+
+@router.on_event("startup")
+async def startup_event():
+    camera_manager.start()
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    await camera_manager.stop()
+
+@router.get("/sources")
+async def list_sources():
+    """Fuentes de vídeo registradas"""
+    return FastJSONResponse({"default": camera_manager.default_id, "sources": camera_manager.list()})
+
+@router.get("/stream")
+async def video_stream(
+    fps: Optional[float] = FPS_QUERY,
+    quality: Optional[str] = QUALITY_QUERY,
+    annotated: bool = ANNOTATED_QUERY
+):
+    """Endpoint para streaming de video (fuente por defecto)"""
+    return _stream(_get_source(), fps, quality, annotated)
+
+@router.get("/process-latest-frame", response_model=ProcessResponse)
+async def process_latest_frame(
+    emotion_model: Annotated[EmotionModel, Depends(get_emotion_model)],
+    after_seq: Optional[int] = AFTER_SEQ_QUERY,
+    timeout: float = TIMEOUT_QUERY
+):
+    return await _process_latest_frame(_get_source(), emotion_model, after_seq, timeout)
+
+@router.get("/stats")
+async def webcam_stats():
+    """Contadores de todas las fuentes (tracks activos, clasificaciones evitadas...) y del reparto de inferencias"""
+    return FastJSONResponse(camera_manager.stats())
+
+@router.get("/{source_id}/stream")
+async def source_stream(
+    source_id: str,
+    fps: Optional[float] = FPS_QUERY,
+    quality: Optional[str] = QUALITY_QUERY,
+    annotated: bool = ANNOTATED_QUERY
+):
+    """Streaming MJPEG de una fuente concreta"""
+    return _stream(_get_source(source_id), fps, quality, annotated)
+
+@router.get("/{source_id}/process-latest-frame", response_model=ProcessResponse)
+async def source_process_latest_frame(
+    source_id: str,
+    emotion_model: Annotated[EmotionModel, Depends(get_emotion_model)],
+    after_seq: Optional[int] = AFTER_SEQ_QUERY,
+    timeout: float = TIMEOUT_QUERY
+):
+    return await _process_latest_frame(_get_source(source_id), emotion_model, after_seq, timeout)
@@ -2,9 +2,11 @@
 from .core import EmotionType, DetectionType
 from .domain.emotions import EmotionScores
 from .domain.faces import BoundingBox, FaceDetectionResult
-from .api.image_processing import DetectionResult, DetectionResponse
+from .api.image_processing import DetectionResult, DetectionResponse, BatchImageResult
 from .api.history import HistoryRecord, HistoryResponse
 from .api.video_processing import ProcessResponse
+from .api.video_analysis import VideoFace, VideoFrameResult, TimelineEntry, VideoAnalysisSummary
+from .api.models import ModelInfo, ModelRegistryResponse, ModelReloadRequest
 
 __all__ = [
     'EmotionType',
@@ -14,7 +16,15 @@ __all__ = [
     'FaceDetectionResult',
     'DetectionResult',
     'DetectionResponse',
+    'BatchImageResult',
     'HistoryRecord', 
     'HistoryResponse',
-    'ProcessResponse'
+    'ProcessResponse',
+    'VideoFace',
+    'VideoFrameResult',
+    'TimelineEntry',
+    'VideoAnalysisSummary',
+    'ModelInfo',
+    'ModelRegistryResponse',
+    'ModelReloadRequest'
 ]
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from ..core import EmotionType, DetectionType
 from ..domain.emotions import EmotionScores
 
@@ -11,7 +11,7 @@ class HistoryRecordBase(BaseModel):
     dominant_emotion: EmotionType
     emotion_scores: EmotionScores
     detection_type: DetectionType
-    image_snapshot: str  # base64 encoded
+    snapshot_id: Optional[str] = None  # JPEG servido en /history/{id}/snapshot
 
 class HistoryRecordCreate(HistoryRecordBase):
     pass
@@ -23,4 +23,22 @@ class HistoryResponse(BaseModel):
     records: List[HistoryRecord]
     total: int
     page: Optional[int] = None
-    per_page: Optional[int] = None
\ No newline at end of file
+    per_page: Optional[int] = None
+    next_cursor: Optional[str] = None  # pasar como `cursor` para la página siguiente
+
+class EmotionStats(BaseModel):
+    count: int
+    dominant_counts: Dict[str, int]  # emoción dominante -> detecciones
+    mean_scores: EmotionScores
+
+class HistoryStatsBucket(EmotionStats):
+    start: datetime
+
+class HistoryStatsResponse(BaseModel):
+    start: datetime
+    end: datetime
+    granularity: str  # minute | hour
+    detection_type: Optional[DetectionType] = None
+    total: EmotionStats
+    by_type: Dict[str, EmotionStats]
+    buckets: List[HistoryStatsBucket]
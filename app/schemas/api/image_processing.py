@@ -1,6 +1,6 @@
 ## @file: app/schemas/api/image_processing.py
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 import numpy as np
 from ..domain.emotions import EmotionScores
 from ..domain.faces import BoundingBox
@@ -22,4 +22,11 @@ class DetectionResponse(BaseModel):
             np.floating: float,
             np.ndarray: lambda x: x.tolist(),
             np.bool_: bool
-        }
\ No newline at end of file
+        }
+
+class BatchImageResult(BaseModel):
+    """Una línea del stream NDJSON de /process-images"""
+    index: int
+    filename: Optional[str] = None
+    result: Optional[DetectionResponse] = None
+    error: Optional[str] = None
@@ -0,0 +1,17 @@
+## @file: app/schemas/api/models.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class ModelInfo(BaseModel):
+    version: str
+    model_path: str
+    backend: str = "keras"
+    active: bool
+
+class ModelRegistryResponse(BaseModel):
+    active_version: Optional[str] = None
+    models: List[ModelInfo]
+
+class ModelReloadRequest(BaseModel):
+    model_path: str = Field(..., description="Ruta al fichero .keras (o .tflite exportado) del nuevo modelo")
+    version: str = Field(..., description="Identificador de la versión del modelo")
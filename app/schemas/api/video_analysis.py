@@ -0,0 +1,36 @@
+## @file: app/schemas/api/video_analysis.py
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from ..domain.emotions import EmotionScores
+from ..domain.faces import BoundingBox
+
+class VideoFace(BaseModel):
+    box: BoundingBox
+    scores: EmotionScores
+    dominant_emotion: str
+
+class VideoFrameResult(BaseModel):
+    type: Literal["frame"] = "frame"
+    frame_index: int
+    timestamp_ms: float
+    faces: List[VideoFace]
+
+class TimelineEntry(BaseModel):
+    start_s: float
+    end_s: float
+    frames: int
+    faces: int
+    mean_scores: EmotionScores
+    dominant_emotion: Optional[str] = None
+
+class VideoAnalysisSummary(BaseModel):
+    type: Literal["summary"] = "summary"
+    frames_analyzed: int
+    faces_detected: int
+    video_fps: float
+    sample_fps: float
+    duration_s: float
+    processing_time_s: float
+    timeline: List[TimelineEntry]
+    mean_scores: EmotionScores
+    dominant_emotion: Optional[str] = None
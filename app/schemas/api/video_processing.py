@@ -1,12 +1,17 @@
 # app/schemas/api/video_processing.py
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 import numpy as np
 
 class ProcessResponse(BaseModel):
     faces: List[Dict]
     frame_size: Dict[str, int]
     success: bool
+    reused: bool = False  # True si se devolvió el resultado anterior por no haber cambios
+    seq: Optional[int] = None  # número de secuencia del resultado (para long-polling con after_seq)
+    frame_seq: Optional[int] = None  # frame de la cámara sobre el que se calculó
+    timestamp: Optional[datetime] = None
     
     class Config:
         json_encoders = {
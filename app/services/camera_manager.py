@@ -0,0 +1,102 @@
+## @file app/services/camera_manager.py
+
+import logging
+from typing import Dict, List, Tuple, Union
+from app.config import CAMERA_SOURCES, WEBCAM_BACKGROUND_INFERENCE
+from app.services.inference_gate import inference_gate
+from app.services.mjpeg_broadcaster import MJPEGBroadcaster
+from app.services.video_processing_service import WebcamService
+
+logger = logging.getLogger(__name__)
+
+def parse_camera_sources(spec: str) -> List[Tuple[str, Union[int, str], bool]]:
+    """'default=0,clip=loop:videos/test.mp4' -> [(id, origen, repetir), ...]"""
+    sources = []
+    for item in spec.split(","):
+        source_id, _, origin = item.strip().partition("=")
+        if not source_id or not origin:
+            continue
+        loop = origin.startswith("loop:")
+        if loop:
+            origin = origin[len("loop:"):]
+        sources.append((source_id, int(origin) if origin.isdigit() else origin, loop))
+    return sources
+
+class CameraSource:
+    """Una fuente registrada: su servicio de captura e inferencia y su difusión MJPEG"""
+
+    def __init__(self, source_id: str, origin: Union[int, str], loop: bool = False):
+        self.source_id = source_id
+        self.service = WebcamService(origin, source_id=source_id, loop=loop)
+        self.hub = MJPEGBroadcaster(self.service)
+
+    def describe(self) -> Dict:
+        return {
+            "id": self.source_id,
+            "source": self.service.source,
+            "loop": self.service.loop,
+            "simulator": hasattr(self.service, "simulator_mode"),
+            "background_inference": self.service.background_inference
+        }
+
+class CameraManager:
+    """Registro de fuentes de vídeo por id.
+
+    Cada fuente tiene su propio hilo de captura y su difusión MJPEG; todas
+    comparten `inference_gate`, que acota las inferencias simultáneas y las
+    reparte por turnos entre fuentes.
+    """
+
+    def __init__(self, spec: str = CAMERA_SOURCES):
+        self._sources: Dict[str, CameraSource] = {}
+        self._started = False
+        for source_id, origin, loop in parse_camera_sources(spec):
+            self.register(source_id, origin, loop)
+        if not self._sources:
+            raise ValueError(f"CAMERA_SOURCES no define ninguna fuente: {spec!r}")
+        self.default_id = next(iter(self._sources))
+
+    def register(self, source_id: str, origin: Union[int, str], loop: bool = False) -> CameraSource:
+        if source_id in self._sources:
+            raise ValueError(f"Fuente de vídeo duplicada: {source_id}")
+        source = CameraSource(source_id, origin, loop)
+        self._sources[source_id] = source
+        if self._started:
+            self._start_source(source)
+        return source
+
+    def get(self, source_id: str) -> CameraSource:
+        """KeyError si la fuente no existe"""
+        return self._sources[source_id]
+
+    def list(self) -> List[Dict]:
+        return [source.describe() for source in self._sources.values()]
+
+    def _start_source(self, source: CameraSource) -> None:
+        source.service.start()
+        if WEBCAM_BACKGROUND_INFERENCE:
+            source.service.start_inference()
+
+    def start(self) -> None:
+        self._started = True
+        for source in self._sources.values():
+            self._start_source(source)
+
+    async def stop(self) -> None:
+        for source in self._sources.values():
+            await source.hub.stop()
+            await source.service.stop_inference()
+            source.service.stop()
+        self._started = False
+
+    def stats(self) -> Dict:
+        return {
+            "sources": {
+                source_id: {**source.service.stats(), "mjpeg": source.hub.stats()}
+                for source_id, source in self._sources.items()
+            },
+            "inference_gate": inference_gate.stats()
+        }
+
+# Instancia singleton
+camera_manager = CameraManager()
@@ -0,0 +1,157 @@
+## @file app/services/emotion_rollups.py
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.config import ROLLUP_HOUR_RETENTION_D, ROLLUP_MINUTE_RETENTION_H
+from app.schemas.api.history import HistoryRecord
+from app.schemas.core import DetectionType
+from app.schemas.domain.emotions import EmotionScores
+from app.utils.timestamps import to_epoch
+
+EMOTIONS = list(EmotionScores.__fields__)
+_EMOTION_INDEX = {emotion: i for i, emotion in enumerate(EMOTIONS)}
+
+GRANULARITIES = {"minute": 60, "hour": 3600}
+
+def _empty_bucket() -> List:
+    return [0, np.zeros(len(EMOTIONS), dtype=np.int64), np.zeros(len(EMOTIONS), dtype=np.float64)]
+
+class EmotionRollups:
+    """Agregados de emociones por tipo de detección e intervalo (minuto y hora).
+
+    Cada intervalo guarda el número de detecciones, el recuento de emociones
+    dominantes y la suma de los scores, de modo que una consulta por rango
+    recorre intervalos y no registros. Se actualizan al crear cada registro y
+    son independientes de la retención del historial; los intervalos de minuto
+    y de hora caducan por separado.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(
+        self,
+        minute_retention_h: float = ROLLUP_MINUTE_RETENTION_H,
+        hour_retention_d: float = ROLLUP_HOUR_RETENTION_D
+    ):
+        self.retention_s = {
+            "minute": minute_retention_h * 3600,
+            "hour": hour_retention_d * 86400
+        }
+        # granularidad -> (tipo, índice de intervalo) -> [detecciones, dominantes, sumas]
+        self._buckets: Dict[str, Dict[Tuple[str, int], List]] = {g: {} for g in GRANULARITIES}
+        self._lock = threading.Lock()
+        self._adds_since_prune = 0
+
+    def add(
+        self,
+        timestamp_s: float,
+        detection_type: str,
+        dominant_emotion: str,
+        scores: Dict[str, float],
+        count: int = 1
+    ) -> None:
+        """Suma `count` detecciones; `scores` es la suma de sus scores"""
+        vector = np.fromiter((scores.get(e, 0.0) for e in EMOTIONS), dtype=np.float64)
+        with self._lock:
+            for granularity, size in GRANULARITIES.items():
+                bucket = self._buckets[granularity].setdefault(
+                    (detection_type, int(timestamp_s // size)), _empty_bucket()
+                )
+                bucket[0] += count
+                bucket[1][_EMOTION_INDEX[dominant_emotion]] += count
+                bucket[2] += vector
+
+            self._adds_since_prune += 1
+            if self._adds_since_prune >= self.PRUNE_EVERY:
+                self._prune_locked(time.time())
+
+    def add_records(self, records: Iterable[HistoryRecord]) -> None:
+        for record in records:
+            self.add(
+                to_epoch(record.timestamp),
+                record.detection_type.value,
+                record.dominant_emotion,
+                record.emotion_scores.dict()
+            )
+
+    def _prune_locked(self, now: float) -> None:
+        self._adds_since_prune = 0
+        for granularity, size in GRANULARITIES.items():
+            oldest = int((now - self.retention_s[granularity]) // size)
+            buckets = self._buckets[granularity]
+            for key in [key for key in buckets if key[1] < oldest]:
+                del buckets[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            for buckets in self._buckets.values():
+                buckets.clear()
+
+    def choose_granularity(self, start_s: float, end_s: float) -> str:
+        """Minutos para rangos de hasta 6 h dentro de su retención; si no, horas"""
+        if end_s - start_s <= 6 * 3600 and start_s >= time.time() - self.retention_s["minute"]:
+            return "minute"
+        return "hour"
+
+    @staticmethod
+    def _summarize(count: int, dominant: np.ndarray, sums: np.ndarray) -> Dict:
+        return {
+            "count": int(count),
+            "dominant_counts": dict(zip(EMOTIONS, dominant.tolist())),
+            "mean_scores": dict(zip(EMOTIONS, (sums / count if count else sums).tolist()))
+        }
+
+    def query(
+        self,
+        start_s: float,
+        end_s: float,
+        detection_type: Optional[str] = None,
+        granularity: Optional[str] = None
+    ) -> Dict:
+        """Agrega los intervalos que se solapan con [start_s, end_s).
+
+        El coste es proporcional al número de intervalos del rango (acotado por
+        la retención), no al número de registros.
+        """
+        granularity = granularity or self.choose_granularity(start_s, end_s)
+        size = GRANULARITIES[granularity]
+        first = int(max(start_s, time.time() - self.retention_s[granularity]) // size)
+        last = int(np.ceil(end_s / size)) - 1
+        types = [detection_type] if detection_type else [t.value for t in DetectionType]
+
+        by_type: Dict[str, List] = {}
+        timeline: Dict[int, List] = {}
+        with self._lock:
+            buckets = self._buckets[granularity]
+            for index in range(first, last + 1):
+                for kind in types:
+                    bucket = buckets.get((kind, index))
+                    if bucket is None:
+                        continue
+                    kind_total = by_type.setdefault(kind, _empty_bucket())
+                    index_total = timeline.setdefault(index, _empty_bucket())
+                    for target in (kind_total, index_total):
+                        target[0] += bucket[0]
+                        target[1] += bucket[1]
+                        target[2] += bucket[2]
+
+        total = _empty_bucket()
+        for kind_total in by_type.values():
+            total[0] += kind_total[0]
+            total[1] += kind_total[1]
+            total[2] += kind_total[2]
+
+        return {
+            "granularity": granularity,
+            "total": self._summarize(*total),
+            "by_type": {kind: self._summarize(*values) for kind, values in by_type.items()},
+            "buckets": [
+                {"start_s": index * size, **self._summarize(*timeline[index])}
+                for index in sorted(timeline)
+            ]
+        }
+
+# Instancia singleton
+emotion_rollups = EmotionRollups()
@@ -0,0 +1,96 @@
+## @file app/services/executor.py
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from app.config import (
+    EMOTION_MODEL_PATH,
+    EMOTION_MODEL_VERSION,
+    INFERENCE_EXECUTOR,
+    INFERENCE_EXECUTOR_WORKERS
+)
+from app.models.emotion_model import EmotionModel
+
+logger = logging.getLogger(__name__)
+
+# Modelo cargado dentro de cada proceso del pool (modo "process")
+_worker_models: Dict[str, EmotionModel] = {}
+
+def _worker_model(model_path: str, version: str) -> EmotionModel:
+    model = _worker_models.get(model_path)
+    if model is None:
+        model = EmotionModel(model_path=model_path, version=version)
+        # Solo se conserva el último modelo: cada recarga libera el anterior
+        _worker_models.clear()
+        _worker_models[model_path] = model
+    return model
+
+def _init_worker(model_path: str, version: str) -> None:
+    """Precarga el modelo activo al arrancar cada proceso del pool"""
+    _worker_model(model_path, version).warmup()
+
+def _call_model(model_path: str, version: str, method: str, *args) -> Any:
+    return getattr(_worker_model(model_path, version), method)(*args)
+
+class CPUExecutor:
+    """Capa única por la que pasan todas las etapas intensivas en CPU.
+
+    Las rutas `async` esperan aquí a la decodificación, la detección, la
+    clasificación y la codificación JPEG, de modo que el event loop sigue
+    atendiendo otras peticiones (stream MJPEG, historial...) mientras tanto.
+    Con `kind="process"` cada proceso del pool carga su propia copia del modelo
+    desde `model_path`, así que no admite modelos inyectados (`from_files=False`).
+    """
+
+    def __init__(self, kind: str = INFERENCE_EXECUTOR, max_workers: int = INFERENCE_EXECUTOR_WORKERS):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Tipo de executor no válido: {kind}")
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[Executor] = None
+
+    def start(self) -> None:
+        if self._pool is not None:
+            return
+        if self.kind == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # TensorFlow no es seguro tras un fork
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(EMOTION_MODEL_PATH, EMOTION_MODEL_VERSION)
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="cpu-executor"
+            )
+        logger.info(f"Executor de CPU iniciado ({self.kind}, workers={self.max_workers})")
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+            logger.info("Executor de CPU detenido")
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Ejecuta `fn` en el pool (en modo proceso debe ser una función de módulo)"""
+        self.start()
+        call = partial(fn, *args, **kwargs) if kwargs else fn
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool, call, *(() if kwargs else args)
+        )
+
+    async def run_model(self, model: EmotionModel, method: str, *args) -> Any:
+        """Ejecuta un método del modelo; en modo proceso usa la copia del worker"""
+        if self.kind == "process":
+            if not model.from_files:
+                raise ValueError("INFERENCE_EXECUTOR=process solo admite modelos cargados desde fichero")
+            return await self.run(_call_model, model.model_path, model.version, method, *args)
+        return await self.run(getattr(model, method), *args)
+
+# Instancia singleton
+cpu_executor = CPUExecutor()
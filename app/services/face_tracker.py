@@ -0,0 +1,151 @@
+## @file app/services/face_tracker.py
+
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.config import (
+    TRACKER_IOU_THRESHOLD,
+    TRACKER_MAX_MISSES,
+    TRACKER_RECLASSIFY_IOU,
+    TRACKER_REFRESH_FRAMES,
+    TRACKER_SMOOTHING
+)
+
+Box = Tuple[int, int, int, int]
+
+def iou_matrix(a: Sequence[Box], b: Sequence[Box]) -> np.ndarray:
+    """IoU entre todas las cajas (Xi, Yi, Xf, Yf) de `a` y de `b`"""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float64)
+    a = np.asarray(a, dtype=np.float64)[:, None, :]
+    b = np.asarray(b, dtype=np.float64)[None, :, :]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-9)
+
+class Track:
+    def __init__(self, track_id: int, box: Box):
+        self.track_id = track_id
+        self.box = box
+        self.classified_box: Optional[Box] = None
+        self.scores: Optional[Dict[str, float]] = None
+        self.dominant_emotion: Optional[str] = None
+        self.frames_since_classified = 0
+        self.misses = 0
+
+class FaceTracker:
+    """Tracker por IoU que asigna identificadores estables a los rostros.
+
+    Entre frames se empareja cada caja detectada con el track de mayor IoU.
+    Solo se vuelve a clasificar un track cuando es nuevo, cuando su caja se ha
+    desplazado respecto a la última clasificación o cada `refresh_frames`
+    frames; mientras tanto se reutilizan sus scores suavizados (EMA).
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = TRACKER_IOU_THRESHOLD,
+        reclassify_iou: float = TRACKER_RECLASSIFY_IOU,
+        refresh_frames: int = TRACKER_REFRESH_FRAMES,
+        max_misses: int = TRACKER_MAX_MISSES,
+        smoothing: float = TRACKER_SMOOTHING
+    ):
+        self.iou_threshold = iou_threshold
+        self.reclassify_iou = reclassify_iou
+        self.refresh_frames = max(1, refresh_frames)
+        self.max_misses = max_misses
+        self.smoothing = smoothing
+        self._tracks: List[Track] = []
+        self._ids = itertools.count(1)
+
+        # Métricas
+        self.classified = 0
+        self.reused = 0
+
+    def update(self, boxes: Sequence[Box]) -> Tuple[List[Track], List[int]]:
+        """Empareja las cajas del frame con los tracks existentes.
+
+        Devuelve el track asignado a cada caja (en el mismo orden) y los índices
+        de las cajas que necesitan pasar por el clasificador.
+        """
+        ious = iou_matrix(boxes, [t.box for t in self._tracks])
+        assigned: List[Optional[Track]] = [None] * len(boxes)
+        used = set()
+
+        # Emparejamiento voraz por IoU descendente
+        if ious.size:
+            for flat in np.argsort(-ious, axis=None):
+                i, j = np.unravel_index(flat, ious.shape)
+                if ious[i, j] < self.iou_threshold:
+                    break
+                if assigned[i] is not None or j in used:
+                    continue
+                assigned[i] = self._tracks[j]
+                used.add(j)
+
+        # Tracks sin detección en este frame
+        survivors = []
+        for j, track in enumerate(self._tracks):
+            if j in used:
+                track.misses = 0
+                survivors.append(track)
+            else:
+                track.misses += 1
+                if track.misses <= self.max_misses:
+                    survivors.append(track)
+        self._tracks = survivors
+
+        to_classify = []
+        for i, box in enumerate(boxes):
+            track = assigned[i]
+            if track is None:
+                track = Track(next(self._ids), box)
+                self._tracks.append(track)
+                assigned[i] = track
+            track.box = box
+            track.frames_since_classified += 1
+
+            if self._needs_classification(track):
+                to_classify.append(i)
+            else:
+                self.reused += 1
+        self.classified += len(to_classify)
+        return assigned, to_classify
+
+    def _needs_classification(self, track: Track) -> bool:
+        if track.scores is None or track.classified_box is None:
+            return True
+        if track.frames_since_classified >= self.refresh_frames:
+            return True
+        moved = iou_matrix([track.box], [track.classified_box])[0, 0]
+        return moved < self.reclassify_iou
+
+    def observe(self, track: Track, scores: Dict[str, float]) -> None:
+        """Incorpora una nueva clasificación al track suavizando los scores"""
+        if track.scores is None:
+            smoothed = dict(scores)
+        else:
+            alpha = self.smoothing
+            smoothed = {
+                k: alpha * float(v) + (1.0 - alpha) * track.scores.get(k, 0.0)
+                for k, v in scores.items()
+            }
+        track.scores = smoothed
+        track.dominant_emotion = max(smoothed, key=smoothed.get)
+        track.classified_box = track.box
+        track.frames_since_classified = 0
+
+    def reset(self) -> None:
+        self._tracks = []
+
+    def stats(self) -> Dict:
+        total = self.classified + self.reused
+        return {
+            "active_tracks": len(self._tracks),
+            "classified": self.classified,
+            "reused": self.reused,
+            "reuse_ratio": self.reused / total if total else 0.0
+        }
@@ -0,0 +1,96 @@
+## @file app/services/history_export_service.py
+
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from app.config import HISTORY_EXPORT_BATCH_SIZE
+from app.schemas.domain.emotions import EmotionScores
+from app.services.history_repository import history_repo
+
+EMOTIONS = list(EmotionScores.__fields__)
+CSV_FIELDS = ["id", "timestamp", "detection_type", "dominant_emotion", *EMOTIONS, "snapshot_id"]
+
+# Tamaño aproximado de cada bloque enviado al cliente
+CHUNK_BYTES = 64 * 1024
+
+async def _export_rows(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    detection_type: Optional[str],
+    include_snapshots: bool,
+    thumbnail: bool
+) -> AsyncIterator[Dict]:
+    """Filas planas de exportación; el snapshot solo se lee si se pide"""
+    last_snapshot = (None, None)  # registros consecutivos suelen compartir snapshot
+    async for record in history_repo.iter_records(start, end, detection_type, HISTORY_EXPORT_BATCH_SIZE):
+        row = {
+            "id": record.id,
+            "timestamp": record.timestamp.isoformat(),
+            "detection_type": record.detection_type.value,
+            "dominant_emotion": record.dominant_emotion,
+            **record.emotion_scores.dict(),
+            "snapshot_id": record.snapshot_id
+        }
+        if include_snapshots:
+            if record.snapshot_id is not None and record.snapshot_id != last_snapshot[0]:
+                data = await history_repo.get_snapshot(record.id, thumbnail=thumbnail)
+                last_snapshot = (record.snapshot_id, base64.b64encode(data).decode("ascii") if data else None)
+            row["snapshot_jpeg_base64"] = last_snapshot[1] if record.snapshot_id is not None else None
+        yield row
+
+async def _chunked(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Agrupa líneas en bloques de ~CHUNK_BYTES para no enviar un mensaje por registro"""
+    buffer: List[str] = []
+    size = 0
+    async for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+async def export_ndjson(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    detection_type: Optional[str] = None,
+    include_snapshots: bool = False,
+    thumbnail: bool = False
+) -> AsyncIterator[str]:
+    async def lines():
+        async for row in _export_rows(start, end, detection_type, include_snapshots, thumbnail):
+            yield json.dumps(row) + "\n"
+
+    async for chunk in _chunked(lines()):
+        yield chunk
+
+async def export_csv(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    detection_type: Optional[str] = None,
+    include_snapshots: bool = False,
+    thumbnail: bool = False
+) -> AsyncIterator[str]:
+    fields = CSV_FIELDS + (["snapshot_jpeg_base64"] if include_snapshots else [])
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+
+    def take() -> str:
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    async def lines():
+        writer.writeheader()
+        yield take()
+        async for row in _export_rows(start, end, detection_type, include_snapshots, thumbnail):
+            writer.writerow(row)
+            yield take()
+
+    async for chunk in _chunked(lines()):
+        yield chunk
@@ -1,73 +1,206 @@
 ## @file: app/services/history_repository.py
 
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional
 import uuid
-import base64
-import cv2
 import logging
-from typing import Optional
-import numpy as np
+from app.config import (
+    HISTORY_BACKEND,
+    HISTORY_MAX_RECORDS,
+    HISTORY_MEMORY_MAX_RECORDS,
+    HISTORY_RETENTION_DAYS,
+    HISTORY_SQLITE_PATH
+)
 from app.schemas.api.history import HistoryRecord, HistoryRecordCreate
+from app.services.emotion_rollups import emotion_rollups
+from app.services.snapshot_store import snapshot_store
+from app.utils.timestamps import to_epoch
 
 logger = logging.getLogger(__name__)
 
 class HistoryRepository:
-    def __init__(self):
+    """Interfaz asíncrona común a todos los backends de historial.
+
+    Los registros se devuelven siempre de más reciente a más antiguo. La
+    paginación admite `page` (desplazamiento) o `cursor`, que es el id del
+    último registro de la página anterior (paginación por clave); sin
+    ninguno de los dos se devuelve la primera página. Cada
+    backend actualiza `emotion_rollups` con los registros que crea.
+    """
+
+    async def create_record(self, record_data: HistoryRecordCreate) -> HistoryRecord:
+        raise NotImplementedError
+
+    async def create_records(self, records: List[HistoryRecordCreate]) -> List[HistoryRecord]:
+        """Escritura por lotes; los backends pueden agruparla en una transacción"""
+        return [await self.create_record(record) for record in records]
+
+    async def get_history(
+        self,
+        page: Optional[int] = None,
+        per_page: Optional[int] = 10,
+        detection_type: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[HistoryRecord]:
+        raise NotImplementedError
+
+    async def count(self, detection_type: Optional[str] = None) -> int:
+        raise NotImplementedError
+
+    def iter_records(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        detection_type: Optional[str] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[HistoryRecord]:
+        """Recorre los registros de más antiguo a más reciente en [start, end) sin materializarlos"""
+        raise NotImplementedError
+
+    async def get_record(self, record_id: str) -> Optional[HistoryRecord]:
+        raise NotImplementedError
+
+    async def get_snapshot(self, record_id: str, thumbnail: bool = False) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def clear_history(self) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+class InMemoryHistoryRepository(HistoryRepository):
+    def __init__(
+        self,
+        max_records: int = HISTORY_MEMORY_MAX_RECORDS,
+        retention_days: float = HISTORY_RETENTION_DAYS
+    ):
         self._history: List[HistoryRecord] = []
-        self._max_records = 100
+        self._max_records = max_records
+        self._retention = timedelta(days=retention_days) if retention_days > 0 else None
 
     async def create_record(self, record_data: HistoryRecordCreate) -> HistoryRecord:
         try:
-            logger.info(f"Intentando crear registro: {record_data.dict()}")
             record = HistoryRecord(
                 id=str(uuid.uuid4()),
                 **record_data.dict()
             )
+            # Cada registro mantiene una referencia a su snapshot
+            if record.snapshot_id is not None and not snapshot_store.acquire(record.snapshot_id):
+                record.snapshot_id = None
             self._history.append(record)
-            
-            if len(self._history) > self._max_records:
-                self._history = self._history[-self._max_records:]
-                
-            logger.info(f"Registro creado exitosamente. Total: {len(self._history)}")
+            self._apply_retention()
+            emotion_rollups.add_records([record])
+
+            logger.debug(f"Registro creado: {record.id} (total: {len(self._history)})")
             return record
         except Exception as e:
             logger.error(f"Error al crear registro: {str(e)}")
             raise
 
+    def _apply_retention(self) -> None:
+        drop = max(0, len(self._history) - self._max_records)
+        if self._retention is not None:
+            cutoff = datetime.utcnow() - self._retention
+            while drop < len(self._history) and self._history[drop].timestamp < cutoff:
+                drop += 1
+        if drop:
+            for dropped in self._history[:drop]:
+                snapshot_store.release(dropped.snapshot_id)
+            self._history = self._history[drop:]
+
+    def _filtered(self, detection_type: Optional[str]) -> List[HistoryRecord]:
+        return [
+            record for record in self._history
+            if detection_type is None or record.detection_type.lower() == detection_type.lower()
+        ][::-1]  # Más recientes primero
+
     async def get_history(
-        self, 
-        page: Optional[int] = None, 
+        self,
+        page: Optional[int] = None,
         per_page: Optional[int] = 10,
-        detection_type: Optional[str] = None
+        detection_type: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[HistoryRecord]:
         """Obtiene el historial con paginación y filtrado por tipo"""
         try:
             # Filtrar por tipo si se especifica
-            filtered_records = [
-                record for record in self._history
-                if detection_type is None or record.detection_type.lower() == detection_type.lower()
-            ][::-1]  # Más recientes primero
-            
-            # Aplicar paginación
-            if page is not None and per_page is not None:
-                start = (page - 1) * per_page
-                end = start + per_page
-                return filtered_records[start:end]
-                
-            return filtered_records
+            filtered_records = self._filtered(detection_type)
+
+            if cursor is not None:
+                position = next(
+                    (i for i, record in enumerate(filtered_records) if record.id == cursor), None
+                )
+                if position is None:
+                    return []
+                filtered_records = filtered_records[position + 1:]
+            elif page is not None and per_page is not None:
+                filtered_records = filtered_records[(page - 1) * per_page:]
+
+            # Sin `page` ni `cursor` se devuelve la primera página, como en SQLite
+            return filtered_records[:per_page] if per_page is not None else filtered_records
         except Exception as e:
             logger.error(f"Error al obtener historial: {str(e)}")
             raise
 
+    async def count(self, detection_type: Optional[str] = None) -> int:
+        if detection_type is None:
+            return len(self._history)
+        return sum(1 for record in self._history if record.detection_type.lower() == detection_type.lower())
+
+    async def iter_records(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        detection_type: Optional[str] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[HistoryRecord]:
+        # Se compara en epoch: los límites pueden llegar con zona horaria (`...Z`)
+        start_s = to_epoch(start) if start is not None else None
+        end_s = to_epoch(end) if end is not None else None
+        # Copia de las referencias: la lista puede cambiar mientras se exporta
+        for record in list(self._history):
+            if detection_type is not None and record.detection_type.lower() != detection_type.lower():
+                continue
+            timestamp = to_epoch(record.timestamp)
+            if start_s is not None and timestamp < start_s:
+                continue
+            if end_s is not None and timestamp >= end_s:
+                continue
+            yield record
+
+    async def get_record(self, record_id: str) -> Optional[HistoryRecord]:
+        for record in reversed(self._history):
+            if record.id == record_id:
+                return record
+        return None
+
+    async def get_snapshot(self, record_id: str, thumbnail: bool = False) -> Optional[bytes]:
+        """Bytes JPEG del snapshot asociado a un registro"""
+        record = await self.get_record(record_id)
+        if record is None or record.snapshot_id is None:
+            return None
+        return snapshot_store.get(record.snapshot_id, thumbnail=thumbnail)
+
     async def clear_history(self) -> None:
         """Borra todo el historial"""
+        for record in self._history:
+            snapshot_store.release(record.snapshot_id)
         self._history = []
+        emotion_rollups.clear()
 
-    @staticmethod
-    def image_to_base64(image: np.ndarray) -> str:
-        """Convierte una imagen OpenCV a base64"""
-        _, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 70])
-        return f"data:image/jpeg;base64,{base64.b64encode(buffer).decode('utf-8')}"
+def create_history_repository(backend: str = HISTORY_BACKEND) -> HistoryRepository:
+    """Crea el backend de historial configurado ('memory' o 'sqlite')"""
+    if backend == "memory":
+        return InMemoryHistoryRepository()
+    if backend == "sqlite":
+        from app.services.sqlite_history_repository import SQLiteHistoryRepository
+        return SQLiteHistoryRepository(
+            HISTORY_SQLITE_PATH,
+            max_records=HISTORY_MAX_RECORDS,
+            retention_days=HISTORY_RETENTION_DAYS
+        )
+    raise ValueError(f"Backend de historial no válido: {backend}")
 
 # Instancia singleton
-history_repo = HistoryRepository()
\ No newline at end of file
+history_repo = create_history_repository()
@@ -0,0 +1,209 @@
+## @file app/services/history_writer.py
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.config import (
+    HISTORY_FLUSH_TIMEOUT_S,
+    HISTORY_QUEUE_FULL_POLICY,
+    HISTORY_QUEUE_MAX_SIZE,
+    HISTORY_WRITE_BATCH_SIZE,
+    HISTORY_WRITE_BEHIND
+)
+from app.schemas.api.history import HistoryRecordCreate
+from app.schemas.core import DetectionType
+from app.services.executor import cpu_executor
+from app.services.history_repository import history_repo
+from app.services.snapshot_store import encode_snapshot, snapshot_store
+from app.utils.image_processing import decode_image
+
+logger = logging.getLogger(__name__)
+
+class HistoryJob:
+    """Registros de un mismo frame pendientes de escribir.
+
+    Lleva el frame decodificado o, si no se decodificó (resultado en caché),
+    los bytes originales de la imagen; el snapshot se codifica al escribir.
+    """
+
+    __slots__ = ("detection_type", "timestamp", "faces", "frame", "image")
+
+    def __init__(
+        self,
+        detection_type: DetectionType,
+        faces: Sequence[Tuple[str, Dict[str, float]]],
+        frame: Optional[np.ndarray] = None,
+        image: Optional[bytes] = None,
+        timestamp: Optional[datetime] = None
+    ):
+        self.detection_type = detection_type
+        self.faces = faces  # (emoción dominante, scores) por registro
+        self.frame = frame
+        self.image = image
+        self.timestamp = timestamp or datetime.utcnow()
+
+def _decode_and_encode(image: bytes):
+    frame = decode_image(image)
+    return encode_snapshot(frame) if frame is not None else None
+
+class HistoryWriter:
+    """Cola acotada de escritura diferida del historial.
+
+    Las peticiones solo encolan un `HistoryJob` y continúan; una tarea en
+    segundo plano vacía la cola por lotes, codifica los snapshots y escribe
+    los registros con `create_records`. Con la cola llena se descarta el
+    trabajo (`drop`) o se espera a que haya hueco (`block`). Al detenerse se
+    vacía la cola pendiente.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = HISTORY_WRITE_BEHIND,
+        max_size: int = HISTORY_QUEUE_MAX_SIZE,
+        full_policy: str = HISTORY_QUEUE_FULL_POLICY,
+        batch_size: int = HISTORY_WRITE_BATCH_SIZE,
+        flush_timeout_s: float = HISTORY_FLUSH_TIMEOUT_S
+    ):
+        if full_policy not in ("drop", "block"):
+            raise ValueError(f"Política de cola llena no válida: {full_policy}")
+        self.enabled = enabled
+        self.max_size = max(1, max_size)
+        self.full_policy = full_policy
+        self.batch_size = max(1, batch_size)
+        self.flush_timeout_s = flush_timeout_s
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Métricas
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        if self.enabled and (self._task is None or self._task.done()):
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(
+                f"Escritura diferida del historial iniciada (cola={self.max_size}, "
+                f"lote={self.batch_size}, política={self.full_policy})"
+            )
+
+    async def stop(self) -> None:
+        """Vacía la cola pendiente (con límite de tiempo) y detiene la tarea"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.flush_timeout_s)
+        except asyncio.TimeoutError:
+            logger.warning(f"Historial: {self._queue.qsize()} trabajos sin escribir al detener")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(self, job: HistoryJob) -> bool:
+        """Encola un trabajo; False si se descartó por tener la cola llena"""
+        if self._task is None:
+            # Sin tarea en segundo plano la escritura es directa
+            await self._write([job])
+            return True
+
+        if self.full_policy == "block":
+            await self._queue.put(job)
+        else:
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 100 == 0:
+                    logger.warning(f"Cola de historial llena: {self.dropped} trabajos descartados")
+                return False
+        self.enqueued += 1
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _snapshot(self, job: HistoryJob) -> Optional[str]:
+        if job.frame is not None:
+            return await snapshot_store.put_frame(job.frame)
+        if job.image is not None:
+            encoded = await cpu_executor.run(_decode_and_encode, job.image)
+            return snapshot_store.put_encoded(encoded) if encoded is not None else None
+        return None
+
+    async def _write(self, batch: List[HistoryJob]) -> None:
+        snapshot_ids = []
+        try:
+            records = []
+            for job in batch:
+                # Un trabajo que falla no descarta el resto del lote
+                try:
+                    records.extend(await self._job_records(job, snapshot_ids))
+                except Exception:
+                    self.errors += 1
+                    logger.exception(f"Error al preparar registros de historial ({len(job.faces)} caras)")
+            if not records:
+                return
+            await history_repo.create_records(records)
+            self.written += len(records)
+            self.batches += 1
+            logger.debug(f"Historial: {len(records)} registros escritos")
+        except Exception:
+            self.errors += 1
+            logger.exception(f"Error al escribir lote de historial ({len(batch)} trabajos)")
+        finally:
+            # Los registros ya tienen su propia referencia al snapshot
+            for snapshot_id in snapshot_ids:
+                snapshot_store.release(snapshot_id)
+
+    async def _job_records(self, job: HistoryJob, snapshot_ids: List[Optional[str]]) -> List[HistoryRecordCreate]:
+        snapshot_id = None
+        if job.faces:
+            try:
+                snapshot_id = await self._snapshot(job)
+            except Exception:
+                # Sin snapshot los registros siguen siendo útiles
+                logger.exception("Error al guardar el snapshot del historial")
+        snapshot_ids.append(snapshot_id)
+        return [
+            HistoryRecordCreate(
+                timestamp=job.timestamp,
+                dominant_emotion=dominant_emotion,
+                emotion_scores=scores,
+                detection_type=job.detection_type,
+                snapshot_id=snapshot_id
+            )
+            for dominant_emotion, scores in job.faces
+        ]
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "full_policy": self.full_policy,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors
+        }
+
+# Instancia singleton
+history_writer = HistoryWriter()
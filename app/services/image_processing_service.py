@@ -1,36 +1,73 @@
 ## @file: app/services/image_processing_service.py
 
+import asyncio
+import logging
+import zipfile
 from datetime import datetime
 import uuid
-import cv2
-import numpy as np
+from starlette.concurrency import run_in_threadpool
+from app.config import BATCH_MAX_CONCURRENCY, BATCH_MAX_IMAGE_BYTES
 from app.models.emotion_model import EmotionModel
-from app.schemas.api.history import HistoryRecordCreate
-from app.services.history_repository import history_repo
+from app.services.history_writer import HistoryJob, history_writer
+from app.services.inference_service import predict_emotion
+from app.services.executor import cpu_executor
+from app.services.result_cache import result_cache
+from app.utils.image_processing import decode_image
 from app.schemas.core import DetectionType
-from typing import Dict
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Tuple
 
-async def process_image(image: bytes, emotion_model: EmotionModel) -> Dict:
-    nparr = np.frombuffer(image, np.uint8)
-    frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    
-    if frame is None:
-        raise ValueError("No se pudo decodificar la imagen")
-    
-    raw_faces = emotion_model.predict_emotion(frame)
+logger = logging.getLogger(__name__)
+
+# Extensiones aceptadas dentro de un zip
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tif', '.tiff')
+
+async def process_image(image: bytes, emotion_model: EmotionModel, detector: Optional[str] = None) -> Dict:
+    # Consultar la caché por contenido antes de decodificar
+    cache_key = None
+    cached = None
+    if result_cache.enabled:
+        # La ruta de los pesos y el detector forman parte de la clave: recargar la
+        # misma versión con otro fichero no debe servir resultados del anterior
+        detector_name = emotion_model.detector_name(detector)
+        model_id = f"{emotion_model.version}@{emotion_model.model_path}+{detector_name}"
+        cache_key = await result_cache.key(image, model_id)
+        cached = await result_cache.get(cache_key)
+
+    frame = None
+    if cached is not None:
+        raw_faces = cached["faces"]
+        frame_info = cached["frameInfo"]
+    else:
+        frame = await cpu_executor.run(decode_image, image)
+        
+        if frame is None:
+            raise ValueError("No se pudo decodificar la imagen")
+        
+        raw_faces = await predict_emotion(frame, emotion_model, detector)
+        frame_info = {
+            "height": int(frame.shape[0]),
+            "width": int(frame.shape[1]),
+            "channels": int(frame.shape[2]) if len(frame.shape) > 2 else 1
+        }
+
+        if cache_key is not None:
+            await result_cache.put(cache_key, {
+                "faces": raw_faces,
+                "frameInfo": frame_info
+            })
     
+    # Guardar en historial fuera de la petición; el snapshot se codifica al escribir
+    if raw_faces:
+        await history_writer.submit(HistoryJob(
+            DetectionType.IMAGE,
+            [(face["dominant_emotion"], face["scores"]) for face in raw_faces],
+            frame=frame,
+            image=image if frame is None else None
+        ))
+
     detections = []    
     for face in raw_faces:
-        # Guardar en historial
-        record_data = HistoryRecordCreate(
-            dominant_emotion=face["dominant_emotion"],
-            emotion_scores=face["scores"],
-            detection_type=DetectionType.IMAGE,
-            image_snapshot=history_repo.image_to_base64(frame)
-        )
-        await history_repo.create_record(record_data)
-        
-        # Preparar respuesta
+        # Preparar respuesta (identificadores y timestamps siempre nuevos)
         detection = {
             "faceId": str(uuid.uuid4()),
             "emotions": {k: float(v) for k, v in face["scores"].items()},
@@ -47,9 +84,75 @@ async def process_image(image: bytes, emotion_model: EmotionModel) -> Dict:
     
     return {
         "detections": detections,
-        "frameInfo": {
-            "height": int(frame.shape[0]),
-            "width": int(frame.shape[1]),
-            "channels": int(frame.shape[2]) if len(frame.shape) > 2 else 1
-        }
-    }
\ No newline at end of file
+        "frameInfo": dict(frame_info)
+    }
+
+async def process_images(
+    images: AsyncIterator[Tuple[str, Optional[bytes]]],
+    emotion_model: EmotionModel,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+    detector: Optional[str] = None
+) -> AsyncIterator[Dict]:
+    """Procesa un lote de imágenes de forma concurrente y las entrega según terminan.
+
+    `images` se consume de forma perezosa: como mucho hay `max_concurrency`
+    imágenes en memoria a la vez, sea cual sea el tamaño del lote. Un valor
+    `None` en lugar de bytes indica una entrada rechazada (demasiado grande).
+    """
+    async def run_one(index: int, filename: str, image: Optional[bytes]) -> Dict:
+        item = {"index": index, "filename": filename}
+        if image is None:
+            item["error"] = f"La imagen supera el tamaño máximo de {BATCH_MAX_IMAGE_BYTES} bytes"
+            return item
+        try:
+            item["result"] = await process_image(image, emotion_model, detector)
+        except ValueError as e:
+            item["error"] = str(e)
+        except Exception as e:
+            logger.error(f"Error al procesar {filename}: {str(e)}", exc_info=True)
+            item["error"] = f"Error al procesar la imagen: {str(e)}"
+        return item
+
+    iterator = images.__aiter__()
+    pending = set()
+    index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max(1, max_concurrency):
+                try:
+                    filename, image = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(run_one(index, filename, image)))
+                index += 1
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # El cliente se desconectó: no seguir procesando
+        for task in pending:
+            task.cancel()
+
+async def iter_zip_images(
+    archive_file: BinaryIO,
+    max_image_bytes: int = BATCH_MAX_IMAGE_BYTES
+) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+    """Extrae una a una las imágenes de un zip sin descomprimirlo entero en memoria"""
+    archive = await run_in_threadpool(zipfile.ZipFile, archive_file)
+    try:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith('__MACOSX/') or not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            if info.file_size > max_image_bytes:
+                yield name, None
+                continue
+            yield name, await run_in_threadpool(archive.read, info)
+    finally:
+        archive.close()
@@ -0,0 +1,77 @@
+## @file app/services/inference_gate.py
+
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict
+from app.config import CAMERA_MAX_CONCURRENT_INFERENCES
+
+class FairInferenceGate:
+    """Limita las inferencias simultáneas y reparte los huecos por turnos entre claves.
+
+    Cada clave (por ejemplo, una fuente de vídeo) tiene su propia cola FIFO.
+    Cuando se libera un hueco se atiende a la siguiente clave en orden
+    round-robin, de modo que una fuente con muchas peticiones no deja sin
+    turno a las demás y el uso de CPU queda acotado por `max_concurrent`.
+    """
+
+    def __init__(self, max_concurrent: int = CAMERA_MAX_CONCURRENT_INFERENCES):
+        self.max_concurrent = max(1, max_concurrent)
+        self._active = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+        # Métricas
+        self.granted: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def slot(self, key: str) -> AsyncIterator[None]:
+        await self._acquire(key)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, key: str) -> None:
+        if self._active < self.max_concurrent and not self._waiters:
+            self._grant(key)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # El hueco se concedió justo antes de cancelar: se cede al siguiente
+                self._release()
+            raise
+
+    def _grant(self, key: str) -> None:
+        self._active += 1
+        self.granted[key] = self.granted.get(key, 0) + 1
+
+    def _release(self) -> None:
+        self._active -= 1
+        while self._active < self.max_concurrent and self._waiters:
+            key, queue = next(iter(self._waiters.items()))
+            future = queue.popleft()
+            # La clave atendida pasa al final de la ronda
+            if queue:
+                self._waiters.move_to_end(key)
+            else:
+                del self._waiters[key]
+            if future.cancelled():
+                continue
+            self._grant(key)
+            future.set_result(None)
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "waiting": {key: len(queue) for key, queue in self._waiters.items()},
+            "granted": dict(self.granted)
+        }
+
+# Instancia singleton
+inference_gate = FairInferenceGate()
@@ -0,0 +1,168 @@
+## @file app/services/inference_scheduler.py
+
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import numpy as np
+from app.config import INFERENCE_MAX_BATCH_SIZE, INFERENCE_MAX_WAIT_MS
+from app.models.emotion_model import EmotionModel
+from app.services.executor import cpu_executor
+
+logger = logging.getLogger(__name__)
+
+# (modelo, caras preprocesadas, future con las predicciones)
+_PendingItem = Tuple[EmotionModel, np.ndarray, asyncio.Future]
+
+class InferenceScheduler:
+    """Agrupa las caras de peticiones concurrentes en lotes para el clasificador.
+
+    Cada petición encola su tensor de caras y espera un future. Un único bucle
+    en segundo plano vacía la cola cuando se alcanza `max_batch_size` caras o
+    cuando pasa `max_wait_ms` desde la primera petición pendiente, ejecuta una
+    sola pasada del modelo y reparte las filas de resultado a cada petición.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = INFERENCE_MAX_BATCH_SIZE,
+        max_wait_ms: float = INFERENCE_MAX_WAIT_MS
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._pending: Deque[_PendingItem] = deque()
+        self._pending_faces = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Métricas
+        self._requests = 0
+        self._batches = 0
+        self._batched_faces = 0
+        self._errors = 0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(
+                f"Scheduler de inferencia iniciado (batch={self.max_batch_size}, "
+                f"espera={self.max_wait * 1000:.1f} ms)"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._pending:
+            _, _, future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(RuntimeError("Scheduler de inferencia detenido"))
+        self._pending_faces = 0
+
+    async def classify(self, model: EmotionModel, faces: np.ndarray) -> np.ndarray:
+        """Encola un tensor (N, 224, 224, 3) y devuelve sus predicciones (N, 7)"""
+        if len(faces) == 0:
+            return model.classify_faces(faces)
+
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((model, faces, future))
+        self._pending_faces += len(faces)
+        self._requests += 1
+        self._wakeup.set()
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+
+            # Esperar a llenar el lote o a que venza el plazo máximo
+            deadline = loop.time() + self.max_wait
+            while self._pending_faces < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = self._take_batch()
+            if not self._pending:
+                self._wakeup.clear()
+            if batch:
+                await self._flush(batch)
+
+    def _take_batch(self) -> List[_PendingItem]:
+        batch: List[_PendingItem] = []
+        size = 0
+        while self._pending:
+            n = len(self._pending[0][1])
+            if batch and size + n > self.max_batch_size:
+                break
+            item = self._pending.popleft()
+            self._pending_faces -= n
+            if item[2].done():
+                # La petición se canceló mientras esperaba
+                continue
+            batch.append(item)
+            size += n
+        return batch
+
+    async def _flush(self, batch: List[_PendingItem]) -> None:
+        # Durante un cambio de modelo pueden convivir dos versiones en la cola
+        groups: Dict[int, List[_PendingItem]] = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+
+        for items in groups.values():
+            model = items[0][0]
+            faces = items[0][1] if len(items) == 1 else np.concatenate([f for _, f, _ in items])
+            try:
+                preds = await cpu_executor.run_model(model, "classify_faces", faces)
+            except Exception as e:
+                logger.error(f"Error en la inferencia por lotes: {str(e)}", exc_info=True)
+                self._errors += 1
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._batches += 1
+            self._batched_faces += len(faces)
+
+            offset = 0
+            for _, item_faces, future in items:
+                n = len(item_faces)
+                if not future.done():
+                    future.set_result(preds[offset:offset + n])
+                offset += n
+
+    def stats(self) -> Dict:
+        """Profundidad de cola y ratio de llenado de los lotes"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": len(self._pending),
+            "queued_faces": self._pending_faces,
+            "requests": self._requests,
+            "batches": self._batches,
+            "batched_faces": self._batched_faces,
+            "avg_batch_size": self._batched_faces / self._batches if self._batches else 0.0,
+            "batch_fill_ratio": (
+                self._batched_faces / (self._batches * self.max_batch_size)
+                if self._batches else 0.0
+            ),
+            "errors": self._errors
+        }
+
+# Instancia singleton
+inference_scheduler = InferenceScheduler()
@@ -0,0 +1,63 @@
+## @file app/services/inference_service.py
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.config import INFERENCE_BATCHING_ENABLED
+from app.models.emotion_model import EmotionModel
+from app.services.executor import cpu_executor
+from app.services.inference_scheduler import inference_scheduler
+from app.services.inference_workers import inference_workers
+from app.utils.image_processing import preprocess_faces
+
+async def predict_emotion(
+    frame: np.ndarray,
+    emotion_model: EmotionModel,
+    detector: Optional[str] = None
+) -> List[Dict]:
+    """Detecta y clasifica las caras de un frame.
+
+    Con el pool de procesos activo, el frame se entrega a un worker por memoria
+    compartida. Si no, con el micro-batching activo la clasificación pasa por el
+    scheduler compartido para agruparse con las caras de otras peticiones.
+    `detector` elige el detector de rostros (None = el de la configuración).
+    """
+    if inference_workers.enabled:
+        return await inference_workers.predict_emotion(frame, emotion_model, detector)
+
+    if not INFERENCE_BATCHING_ENABLED:
+        return await cpu_executor.run_model(emotion_model, "predict_emotion", frame, detector)
+
+    boxes, faces = await cpu_executor.run_model(emotion_model, "extract_faces", frame, detector)
+    if not boxes:
+        return []
+
+    preds = await inference_scheduler.classify(emotion_model, faces)
+    return emotion_model.build_results(boxes, preds)
+
+async def locate_faces(
+    frame: np.ndarray,
+    emotion_model: EmotionModel,
+    detector: Optional[str] = None
+) -> List[Tuple[int, int, int, int]]:
+    """Solo la etapa de detección: cajas (Xi, Yi, Xf, Yf) de los rostros del frame"""
+    if inference_workers.enabled:
+        return await inference_workers.run("locate", frame, emotion_model, payload=detector)
+    return await cpu_executor.run_model(emotion_model, "locate_faces", frame, detector)
+
+async def classify_boxes(
+    frame: np.ndarray,
+    boxes: Sequence[Tuple[int, int, int, int]],
+    emotion_model: EmotionModel
+) -> List[Dict]:
+    """Solo la etapa de clasificación para las cajas indicadas"""
+    if not boxes:
+        return []
+    if inference_workers.enabled:
+        return await inference_workers.run("classify", frame, emotion_model, payload=list(boxes))
+
+    faces = await cpu_executor.run(preprocess_faces, frame, boxes)
+    if INFERENCE_BATCHING_ENABLED:
+        preds = await inference_scheduler.classify(emotion_model, faces)
+    else:
+        preds = await cpu_executor.run_model(emotion_model, "classify_faces", faces)
+    return emotion_model.build_results(boxes, preds)
@@ -0,0 +1,318 @@
+## @file app/services/inference_workers.py
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.config import INFERENCE_WORKERS, INFERENCE_WORKER_SLOTS, INFERENCE_WORKER_SLOT_BYTES
+from app.models.emotion_model import EmotionModel
+from app.utils.image_processing import preprocess_faces
+
+logger = logging.getLogger(__name__)
+
+def _run_op(model: EmotionModel, op: str, frame: np.ndarray, payload: Any) -> Any:
+    # En "predict" y "locate" el payload es el nombre del detector (o None)
+    if op == "predict":
+        return model.predict_emotion(frame, payload)
+    if op == "locate":
+        return model.locate_faces(frame, payload)
+    if op == "classify":
+        boxes = payload
+        preds = model.classify_faces(preprocess_faces(frame, boxes))
+        return model.build_results(boxes, preds)
+    raise ValueError(f"Operación desconocida: {op}")
+
+# Modelos por proceso: durante un cambio de modelo conviven el anterior y el nuevo
+WORKER_MAX_MODELS = 2
+
+def _worker_model(models: "OrderedDict[str, EmotionModel]", model_path: str, version: str) -> EmotionModel:
+    """Modelo de `model_path` (cargado y calentado si hace falta); descarta el menos reciente"""
+    model = models.get(model_path)
+    if model is None:
+        model = EmotionModel(model_path=model_path, version=version)
+        model.warmup()
+        models[model_path] = model
+        while len(models) > WORKER_MAX_MODELS:
+            models.popitem(last=False)
+    else:
+        models.move_to_end(model_path)
+    return model
+
+def _worker_main(worker_id: int, task_queue, result_queue, model_path: str, version: str) -> None:
+    """Bucle de cada proceso de inferencia: carga el modelo una vez y atiende tareas"""
+    models: "OrderedDict[str, EmotionModel]" = OrderedDict()
+    _worker_model(models, model_path, version)
+    attached: Dict[str, shared_memory.SharedMemory] = {}
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        task_id, op, slot_name, shape, dtype, data, payload, task_model_path, task_version = task
+        try:
+            # Cambio de modelo en caliente en el proceso principal
+            model = _worker_model(models, task_model_path, task_version)
+
+            if slot_name is not None:
+                shm = attached.get(slot_name)
+                if shm is None:
+                    shm = shared_memory.SharedMemory(name=slot_name)
+                    attached[slot_name] = shm
+                frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            else:
+                frame = data
+
+            result = _run_op(model, op, frame, payload)
+            del frame
+            result_queue.put((task_id, True, result))
+        except ValueError as e:
+            # Errores de entrada (imagen no decodificable, detector desconocido): 400 en la API
+            result_queue.put((task_id, False, (True, str(e))))
+        except Exception as e:
+            result_queue.put((task_id, False, (False, f"{type(e).__name__}: {str(e)}")))
+
+    for shm in attached.values():
+        shm.close()
+
+class InferenceWorkerPool:
+    """Pool de procesos de inferencia que cargan `EmotionModel` una sola vez.
+
+    Los frames decodificados se copian a bloques de `multiprocessing.shared_memory`
+    preasignados en lugar de serializarse con pickle; por la cola de tareas solo
+    viaja el nombre del bloque, la forma y el tipo. Los resultados (cajas y scores)
+    vuelven por una cola compartida que un hilo recolector entrega a los futures.
+    Un hilo monitor reinicia los workers caídos y falla sus tareas en curso.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = INFERENCE_WORKERS,
+        num_slots: int = INFERENCE_WORKER_SLOTS,
+        slot_bytes: int = INFERENCE_WORKER_SLOT_BYTES
+    ):
+        self.num_workers = max(0, num_workers)
+        self.num_slots = num_slots if num_slots > 0 else 2 * self.num_workers
+        self.slot_bytes = slot_bytes
+        self._ctx = multiprocessing.get_context("spawn")
+        self._processes: List[Optional[multiprocessing.Process]] = []
+        self._task_queues: List[Any] = []
+        self._result_queue = None
+        self._slots: List[shared_memory.SharedMemory] = []
+        self._free_slots: Optional[asyncio.Queue] = None
+        self._inflight: Dict[int, Tuple[int, asyncio.Future, asyncio.AbstractEventLoop, int]] = {}
+        self._lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self._running = False
+        self._model_path: Optional[str] = None
+        self._version: Optional[str] = None
+
+        # Métricas
+        self._tasks = 0
+        self._restarts = 0
+        self._pickled_frames = 0
+        self._failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.num_workers > 0
+
+    def start(self, model_path: str, version: str) -> None:
+        if self._running or not self.enabled:
+            return
+        self._model_path = model_path
+        self._version = version
+        self._result_queue = self._ctx.Queue()
+        self._slots = [
+            shared_memory.SharedMemory(create=True, size=self.slot_bytes)
+            for _ in range(self.num_slots)
+        ]
+        self._free_slots = asyncio.Queue()
+        for index in range(self.num_slots):
+            self._free_slots.put_nowait(index)
+
+        self._processes = [None] * self.num_workers
+        self._task_queues = [None] * self.num_workers
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+
+        self._running = True
+        threading.Thread(target=self._collect_results, daemon=True).start()
+        threading.Thread(target=self._monitor_workers, daemon=True).start()
+        logger.info(
+            f"Pool de inferencia iniciado ({self.num_workers} procesos, "
+            f"{self.num_slots} bloques de {self.slot_bytes} bytes)"
+        )
+
+    def _spawn(self, worker_id: int) -> None:
+        task_queue = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, task_queue, self._result_queue, self._model_path, self._version),
+            name=f"inference-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self._task_queues[worker_id] = task_queue
+        self._processes[worker_id] = process
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._result_queue.put(None)
+
+        with self._lock:
+            inflight = list(self._inflight.values())
+            self._inflight.clear()
+        for _, future, loop, _ in inflight:
+            loop.call_soon_threadsafe(self._fail, future, RuntimeError("Pool de inferencia detenido"))
+
+        for shm in self._slots:
+            shm.close()
+            shm.unlink()
+        self._slots = []
+        logger.info("Pool de inferencia detenido")
+
+    async def run(self, op: str, frame: np.ndarray, model: EmotionModel, payload: Any = None) -> Any:
+        """Envía una operación sobre `frame` al worker menos cargado y espera su resultado"""
+        if not self._running:
+            raise RuntimeError("Pool de inferencia no iniciado")
+        if not model.from_files:
+            raise ValueError("El pool de inferencia solo admite modelos cargados desde fichero")
+
+        loop = asyncio.get_running_loop()
+        slot_index = await self._free_slots.get()
+        task_id = next(self._task_ids)
+        try:
+            frame = np.ascontiguousarray(frame)
+            if frame.nbytes <= self.slot_bytes:
+                shm = self._slots[slot_index]
+                np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)[...] = frame
+                slot_name, data = shm.name, None
+            else:
+                # Frame mayor que el bloque: se envía serializado
+                slot_name, data = None, frame
+                self._pickled_frames += 1
+
+            future = loop.create_future()
+            with self._lock:
+                worker_id = self._least_loaded_worker()
+                self._inflight[task_id] = (worker_id, future, loop, slot_index)
+                task_queue = self._task_queues[worker_id]
+
+            task_queue.put((
+                task_id, op, slot_name, frame.shape, frame.dtype.str, data, payload,
+                model.model_path, model.version
+            ))
+        except BaseException:
+            # La tarea no llegó al worker: el bloque vuelve a quedar libre
+            with self._lock:
+                self._inflight.pop(task_id, None)
+            self._release(slot_index)
+            raise
+        self._tasks += 1
+        return await future
+
+    async def predict_emotion(
+        self,
+        frame: np.ndarray,
+        model: EmotionModel,
+        detector: Optional[str] = None
+    ) -> List[Dict]:
+        return await self.run("predict", frame, model, payload=detector)
+
+    def _least_loaded_worker(self) -> int:
+        load = [0] * self.num_workers
+        for worker_id, _, _, _ in self._inflight.values():
+            load[worker_id] += 1
+        return min(range(self.num_workers), key=lambda i: load[i])
+
+    def _release(self, slot_index: int) -> None:
+        # El bloque vuelve a estar libre solo cuando el worker ha terminado con él
+        self._free_slots.put_nowait(slot_index)
+
+    def _resolve(self, future: asyncio.Future, ok: bool, result: Any) -> None:
+        if future.done():
+            return
+        if ok:
+            future.set_result(result)
+        else:
+            self._failures += 1
+            # Se conserva la distinción del proceso principal entre ValueError y el resto
+            is_value_error, message = result
+            future.set_exception(ValueError(message) if is_value_error else RuntimeError(message))
+
+    def _fail(self, future: asyncio.Future, error: Exception) -> None:
+        if not future.done():
+            future.set_exception(error)
+
+    def _collect_results(self) -> None:
+        while True:
+            message = self._result_queue.get()
+            if message is None:
+                break
+            task_id, ok, result = message
+            with self._lock:
+                entry = self._inflight.pop(task_id, None)
+            if entry is None:
+                continue
+            _, future, loop, slot_index = entry
+            loop.call_soon_threadsafe(self._release, slot_index)
+            loop.call_soon_threadsafe(self._resolve, future, ok, result)
+
+    def _monitor_workers(self) -> None:
+        while self._running:
+            time.sleep(1.0)
+            for worker_id, process in enumerate(self._processes):
+                if not self._running or process.is_alive():
+                    continue
+
+                logger.error(
+                    f"Worker de inferencia {worker_id} caído (exitcode={process.exitcode}). Reiniciando"
+                )
+                with self._lock:
+                    lost = [
+                        (task_id, entry) for task_id, entry in self._inflight.items()
+                        if entry[0] == worker_id
+                    ]
+                    for task_id, _ in lost:
+                        del self._inflight[task_id]
+                    self._spawn(worker_id)
+                self._restarts += 1
+
+                for _, (_, future, loop, slot_index) in lost:
+                    loop.call_soon_threadsafe(self._release, slot_index)
+                    loop.call_soon_threadsafe(
+                        self._fail, future, RuntimeError(f"El worker de inferencia {worker_id} terminó inesperadamente")
+                    )
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "workers": self.num_workers,
+            "alive_workers": sum(1 for p in self._processes if p is not None and p.is_alive()),
+            "restarts": self._restarts,
+            "slots": self.num_slots,
+            "free_slots": self._free_slots.qsize() if self._free_slots is not None else 0,
+            "inflight": len(self._inflight),
+            "tasks": self._tasks,
+            "failures": self._failures,
+            "pickled_frames": self._pickled_frames
+        }
+
+# Instancia singleton
+inference_workers = InferenceWorkerPool()
@@ -0,0 +1,178 @@
+## @file app/services/mjpeg_broadcaster.py
+
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from app.config import (
+    MJPEG_DEFAULT_TIER,
+    MJPEG_MAX_FPS,
+    MJPEG_QUALITY_TIERS,
+    MJPEG_SUBSCRIBER_QUEUE
+)
+from app.services.executor import cpu_executor
+from app.utils.image_processing import encode_annotated_jpeg, encode_jpeg
+
+logger = logging.getLogger(__name__)
+
+# Margen para no saltarse frames por el jitter de captura al limitar los FPS
+_FPS_TOLERANCE = 0.9
+
+def parse_quality_tiers(spec: str) -> Dict[str, int]:
+    """'low:50,high:80' -> {'low': 50, 'high': 80}"""
+    tiers = {}
+    for item in spec.split(","):
+        name, _, quality = item.strip().partition(":")
+        if name:
+            tiers[name] = int(quality)
+    return tiers
+
+# (nivel de calidad, con anotaciones)
+Variant = Tuple[str, bool]
+
+class MJPEGSubscriber:
+    """Cliente del stream con su propia cola acotada (se descarta el frame más antiguo)"""
+
+    def __init__(self, tier: str, fps: float, queue_size: int, annotated: bool = False):
+        self.tier = tier
+        self.annotated = annotated
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.next_due = 0.0
+        self.dropped = 0
+        self._queue: Deque[bytes] = deque(maxlen=max(1, queue_size))
+        self._ready = asyncio.Event()
+
+    def due(self, now: float) -> bool:
+        return now >= self.next_due
+
+    def offer(self, jpeg: bytes, now: float) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(jpeg)
+        self.next_due = now + self.interval * _FPS_TOLERANCE
+        self._ready.set()
+
+    async def get(self) -> bytes:
+        while not self._queue:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+class MJPEGBroadcaster:
+    """Difunde los frames de la webcam a todos los clientes MJPEG.
+
+    Cada frame capturado se codifica una única vez por variante (nivel de
+    calidad, con o sin anotaciones) que tenga algún cliente pendiente, y los
+    mismos bytes se reparten a todas las colas. Un cliente lento solo pierde
+    sus propios frames. La tarea de difusión solo existe mientras hay
+    clientes conectados. Las anotaciones se dibujan con el último resultado
+    publicado por la fuente (`latest_result`).
+    """
+
+    def __init__(
+        self,
+        source,
+        tiers: Optional[Dict[str, int]] = None,
+        default_tier: str = MJPEG_DEFAULT_TIER,
+        max_fps: float = MJPEG_MAX_FPS,
+        queue_size: int = MJPEG_SUBSCRIBER_QUEUE
+    ):
+        self.source = source
+        self.tiers = tiers or parse_quality_tiers(MJPEG_QUALITY_TIERS)
+        if default_tier not in self.tiers:
+            raise ValueError(f"Nivel de calidad MJPEG por defecto desconocido: {default_tier}")
+        self.default_tier = default_tier
+        self.max_fps = max_fps
+        self.queue_size = queue_size
+        self._subscribers: List[MJPEGSubscriber] = []
+        self._task: Optional[asyncio.Task] = None
+
+        # Métricas
+        self.encoded: Dict[str, int] = {
+            name: 0 for tier in self.tiers for name in (tier, f"{tier}+annotated")
+        }
+        self.sent = 0
+        self._dropped_closed = 0  # frames descartados por clientes ya desconectados
+
+    def subscribe(
+        self,
+        tier: Optional[str] = None,
+        fps: Optional[float] = None,
+        annotated: bool = False
+    ) -> MJPEGSubscriber:
+        tier = tier or self.default_tier
+        if tier not in self.tiers:
+            raise ValueError(f"Nivel de calidad no válido: {tier} (disponibles: {', '.join(self.tiers)})")
+        fps = min(fps, self.max_fps) if fps else self.max_fps
+        subscriber = MJPEGSubscriber(tier, fps, self.queue_size, annotated)
+        self._subscribers.append(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber: MJPEGSubscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+            self._dropped_closed += subscriber.dropped
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def stop(self) -> None:
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_seq = 0
+        while True:
+            # El anillo de frames despierta al event loop con cada frame nuevo
+            last_seq = await self.source.wait_frame(last_seq)
+
+            now = loop.time()
+            due: Dict[Variant, List[MJPEGSubscriber]] = {}
+            for subscriber in self._subscribers:
+                if subscriber.due(now):
+                    due.setdefault((subscriber.tier, subscriber.annotated), []).append(subscriber)
+            if not due:
+                continue
+
+            variants = list(due)
+            # El frame se codifica sin copiarlo: queda fijado hasta terminar
+            with self.source.acquire_frame() as (seq, frame):
+                if frame is None:
+                    continue
+                last_seq = max(last_seq, seq)
+                try:
+                    encoded = await asyncio.gather(*(self._encode(frame, variant) for variant in variants))
+                except Exception as e:
+                    logger.error(f"Error al codificar frame MJPEG: {str(e)}")
+                    continue
+            for (tier, annotated), jpeg in zip(variants, encoded):
+                self.encoded[f"{tier}+annotated" if annotated else tier] += 1
+                for subscriber in due[(tier, annotated)]:
+                    subscriber.offer(jpeg, now)
+                    self.sent += 1
+
+    async def _encode(self, frame, variant: Variant) -> bytes:
+        tier, annotated = variant
+        if annotated:
+            result = getattr(self.source, "latest_result", None)
+            faces = result["faces"] if result is not None else []
+            return await cpu_executor.run(encode_annotated_jpeg, frame, faces, self.tiers[tier])
+        return await cpu_executor.run(encode_jpeg, frame, self.tiers[tier])
+
+    def stats(self) -> Dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "tiers": dict(self.tiers),
+            "encoded": dict(self.encoded),
+            "sent": self.sent,
+            "dropped": self._dropped_closed + sum(s.dropped for s in self._subscribers)
+        }
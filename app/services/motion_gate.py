@@ -0,0 +1,64 @@
+## @file app/services/motion_gate.py
+
+import time
+from typing import Dict, Optional
+import numpy as np
+from app.config import MOTION_GATE_MAX_AGE_S, MOTION_THRESHOLD
+from app.utils.image_processing import frame_signature, signature_distance
+
+class MotionGate:
+    """Detector de cambios que permite reutilizar el último resultado de inferencia.
+
+    Guarda la huella (miniatura en grises) del frame con el que se calculó el
+    último resultado. Si el frame actual apenas difiere de ella y el resultado
+    no ha caducado, se devuelve el resultado cacheado en lugar de ejecutar los
+    modelos. Se compara siempre contra el frame inferido, no contra el previo,
+    para que los cambios lentos acaben disparando una nueva inferencia.
+    """
+
+    def __init__(self, threshold: float = MOTION_THRESHOLD, max_age_s: float = MOTION_GATE_MAX_AGE_S):
+        self.threshold = threshold
+        self.max_age_s = max_age_s
+        self._signature: Optional[np.ndarray] = None
+        self._result: Optional[Dict] = None
+        self._stored_at = 0.0
+
+        # Métricas
+        self.hits = 0
+        self.misses = 0
+
+    def signature(self, frame: np.ndarray) -> np.ndarray:
+        return frame_signature(frame)
+
+    def lookup(self, signature: np.ndarray) -> Optional[Dict]:
+        """Devuelve el resultado cacheado si la escena no ha cambiado"""
+        result = self._result
+        if (
+            result is not None
+            and self._signature is not None
+            and self._signature.shape == signature.shape
+            and time.monotonic() - self._stored_at <= self.max_age_s
+            and signature_distance(self._signature, signature) <= self.threshold
+        ):
+            self.hits += 1
+            return result
+        self.misses += 1
+        return None
+
+    def store(self, signature: np.ndarray, result: Dict) -> None:
+        self._signature = signature
+        self._result = result
+        self._stored_at = time.monotonic()
+
+    def reset(self) -> None:
+        self._signature = None
+        self._result = None
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,210 @@
+## @file app/services/realtime_service.py
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+from fastapi import WebSocket, WebSocketDisconnect
+from app.config import (
+    REALTIME_BURST,
+    REALTIME_MAX_CONNECTIONS,
+    REALTIME_MAX_FPS,
+    REALTIME_MAX_FRAME_BYTES
+)
+from app.models.model_registry import get_emotion_model
+from app.services.executor import cpu_executor
+from app.services.inference_service import predict_emotion
+from app.utils.image_processing import decode_image
+from app.utils.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Limitador de tasa: `rate` frames por segundo con ráfagas de hasta `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+class LatestFrameSlot:
+    """Ranura de un único frame pendiente: el más reciente sustituye al anterior"""
+
+    def __init__(self):
+        self._item: Optional[Tuple[int, bytes, float]] = None
+        self._ready = asyncio.Event()
+
+    def put(self, seq: int, data: bytes) -> bool:
+        """Guarda el frame; True si sustituyó a uno que no llegó a procesarse"""
+        replaced = self._item is not None
+        self._item = (seq, data, time.perf_counter())
+        self._ready.set()
+        return replaced
+
+    async def get(self) -> Tuple[int, bytes, float]:
+        while self._item is None:
+            self._ready.clear()
+            await self._ready.wait()
+        item, self._item = self._item, None
+        return item
+
+class RealtimeSession:
+    """Una conexión WebSocket: recibe frames JPEG binarios y responde con detecciones.
+
+    La recepción y la inferencia van en tareas separadas unidas por una
+    `LatestFrameSlot`: mientras se procesa un frame, los que llegan solo
+    sustituyen al pendiente, así que la respuesta corresponde siempre al
+    frame más reciente y la latencia no crece aunque el cliente envíe más
+    rápido de lo que se infiere.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_fps: float = REALTIME_MAX_FPS,
+        burst: int = REALTIME_BURST,
+        max_frame_bytes: int = REALTIME_MAX_FRAME_BYTES,
+        detector: Optional[str] = None
+    ):
+        self.websocket = websocket
+        self.detector = detector
+        self.bucket = TokenBucket(max_fps, burst)
+        self.max_frame_bytes = max_frame_bytes
+        self.slot = LatestFrameSlot()
+
+        # Contadores de la conexión
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.rate_limited = 0
+
+    async def run(self) -> None:
+        # La sesión termina cuando cualquiera de las dos tareas acaba
+        tasks = [asyncio.create_task(self._receive()), asyncio.create_task(self._process())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    async def _receive(self) -> None:
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            data = message.get("bytes")
+            if data is None:
+                # Los mensajes de texto no se usan por ahora
+                continue
+            if len(data) > self.max_frame_bytes:
+                await self.websocket.close(code=1009)
+                return
+
+            self.received += 1
+            if not self.bucket.take():
+                self.rate_limited += 1
+                continue
+            if self.slot.put(self.received, data):
+                self.dropped += 1
+
+    async def _process(self) -> None:
+        while True:
+            seq, data, received_at = await self.slot.get()
+            frame = await cpu_executor.run(decode_image, data)
+            if frame is None:
+                await self._send({"type": "error", "frame": seq, "detail": "No se pudo decodificar la imagen"})
+                continue
+
+            try:
+                faces = await predict_emotion(frame, get_emotion_model(), self.detector)
+            except Exception as e:
+                logger.error(f"Error de inferencia en WebSocket: {str(e)}")
+                await self._send({"type": "error", "frame": seq, "detail": "Error al procesar el frame"})
+                continue
+            self.processed += 1
+            await self._send({
+                "type": "detection",
+                "frame": seq,
+                "faces": faces,
+                "frame_size": {"height": frame.shape[0], "width": frame.shape[1]},
+                "latency_ms": (time.perf_counter() - received_at) * 1000.0,
+                "stats": self.stats()
+            })
+
+    async def _send(self, message: Dict) -> None:
+        await self.websocket.send_text(dumps(message).decode("utf-8"))
+
+    def stats(self) -> Dict:
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "rate_limited": self.rate_limited
+        }
+
+class RealtimeManager:
+    """Admite conexiones hasta `max_connections` y agrega sus contadores"""
+
+    def __init__(self, max_connections: int = REALTIME_MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self._sessions = set()
+        self._totals = dict.fromkeys(("received", "processed", "dropped", "rate_limited"), 0)
+        self.rejected = 0
+
+    async def handle(self, websocket: WebSocket, detector: Optional[str] = None) -> None:
+        if len(self._sessions) >= self.max_connections:
+            self.rejected += 1
+            # 1013: "try again later"
+            await websocket.close(code=1013)
+            return
+        try:
+            get_emotion_model().detector_name(detector)
+        except ValueError:
+            # 1008: detector de rostros no válido
+            await websocket.close(code=1008)
+            return
+
+        # La plaza se reserva antes del primer await: si no, varias conexiones
+        # simultáneas pasarían la comprobación mientras se completa el accept()
+        session = RealtimeSession(websocket, detector=detector)
+        self._sessions.add(session)
+        try:
+            await websocket.accept()
+            await session.run()
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.error(f"Error en la sesión WebSocket: {str(e)}", exc_info=True)
+        finally:
+            self._sessions.discard(session)
+            for key, value in session.stats().items():
+                self._totals[key] += value
+
+    def stats(self) -> Dict:
+        totals = dict(self._totals)
+        for session in self._sessions:
+            for key, value in session.stats().items():
+                totals[key] += value
+        return {
+            "connections": len(self._sessions),
+            "max_connections": self.max_connections,
+            "rejected": self.rejected,
+            **totals
+        }
+
+# Instancia singleton
+realtime_manager = RealtimeManager()
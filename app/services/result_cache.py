@@ -0,0 +1,187 @@
+## @file app/services/result_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.config import (
+    RESULT_CACHE_DIR,
+    RESULT_CACHE_DISK_MAX_ENTRIES,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_TTL_S
+)
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """Caché LRU de resultados de inferencia indexada por el contenido de la imagen.
+
+    La clave combina un hash SHA-256 de los bytes subidos con la versión del
+    modelo, de modo que un cambio de modelo invalida las entradas anteriores.
+    Las entradas caducan por TTL y el nivel en memoria está limitado en número;
+    opcionalmente hay un segundo nivel en disco (un JSON por entrada).
+    """
+
+    def __init__(
+        self,
+        enabled: bool = RESULT_CACHE_ENABLED,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        ttl_s: float = RESULT_CACHE_TTL_S,
+        disk_dir: str = RESULT_CACHE_DIR,
+        disk_max_entries: int = RESULT_CACHE_DISK_MAX_ENTRIES
+    ):
+        self.enabled = enabled and max_entries > 0
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.disk_dir = disk_dir or None
+        self.disk_max_entries = disk_max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        if self.enabled and self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+        # Métricas
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _digest(image: bytes, model_version: str) -> str:
+        # El identificador del modelo puede llevar una ruta: se resume para que
+        # la clave sirva también como nombre de fichero del nivel en disco
+        model_digest = hashlib.sha256(model_version.encode("utf-8")).hexdigest()[:16]
+        return f"{model_digest}-{hashlib.sha256(image).hexdigest()}"
+
+    async def key(self, image: bytes, model_version: str) -> str:
+        # hashlib libera el GIL: se calcula en un hilo para no bloquear el event loop
+        return await run_in_threadpool(self._digest, image, model_version)
+
+    async def get(self, key: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+        if self.disk_dir:
+            value = await run_in_threadpool(self._read_disk, key)
+            if value is not None:
+                self.disk_hits += 1
+                self._put_memory(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, value: Dict) -> None:
+        if not self.enabled:
+            return
+        self._put_memory(key, value)
+        if self.disk_dir:
+            await run_in_threadpool(self._write_disk, key, value)
+
+    def _put_memory(self, key: str, value: Dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_s:
+                os.remove(path)
+                self.expirations += 1
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada de caché en disco ilegible ({key}): {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, value: Dict) -> None:
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError as e:
+            logger.warning(f"No se pudo escribir la caché en disco: {str(e)}")
+            if tmp_path is not None:
+                # No dejar el temporal huérfano en el directorio de la caché
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        self._disk_writes += 1
+        if self._disk_writes % 100 == 0:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Elimina las entradas más antiguas del disco por encima del límite"""
+        try:
+            paths = [
+                os.path.join(self.disk_dir, name)
+                for name in os.listdir(self.disk_dir) if name.endswith(".json")
+            ]
+            excess = len(paths) - self.disk_max_entries
+            if excess <= 0:
+                return
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:excess]:
+                os.remove(path)
+                self.evictions += 1
+        except OSError as e:
+            logger.warning(f"Error al depurar la caché en disco: {str(e)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "disk_tier": self.disk_dir is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+        }
+
+# Instancia singleton
+result_cache = ResultCache()
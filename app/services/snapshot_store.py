@@ -0,0 +1,117 @@
+## @file app/services/snapshot_store.py
+
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+import cv2
+import numpy as np
+from app.config import SNAPSHOT_JPEG_QUALITY, SNAPSHOT_THUMBNAIL_SIZE
+from app.services.executor import cpu_executor
+
+EncodedSnapshot = Tuple[str, bytes, Optional[bytes]]
+
+def encode_snapshot(
+    frame: np.ndarray,
+    quality: int = SNAPSHOT_JPEG_QUALITY,
+    thumbnail_size: int = SNAPSHOT_THUMBNAIL_SIZE
+) -> EncodedSnapshot:
+    """Codifica un frame a JPEG (y su miniatura) y calcula su identificador por contenido"""
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    _, buffer = cv2.imencode('.jpg', frame, params)
+    jpeg = buffer.tobytes()
+
+    thumbnail = None
+    h, w = frame.shape[:2]
+    if thumbnail_size > 0 and max(h, w) > thumbnail_size:
+        scale = thumbnail_size / max(h, w)
+        small = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        _, thumb_buffer = cv2.imencode('.jpg', small, params)
+        thumbnail = thumb_buffer.tobytes()
+
+    return hashlib.sha256(jpeg).hexdigest()[:32], jpeg, thumbnail
+
+class SnapshotStore:
+    """Almacén de snapshots JPEG deduplicados por hash de contenido.
+
+    Cada frame se codifica una única vez aunque tenga varios rostros; los
+    registros del historial guardan solo el identificador. Las entradas llevan
+    un contador de referencias y se liberan cuando ningún registro las usa.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, list] = {}  # id -> [jpeg, miniatura, referencias]
+        self._lock = threading.Lock()
+
+        # Métricas
+        self.encoded = 0
+        self.deduplicated = 0
+
+    async def put_frame(self, frame: np.ndarray) -> str:
+        """Codifica el frame fuera del event loop y devuelve su id con una referencia tomada"""
+        encoded = await cpu_executor.run(encode_snapshot, frame)
+        return self.put_encoded(encoded)
+
+    def put_encoded(self, encoded: EncodedSnapshot) -> str:
+        snapshot_id, jpeg, thumbnail = encoded
+        with self._lock:
+            self.encoded += 1
+            entry = self._entries.get(snapshot_id)
+            if entry is None:
+                self._entries[snapshot_id] = [jpeg, thumbnail, 1]
+            else:
+                entry[2] += 1
+                self.deduplicated += 1
+        return snapshot_id
+
+    def acquire(self, snapshot_id: str) -> bool:
+        """Añade una referencia; False si el snapshot ya no existe"""
+        with self._lock:
+            entry = self._entries.get(snapshot_id)
+            if entry is None:
+                return False
+            entry[2] += 1
+            return True
+
+    def release(self, snapshot_id: Optional[str]) -> None:
+        if snapshot_id is None:
+            return
+        with self._lock:
+            entry = self._entries.get(snapshot_id)
+            if entry is None:
+                return
+            entry[2] -= 1
+            if entry[2] <= 0:
+                del self._entries[snapshot_id]
+
+    def get(self, snapshot_id: str, thumbnail: bool = False) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(snapshot_id)
+        if entry is None:
+            return None
+        if thumbnail and entry[1] is not None:
+            return entry[1]
+        return entry[0]
+
+    def get_entry(self, snapshot_id: str) -> Optional[Tuple[bytes, Optional[bytes]]]:
+        """JPEG y miniatura de un snapshot (para persistirlos en otro backend)"""
+        with self._lock:
+            entry = self._entries.get(snapshot_id)
+        return (entry[0], entry[1]) if entry is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stored_bytes = sum(len(e[0]) + len(e[1] or b"") for e in self._entries.values())
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "bytes": stored_bytes,
+            "encoded": self.encoded,
+            "deduplicated": self.deduplicated
+        }
+
+# Instancia singleton
+snapshot_store = SnapshotStore()
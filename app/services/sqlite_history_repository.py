@@ -0,0 +1,363 @@
+## @file: app/services/sqlite_history_repository.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.schemas.api.history import HistoryRecord, HistoryRecordCreate
+from app.services.emotion_rollups import EMOTIONS, emotion_rollups
+from app.services.history_repository import HistoryRepository
+from app.services.snapshot_store import snapshot_store
+from app.utils.timestamps import from_epoch, to_epoch
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    timestamp REAL NOT NULL,
+    detection_type TEXT NOT NULL,
+    dominant_emotion TEXT NOT NULL,
+    emotion_scores TEXT NOT NULL,
+    snapshot_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_type_seq ON history(detection_type, seq);
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history(timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_snapshot ON history(snapshot_id);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    id TEXT PRIMARY KEY,
+    jpeg BLOB NOT NULL,
+    thumbnail BLOB
+);
+
+-- Contadores por tipo mantenidos por triggers: count() es O(1)
+CREATE TABLE IF NOT EXISTS history_counts (
+    detection_type TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS trg_history_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_counts(detection_type, n) VALUES (NEW.detection_type, 1)
+    ON CONFLICT(detection_type) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_history_delete AFTER DELETE ON history BEGIN
+    UPDATE history_counts SET n = n - 1 WHERE detection_type = OLD.detection_type;
+END;
+"""
+
+_COLUMNS = "id, timestamp, detection_type, dominant_emotion, emotion_scores, snapshot_id"
+
+# (id, timestamp, detection_type, dominant_emotion, emotion_scores JSON, snapshot_id)
+HistoryRow = Tuple[str, float, str, str, str, Optional[str]]
+
+class SQLiteHistoryRepository(HistoryRepository):
+    """Historial persistente en un fichero SQLite en modo WAL.
+
+    Las consultas de página usan paginación por clave sobre `seq` (índices por
+    tipo y por timestamp), por lo que su coste no crece con el tamaño de la
+    tabla. Los snapshots se guardan una sola vez por hash en su propia tabla.
+    La retención (número máximo y antigüedad) se aplica al arrancar y cada
+    `RETENTION_EVERY` inserciones.
+    """
+
+    RETENTION_EVERY = 500
+
+    def __init__(self, path: str, max_records: int = 0, retention_days: float = 0):
+        self.path = path
+        self.max_records = max_records
+        self.retention_s = retention_days * 86400 if retention_days > 0 else None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Una conexión para escrituras y otra para lecturas: WAL permite leer mientras se escribe
+        self._write_conn = self._connect()
+        self._read_conn = self._connect()
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._inserts_since_retention = 0
+
+        self._write_conn.executescript(_SCHEMA)
+        self._apply_retention()
+        self._rebuild_rollups()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # --- Escritura -------------------------------------------------------
+
+    def insert_rows(self, rows: Sequence[HistoryRow], snapshots: Iterable[Tuple[str, bytes, Optional[bytes]]] = ()) -> None:
+        """Inserta registros (y sus snapshots) en una única transacción"""
+        with self._write_lock:
+            conn = self._write_conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO snapshots(id, jpeg, thumbnail) VALUES (?, ?, ?)", snapshots
+                )
+                conn.executemany(f"INSERT INTO history({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._inserts_since_retention += len(rows)
+            if self._inserts_since_retention >= self.RETENTION_EVERY:
+                self._apply_retention_locked()
+
+    def _prepare(self, record: HistoryRecord) -> Tuple[HistoryRow, Optional[Tuple[str, bytes, Optional[bytes]]]]:
+        snapshot = None
+        snapshot_id = record.snapshot_id
+        if snapshot_id is not None:
+            entry = snapshot_store.get_entry(snapshot_id)
+            if entry is not None:
+                snapshot = (snapshot_id, entry[0], entry[1])
+            elif not self._snapshot_exists(snapshot_id):
+                snapshot_id = None
+                record.snapshot_id = None
+
+        row = (
+            record.id,
+            to_epoch(record.timestamp),
+            record.detection_type.value,
+            record.dominant_emotion,
+            json.dumps(record.emotion_scores.dict()),
+            snapshot_id
+        )
+        return row, snapshot
+
+    def _snapshot_exists(self, snapshot_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM snapshots WHERE id = ?", (snapshot_id,)))
+
+    def _insert_records(self, records: List[HistoryRecord]) -> None:
+        rows, snapshots = [], {}
+        for record in records:
+            row, snapshot = self._prepare(record)
+            rows.append(row)
+            if snapshot is not None:
+                snapshots[snapshot[0]] = snapshot
+        self.insert_rows(rows, snapshots.values())
+
+    async def create_record(self, record_data: HistoryRecordCreate) -> HistoryRecord:
+        return (await self.create_records([record_data]))[0]
+
+    async def create_records(self, records: List[HistoryRecordCreate]) -> List[HistoryRecord]:
+        """Inserta todos los registros (y sus snapshots) en una única transacción"""
+        try:
+            created = [HistoryRecord(id=str(uuid.uuid4()), **record.dict()) for record in records]
+            await run_in_threadpool(self._insert_records, created)
+            emotion_rollups.add_records(created)
+            logger.debug(f"{len(created)} registros creados")
+            return created
+        except Exception as e:
+            logger.error(f"Error al crear registros: {str(e)}")
+            raise
+
+    def _apply_retention(self) -> None:
+        with self._write_lock:
+            self._apply_retention_locked()
+
+    def _apply_retention_locked(self) -> None:
+        self._inserts_since_retention = 0
+        conn = self._write_conn
+        deleted = 0
+        if self.retention_s is not None:
+            deleted += conn.execute(
+                "DELETE FROM history WHERE timestamp < ?", (time.time() - self.retention_s,)
+            ).rowcount
+        if self.max_records > 0:
+            deleted += conn.execute(
+                "DELETE FROM history WHERE seq <= "
+                "(SELECT seq FROM history ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                (self.max_records,)
+            ).rowcount
+        if deleted > 0:
+            conn.execute(
+                "DELETE FROM snapshots WHERE NOT EXISTS "
+                "(SELECT 1 FROM history h WHERE h.snapshot_id = snapshots.id)"
+            )
+            logger.info(f"Retención del historial: {deleted} registros eliminados")
+
+    def _rebuild_rollups(self) -> None:
+        """Reconstruye los agregados por minuto a partir de la tabla al arrancar"""
+        sums = ", ".join(f"SUM(json_extract(emotion_scores, '$.{e}'))" for e in EMOTIONS)
+        rows = self._query(
+            f"SELECT detection_type, CAST(timestamp / 60 AS INTEGER) AS minute, dominant_emotion, "
+            f"COUNT(*), {sums} FROM history GROUP BY detection_type, minute, dominant_emotion"
+        )
+        emotion_rollups.clear()
+        for detection_type, minute, dominant_emotion, count, *totals in rows:
+            emotion_rollups.add(
+                minute * 60.0, detection_type, dominant_emotion, dict(zip(EMOTIONS, totals)), count=count
+            )
+
+    # --- Lectura ---------------------------------------------------------
+
+    @staticmethod
+    def _to_record(row: tuple) -> HistoryRecord:
+        record_id, timestamp, detection_type, dominant_emotion, scores, snapshot_id = row
+        return HistoryRecord(
+            id=record_id,
+            timestamp=from_epoch(timestamp),
+            detection_type=detection_type,
+            dominant_emotion=dominant_emotion,
+            emotion_scores=json.loads(scores),
+            snapshot_id=snapshot_id
+        )
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def query_page(
+        self,
+        page: Optional[int],
+        per_page: Optional[int],
+        detection_type: Optional[str],
+        cursor: Optional[str]
+    ) -> List[HistoryRecord]:
+        where, params = [], []
+        if detection_type is not None:
+            where.append("detection_type = ?")
+            params.append(detection_type.lower())
+        if cursor is not None:
+            # Si el cursor no existe la subconsulta es NULL y no se devuelve nada
+            where.append("seq < (SELECT seq FROM history WHERE id = ?)")
+            params.append(cursor)
+
+        sql = f"SELECT {_COLUMNS} FROM history"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY seq DESC"
+        if per_page is not None:
+            sql += " LIMIT ?"
+            params.append(per_page)
+            if page is not None and cursor is None:
+                sql += " OFFSET ?"
+                params.append((page - 1) * per_page)
+        return [self._to_record(row) for row in self._query(sql, params)]
+
+    async def get_history(
+        self,
+        page: Optional[int] = None,
+        per_page: Optional[int] = 10,
+        detection_type: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[HistoryRecord]:
+        """Obtiene el historial paginado. Sin `page` ni `cursor` devuelve la primera página"""
+        try:
+            return await run_in_threadpool(self.query_page, page, per_page, detection_type, cursor)
+        except Exception as e:
+            logger.error(f"Error al obtener historial: {str(e)}")
+            raise
+
+    def _query_range(
+        self,
+        after_seq: int,
+        start_s: Optional[float],
+        end_s: Optional[float],
+        detection_type: Optional[str],
+        limit: int
+    ) -> List[tuple]:
+        where, params = ["seq > ?"], [after_seq]
+        if detection_type is not None:
+            where.append("detection_type = ?")
+            params.append(detection_type.lower())
+        if start_s is not None:
+            where.append("timestamp >= ?")
+            params.append(start_s)
+        if end_s is not None:
+            where.append("timestamp < ?")
+            params.append(end_s)
+        params.append(limit)
+        return self._query(
+            f"SELECT seq, {_COLUMNS} FROM history WHERE {' AND '.join(where)} ORDER BY seq LIMIT ?",
+            params
+        )
+
+    async def iter_records(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        detection_type: Optional[str] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[HistoryRecord]:
+        """Lee por lotes con paginación por clave: solo hay un lote en memoria"""
+        start_s = to_epoch(start) if start is not None else None
+        end_s = to_epoch(end) if end is not None else None
+        after_seq = 0
+        while True:
+            rows = await run_in_threadpool(
+                self._query_range, after_seq, start_s, end_s, detection_type, batch_size
+            )
+            for row in rows:
+                yield self._to_record(row[1:])
+            if len(rows) < batch_size:
+                return
+            after_seq = rows[-1][0]
+
+    def count_sync(self, detection_type: Optional[str] = None) -> int:
+        if detection_type is None:
+            rows = self._query("SELECT COALESCE(SUM(n), 0) FROM history_counts")
+        else:
+            rows = self._query(
+                "SELECT COALESCE(SUM(n), 0) FROM history_counts WHERE detection_type = ?",
+                (detection_type.lower(),)
+            )
+        return int(rows[0][0])
+
+    async def count(self, detection_type: Optional[str] = None) -> int:
+        return await run_in_threadpool(self.count_sync, detection_type)
+
+    async def get_record(self, record_id: str) -> Optional[HistoryRecord]:
+        rows = await run_in_threadpool(
+            self._query, f"SELECT {_COLUMNS} FROM history WHERE id = ?", (record_id,)
+        )
+        return self._to_record(rows[0]) if rows else None
+
+    async def get_snapshot(self, record_id: str, thumbnail: bool = False) -> Optional[bytes]:
+        rows = await run_in_threadpool(
+            self._query,
+            "SELECT s.jpeg, s.thumbnail FROM history h JOIN snapshots s ON s.id = h.snapshot_id "
+            "WHERE h.id = ?",
+            (record_id,)
+        )
+        if not rows:
+            return None
+        jpeg, thumb = rows[0]
+        return thumb if thumbnail and thumb is not None else jpeg
+
+    def _clear(self) -> None:
+        with self._write_lock:
+            conn = self._write_conn
+            conn.execute("BEGIN")
+            try:
+                conn.execute("DELETE FROM history")
+                conn.execute("DELETE FROM history_counts")
+                conn.execute("DELETE FROM snapshots")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    async def clear_history(self) -> None:
+        """Borra todo el historial"""
+        await run_in_threadpool(self._clear)
+        emotion_rollups.clear()
+
+    async def close(self) -> None:
+        with self._write_lock:
+            self._write_conn.close()
+        with self._read_lock:
+            self._read_conn.close()
@@ -0,0 +1,206 @@
+## @file app/services/video_analysis_service.py
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.config import VIDEO_MAX_CONCURRENCY, VIDEO_UPLOAD_CHUNK_BYTES
+from app.models.emotion_model import EmotionModel
+from app.schemas.domain.emotions import EmotionScores
+from app.services.inference_service import predict_emotion
+
+logger = logging.getLogger(__name__)
+
+EMOTIONS = list(EmotionScores.__fields__)
+
+class EmotionTimeline:
+    """Agrega los scores por intervalos de tiempo de forma incremental.
+
+    Solo guarda sumas por intervalo, así que la memoria no depende del número
+    de frames analizados.
+    """
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self._buckets: Dict[int, List] = {}  # índice -> [frames, caras, sumas]
+        self.frames = 0
+        self.faces = 0
+        self._totals = np.zeros(len(EMOTIONS), dtype=np.float64)
+
+    def add(self, timestamp_s: float, faces: List[Dict]) -> None:
+        bucket = self._buckets.setdefault(
+            int(timestamp_s // self.interval_s), [0, 0, np.zeros(len(EMOTIONS), dtype=np.float64)]
+        )
+        bucket[0] += 1
+        self.frames += 1
+        for face in faces:
+            scores = np.fromiter((face["scores"].get(e, 0.0) for e in EMOTIONS), dtype=np.float64)
+            bucket[1] += 1
+            bucket[2] += scores
+            self.faces += 1
+            self._totals += scores
+
+    @staticmethod
+    def _summarize(faces: int, sums: np.ndarray) -> Tuple[Dict[str, float], Optional[str]]:
+        if faces == 0:
+            return dict.fromkeys(EMOTIONS, 0.0), None
+        means = sums / faces
+        return dict(zip(EMOTIONS, means.tolist())), EMOTIONS[int(np.argmax(means))]
+
+    def entries(self) -> List[Dict]:
+        entries = []
+        for index in sorted(self._buckets):
+            frames, faces, sums = self._buckets[index]
+            mean_scores, dominant = self._summarize(faces, sums)
+            entries.append({
+                "start_s": index * self.interval_s,
+                "end_s": (index + 1) * self.interval_s,
+                "frames": frames,
+                "faces": faces,
+                "mean_scores": mean_scores,
+                "dominant_emotion": dominant
+            })
+        return entries
+
+    def overall(self) -> Tuple[Dict[str, float], Optional[str]]:
+        return self._summarize(self.faces, self._totals)
+
+async def save_upload(upload: UploadFile) -> str:
+    """Copia el vídeo subido a un fichero temporal por bloques (memoria constante)"""
+    suffix = os.path.splitext(upload.filename or "")[1] or ".mp4"
+    fd, path = tempfile.mkstemp(prefix="video_upload_", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as target:
+            await run_in_threadpool(shutil.copyfileobj, upload.file, target, VIDEO_UPLOAD_CHUNK_BYTES)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+def open_video(path: str) -> cv2.VideoCapture:
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        cap.release()
+        raise ValueError("No se pudo abrir el vídeo")
+    return cap
+
+def _read_sampled_frame(cap: cv2.VideoCapture, skip: int) -> Optional[np.ndarray]:
+    """Descarta `skip` frames sin convertirlos y decodifica el siguiente"""
+    for _ in range(skip):
+        if not cap.grab():
+            return None
+    ret, frame = cap.read()
+    return frame if ret else None
+
+class VideoReader:
+    """Vídeo subido con un hilo propio para todas las operaciones sobre el `VideoCapture`.
+
+    Si el cliente se desconecta, la lectura en curso sigue en su hilo aunque se
+    cancele la corrutina que la esperaba. `close()` encola la liberación y el
+    borrado del fichero en ese mismo hilo, así que nunca coinciden con una lectura.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.cap = open_video(path)
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="video-reader")
+
+    async def read(self, skip: int) -> Optional[np.ndarray]:
+        return await asyncio.get_running_loop().run_in_executor(self._thread, _read_sampled_frame, self.cap, skip)
+
+    async def get(self, prop: int) -> float:
+        return await asyncio.get_running_loop().run_in_executor(self._thread, self.cap.get, prop)
+
+    def _release(self) -> None:
+        self.cap.release()
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.warning(f"No se pudo borrar el vídeo temporal {self.path}: {str(e)}")
+
+    def close(self) -> None:
+        """No bloquea: se ejecuta cuando termine la lectura que esté en curso"""
+        self._thread.submit(self._release)
+        self._thread.shutdown(wait=False)
+
+async def analyze_video(
+    reader: VideoReader,
+    emotion_model: EmotionModel,
+    sample_fps: float,
+    timeline_interval_s: float = 1.0,
+    max_concurrency: int = VIDEO_MAX_CONCURRENCY,
+    detector: Optional[str] = None
+) -> AsyncIterator[Dict]:
+    """Decodifica el vídeo en streaming y analiza los frames muestreados.
+
+    Produce un diccionario por frame analizado, en orden, y termina con el
+    resumen agregado. Hay como mucho `max_concurrency` frames en vuelo, de
+    modo que la memoria es constante y las inferencias se reparten entre
+    los núcleos disponibles.
+    """
+    started = time.perf_counter()
+    video_fps = await reader.get(cv2.CAP_PROP_FPS) or 0.0
+    if video_fps <= 0 or video_fps != video_fps:
+        video_fps = 30.0
+    step = max(1, int(round(video_fps / sample_fps)))
+    timeline = EmotionTimeline(timeline_interval_s)
+
+    pending = deque()
+    frame_index = 0  # índice del próximo frame a analizar
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max(1, max_concurrency):
+                skip = step - 1 if frame_index > 0 else 0
+                frame = await reader.read(skip)
+                if frame is None:
+                    exhausted = True
+                    break
+                pending.append((frame_index, asyncio.ensure_future(predict_emotion(frame, emotion_model, detector))))
+                frame_index += step
+
+            if not pending:
+                break
+
+            index, task = pending.popleft()
+            faces = await task
+            timestamp_s = index / video_fps
+            timeline.add(timestamp_s, faces)
+            yield {
+                "type": "frame",
+                "frame_index": index,
+                "timestamp_ms": timestamp_s * 1000.0,
+                "faces": faces
+            }
+    finally:
+        # Esperar a las inferencias canceladas para no dejar tareas huérfanas
+        tasks = [task for _, task in pending]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    frame_count = await reader.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0
+    if frame_count <= 0:
+        frame_count = max(0, frame_index - step + 1)
+    mean_scores, dominant = timeline.overall()
+    yield {
+        "type": "summary",
+        "frames_analyzed": timeline.frames,
+        "faces_detected": timeline.faces,
+        "video_fps": video_fps,
+        "sample_fps": video_fps / step,
+        "duration_s": frame_count / video_fps,
+        "processing_time_s": time.perf_counter() - started,
+        "timeline": timeline.entries(),
+        "mean_scores": mean_scores,
+        "dominant_emotion": dominant
+    }
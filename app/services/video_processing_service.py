@@ -3,28 +3,68 @@
 import cv2
 import threading
 import time 
-import base64
-from datetime import datetime
 import numpy as np
+import asyncio
 import logging
+from datetime import datetime
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from app.config import MOTION_GATE_ENABLED, TRACKING_ENABLED, WEBCAM_FRAME_SLOTS, WEBCAM_INFERENCE_FPS
+from app.models.model_registry import get_emotion_model
 from app.schemas.core import DetectionType
-from app.schemas.api.history import HistoryRecordCreate
-from app.services.history_repository import history_repo
+from app.services.history_writer import HistoryJob, history_writer
+from app.services.inference_service import predict_emotion, locate_faces, classify_boxes
+from app.services.face_tracker import FaceTracker
+from app.services.inference_gate import inference_gate
+from app.services.motion_gate import MotionGate
+from app.utils.frame_buffer import FrameRing
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("WebcamService")
 
 class WebcamService:
-    def __init__(self, camera_index=0):
-        self.camera_index = camera_index
+    """Captura de una fuente de vídeo en su propio hilo e inferencia sobre el último frame.
+
+    `source` es un índice de cámara o la ruta/URL de un vídeo; con `loop` el
+    vídeo vuelve al principio al terminar. Las inferencias de todas las
+    fuentes comparten `inference_gate`.
+
+    Los frames se capturan directamente en los buffers preasignados de
+    `frames` y los lectores los reciben sin copiar y en solo lectura.
+    """
+
+    def __init__(self, source: Union[int, str] = 0, source_id: str = "default", loop: bool = False):
+        self.source = source
+        self.source_id = source_id
+        self.loop = loop
+        self.is_file = isinstance(source, str)
+        self.frame_interval = 0.033  # ~30 FPS
         self.cap = None
-        self.latest_frame = np.zeros((480, 640, 3), dtype=np.uint8)  # Frame negro por defecto
         self.running = False
-        self.lock = threading.Lock()
+        # Anillo de frames con número de secuencia (sin copias por lector)
+        self.frames = FrameRing(WEBCAM_FRAME_SLOTS)
+        self._frame_shape: Tuple[int, ...] = (480, 640, 3)
+        self.capture_fps = 0.0
+        # Seguimiento de rostros para no reclasificar caras estáticas
+        self.tracker = FaceTracker() if TRACKING_ENABLED else None
+        self._tracking_lock = asyncio.Lock()
+        # Reutilización del último resultado si la escena no cambia
+        self.motion_gate = MotionGate() if MOTION_GATE_ENABLED else None
+        # Último resultado publicado (con número de secuencia) e inferencia continua
+        self.result_seq = 0
+        self.latest_result: Optional[Dict] = None
+        self._result_event: Optional[asyncio.Event] = None
+        self._inference_task: Optional[asyncio.Task] = None
         self._init_camera()
+        # Frame negro por defecto hasta que llegue el primero de la fuente
+        self.frames.write(np.zeros(self._frame_shape, dtype=np.uint8))
 
     def _init_camera(self):
         """Intenta inicializar con diferentes backends"""
+        if self.is_file:
+            self._init_file()
+            return
+
         backends = [
             cv2.CAP_V4L2,  # Linux
             cv2.CAP_DSHOW,  # Windows
@@ -33,11 +73,12 @@ class WebcamService:
         
         for backend in backends:
             try:
-                self.cap = cv2.VideoCapture(self.camera_index, backend)
+                self.cap = cv2.VideoCapture(self.source, backend)
                 if self.cap.isOpened():
                     logger.info(f"Cámara inicializada con backend: {backend}")
                     self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
                     self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+                    self._probe_capture()
                     return
             except Exception as e:
                 logger.warning(f"Error con backend {backend}: {str(e)}")
@@ -45,6 +86,26 @@ class WebcamService:
         logger.error("No se pudo inicializar la cámara real. Usando simulador.")
         self._init_simulator()
 
+    def _init_file(self):
+        """Vídeo o stream por ruta/URL, servido al ritmo de sus propios FPS"""
+        self.cap = cv2.VideoCapture(self.source)
+        if self.cap.isOpened():
+            self._probe_capture()
+            logger.info(f"[{self.source_id}] Vídeo abierto: {self.source}")
+            return
+        logger.error(f"[{self.source_id}] No se pudo abrir {self.source}. Usando simulador.")
+        self._init_simulator()
+
+    def _probe_capture(self):
+        """Toma el tamaño y los FPS que declara la fuente"""
+        width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+        height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        if width > 0 and height > 0:
+            self._frame_shape = (height, width, 3)
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+        if 0 < fps < 1000:
+            self.frame_interval = 1.0 / fps
+
     def _init_simulator(self):
         """Inicializa un generador de frames de prueba"""
         self.simulator_mode = True
@@ -57,29 +118,95 @@ class WebcamService:
             self.running = True
             self.thread = threading.Thread(target=self._update_frame, daemon=True)
             self.thread.start()
-            logger.info("Servicio de cámara iniciado")
+            logger.info(f"[{self.source_id}] Servicio de cámara iniciado")
 
     def _update_frame(self):
         frame_count = 0
+        simulated = hasattr(self, 'simulator_mode')
+        # Una cámara real bloquea en read() hasta el siguiente frame, así que
+        # marca su propio ritmo; vídeos y simulador se sirven a frame_interval
+        paced = simulated or self.is_file
+        next_due = time.monotonic()
+        last_frame = None
         while self.running:
-            if hasattr(self, 'simulator_mode'):
-                with self.lock:
-                    self.latest_frame = self.test_frame.copy()
-                    cv2.putText(self.latest_frame, f"Frame: {frame_count}", (50, 280),
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            if simulated:
+                self.frames.write_with(self._render_simulated(frame_count), self.test_frame.shape)
                 frame_count += 1
+                ok = True
             else:
-                ret, frame = self.cap.read()
-                if ret:
-                    with self.lock:
-                        self.latest_frame = frame
-                else:
+                ok = self._read_frame()
+                if ok is False:
+                    if self.is_file and self.loop:
+                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        continue
+                    if self.is_file:
+                        # Fin del vídeo: se conserva el último frame
+                        logger.info(f"[{self.source_id}] Fin del vídeo")
+                        return
                     logger.warning("Error leyendo frame de cámara")
-            time.sleep(0.033)  # ~30 FPS
 
-    def get_latest_frame(self) -> np.ndarray:
-        with self.lock:
-            return self.latest_frame.copy()
+            now = time.monotonic()
+            if ok and last_frame is not None:
+                # Media móvil de los FPS reales de captura
+                instant = 1.0 / max(now - last_frame, 1e-6)
+                self.capture_fps = instant if not self.capture_fps else 0.9 * self.capture_fps + 0.1 * instant
+            last_frame = now if ok else last_frame
+
+            if paced or ok is False:
+                # Plazo absoluto: descuenta lo que tardó la lectura; si se va con
+                # retraso de más de un frame no intenta recuperarlo a ráfagas
+                next_due += self.frame_interval
+                if next_due < now - self.frame_interval:
+                    next_due = now
+                time.sleep(max(0.0, next_due - now))
+
+    def _render_simulated(self, frame_count: int):
+        def fill(buffer: np.ndarray) -> np.ndarray:
+            np.copyto(buffer, self.test_frame)
+            cv2.putText(buffer, f"Frame: {frame_count}", (50, 280),
+                      cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            return buffer
+        return fill
+
+    def _read_frame(self) -> Optional[bool]:
+        """Lee de la fuente directamente sobre un buffer libre del anillo.
+
+        Devuelve None si no había buffer libre: el frame se lee igualmente con
+        `grab()` y se descarta, para no quedarse atrás respecto a la fuente.
+        """
+        ok = None
+
+        def fill(buffer: np.ndarray) -> Optional[np.ndarray]:
+            nonlocal ok
+            ok, frame = self.cap.read(buffer)
+            if not ok:
+                return None
+            self._frame_shape = frame.shape
+            return frame
+
+        self.frames.write_with(fill, self._frame_shape)
+        if ok is None:
+            return None if self.cap.grab() else False
+        return ok
+
+    @property
+    def frame_seq(self) -> int:
+        return self.frames.seq
+
+    def get_latest_frame(self) -> Optional[np.ndarray]:
+        """Copia modificable del último frame (los lectores habituales usan `acquire_frame`)"""
+        with self.acquire_frame() as (_, frame):
+            return frame.copy() if frame is not None else None
+
+    @contextmanager
+    def acquire_frame(self) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """Último frame sin copiar (solo lectura) y su secuencia, fijado mientras dura el bloque"""
+        with self.frames.acquire() as latest:
+            yield latest
+
+    async def wait_frame(self, after_seq: int, timeout: Optional[float] = None) -> int:
+        """Espera a un frame con secuencia mayor que `after_seq`"""
+        return await self.frames.wait_async(after_seq, timeout)
 
     def stop(self):
         self.running = False
@@ -87,40 +214,112 @@ class WebcamService:
             self.thread.join()
         if hasattr(self, 'cap') and self.cap:
             self.cap.release()
-        logger.info("Servicio de cámara detenido")
+        logger.info(f"[{self.source_id}] Servicio de cámara detenido")
         
 
+    def start_inference(self, fps: float = WEBCAM_INFERENCE_FPS):
+        """Inicia la inferencia continua: los lectores obtienen el último resultado sin esperar al modelo"""
+        if self._inference_task is None or self._inference_task.done():
+            self._inference_task = asyncio.get_running_loop().create_task(self._inference_loop(fps))
+            logger.info(f"Inferencia continua de la webcam iniciada ({fps} FPS)")
+
+    async def stop_inference(self):
+        if self._inference_task is not None:
+            self._inference_task.cancel()
+            try:
+                await self._inference_task
+            except asyncio.CancelledError:
+                pass
+            self._inference_task = None
+
+    @property
+    def background_inference(self) -> bool:
+        return self._inference_task is not None and not self._inference_task.done()
+
+    async def _inference_loop(self, fps: float):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / fps if fps > 0 else 0.0
+        last_frame_seq = 0
+        while True:
+            # Solo se infiere sobre frames nuevos
+            last_frame_seq = await self.wait_frame(last_frame_seq)
+            started = loop.time()
+            try:
+                await self.process_frame(get_emotion_model())
+            except Exception as e:
+                logger.error(f"Error en la inferencia continua: {str(e)}")
+            await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+
+    def _publish_result(self, result: Dict, frame_seq: int):
+        """Numera el resultado y despierta a los lectores que esperan uno nuevo"""
+        self.result_seq += 1
+        result["seq"] = self.result_seq
+        result["frame_seq"] = frame_seq
+        result["timestamp"] = datetime.utcnow()
+        self.latest_result = result
+        if self._result_event is not None:
+            self._result_event.set()
+        self._result_event = asyncio.Event()
+
+    async def wait_result(self, after_seq: Optional[int], timeout: float) -> Optional[Dict]:
+        """Primer resultado con `seq` mayor que `after_seq`; None si vence el plazo.
+
+        Sin `after_seq` devuelve al instante el último resultado, que puede
+        ser None si todavía no se ha procesado ningún frame.
+        """
+        if after_seq is None:
+            return self.latest_result
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        # Cada publicación despierta a todos: se sigue esperando hasta superar `after_seq`
+        while self.result_seq <= after_seq:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            if self._result_event is None:
+                self._result_event = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._result_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        return self.latest_result
+
     async def process_frame(self, emotion_model) -> dict:
-        frame = self.get_latest_frame()
-        if frame is None:
-            raise ValueError("No frame available")
+        # El frame queda fijado (sin copia) mientras dura la inferencia
+        with self.acquire_frame() as (frame_seq, frame):
+            if frame is None:
+                raise ValueError("No frame available")
+            return await self._process(frame_seq, frame, emotion_model)
+
+    async def _process(self, frame_seq: int, frame: np.ndarray, emotion_model) -> dict:
+
+        signature = None
+        if self.motion_gate is not None:
+            signature = self.motion_gate.signature(frame)
+            cached = self.motion_gate.lookup(signature)
+            if cached is not None:
+                return {**cached, "reused": True}
         
-        raw_faces = emotion_model.predict_emotion(frame)
+        # Hueco compartido y por turnos con el resto de fuentes
+        async with inference_gate.slot(self.source_id):
+            if self.tracker is not None:
+                raw_faces = await self._track_and_classify(frame, emotion_model)
+            else:
+                raw_faces = await predict_emotion(frame, emotion_model)
         
         if raw_faces:
+            # Registrar la cara dominante; la escritura (y el snapshot) es diferida
+            dominant_face = max(raw_faces, key=lambda x: max(x["scores"].values()))
             try:
-                # Procesar la cara dominante
-                dominant_face = max(raw_faces, key=lambda x: max(x["scores"].values()))
-                
-                # Crear registro de historial
-                record_data = HistoryRecordCreate(
-                    timestamp=datetime.utcnow(),
-                    dominant_emotion=dominant_face["dominant_emotion"],
-                    emotion_scores={
-                        "joy": float(dominant_face["scores"].get("joy", 0)),
-                        "sadness": float(dominant_face["scores"].get("sadness", 0)),
-                        "anger": float(dominant_face["scores"].get("anger", 0)),
-                        "surprise": float(dominant_face["scores"].get("surprise", 0)),
-                        "fear": float(dominant_face["scores"].get("fear", 0)),
-                        "disgust": float(dominant_face["scores"].get("disgust", 0)),
-                        "neutral": float(dominant_face["scores"].get("neutral", 0))
-                    },
-                    detection_type=DetectionType.VIDEO,
-                    image_snapshot=self._frame_to_base64(frame)
-                )
-                
-                await history_repo.create_record(record_data)
-
+                await history_writer.submit(HistoryJob(
+                    DetectionType.VIDEO,
+                    [(dominant_face["dominant_emotion"], {
+                        k: float(v) for k, v in dominant_face["scores"].items()
+                    })],
+                    # El snapshot se codifica más tarde: necesita su propia copia
+                    frame=frame.copy()
+                ))
             except Exception as e:
                 logger.error(f"Error al guardar en historial: {str(e)}")
                 
@@ -137,23 +336,58 @@ class WebcamService:
                 "scores": {k: float(v) for k, v in face["scores"].items()},
                 "dominant_emotion": str(face["dominant_emotion"])
             }
+            if "track_id" in face:
+                processed_face["track_id"] = int(face["track_id"])
             processed_faces.append(processed_face)
         
-        return {
+        result = {
             "faces": processed_faces,
             "frame_size": {
                 "height": int(frame.shape[0]),
                 "width": int(frame.shape[1]),
                 "channels": int(frame.shape[2]) if len(frame.shape) > 2 else 1
             },
-            "success": True
+            "success": True,
+            "reused": False
         }
+        self._publish_result(result, frame_seq)
+        if self.motion_gate is not None:
+            self.motion_gate.store(signature, result)
+        return result
     
-    def _frame_to_base64(self, frame: np.ndarray) -> str:
-        """Convierte un frame de video a base64"""
-        try:
-            _, buffer = cv2.imencode('.jpg', frame)
-            return f"data:image/jpeg;base64,{base64.b64encode(buffer).decode('utf-8')}"
-        except Exception as e:
-            logger.error(f"Error al convertir frame a base64: {str(e)}")
-            return ""
\ No newline at end of file
+    async def _track_and_classify(self, frame: np.ndarray, emotion_model) -> List[Dict]:
+        """Detecta en cada frame pero solo clasifica los tracks nuevos, desplazados o caducados"""
+        async with self._tracking_lock:
+            boxes = await locate_faces(frame, emotion_model)
+            tracks, to_classify = self.tracker.update(boxes)
+
+            if to_classify:
+                results = await classify_boxes(frame, [boxes[i] for i in to_classify], emotion_model)
+                for i, result in zip(to_classify, results):
+                    self.tracker.observe(tracks[i], result["scores"])
+
+            return [
+                {
+                    "box": {
+                        "x": Xi,
+                        "y": Yi,
+                        "width": Xf - Xi,
+                        "height": Yf - Yi
+                    },
+                    "scores": dict(track.scores),
+                    "dominant_emotion": track.dominant_emotion,
+                    "track_id": track.track_id
+                }
+                for (Xi, Yi, Xf, Yf), track in zip(boxes, tracks)
+            ]
+
+    def stats(self) -> Dict:
+        return {
+            "tracker": self.tracker.stats() if self.tracker is not None else None,
+            "motion_gate": self.motion_gate.stats() if self.motion_gate is not None else None,
+            "background_inference": self.background_inference,
+            "frame_seq": self.frame_seq,
+            "capture_fps": round(self.capture_fps, 2),
+            "frames": self.frames.stats(),
+            "result_seq": self.result_seq
+        }
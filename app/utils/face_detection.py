@@ -0,0 +1,88 @@
+## @file app/utils/face_detection.py
+
+import numpy as np
+from typing import Tuple
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """NMS voraz sobre cajas (N, 4) en formato (Xi, Yi, Xf, Yf).
+
+    Devuelve los índices conservados ordenados por score descendente.
+    """
+    order = np.argsort(-scores, kind="stable")
+    if len(order) <= 1 or iou_threshold >= 1.0:
+        return order
+
+    x1, y1, x2, y2 = (boxes[:, i].astype(np.float64) for i in range(4))
+    areas = (x2 - x1) * (y2 - y1)
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        inter_w = np.maximum(0.0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+        inter_h = np.maximum(0.0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+        inter = inter_w * inter_h
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.intp)
+
+def postprocess_boxes(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    width: int,
+    height: int,
+    nms_threshold: float = 0.3,
+    min_face_size: int = 0,
+    max_faces: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Recorta al frame, descarta cajas pequeñas o degeneradas, aplica NMS y limita el número.
+
+    `boxes` son cajas (N, 4) en píxeles (Xi, Yi, Xf, Yf), común a todos los
+    detectores. Devuelve cajas y scores ordenados por score descendente.
+    `max_faces` <= 0 desactiva el límite de caras por frame.
+    """
+    # Copia: el recorte se hace in situ y no debe modificar el array del llamador
+    boxes = np.array(boxes, dtype=int, copy=True).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    np.maximum(boxes[:, :2], 0, out=boxes[:, :2])
+    np.minimum(boxes[:, 2], width - 1, out=boxes[:, 2])
+    np.minimum(boxes[:, 3], height - 1, out=boxes[:, 3])
+
+    # Descartar cajas degeneradas y rostros demasiado pequeños
+    min_side = max(1, min_face_size)
+    valid = ((boxes[:, 2] - boxes[:, 0]) >= min_side) & ((boxes[:, 3] - boxes[:, 1]) >= min_side)
+    boxes, scores = boxes[valid], scores[valid]
+
+    keep = non_max_suppression(boxes, scores, nms_threshold)
+    if max_faces > 0:
+        keep = keep[:max_faces]
+    return boxes[keep], scores[keep]
+
+def postprocess_detections(
+    detections: np.ndarray,
+    width: int,
+    height: int,
+    confidence_threshold: float = 0.4,
+    nms_threshold: float = 0.3,
+    min_face_size: int = 0,
+    max_faces: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Filtra, escala, recorta y depura la salida del detector SSD en una sola pasada.
+
+    `detections` es la salida (1, 1, K, 7) de `forward()` de la red SSD. Devuelve las
+    cajas (N, 4) en píxeles (Xi, Yi, Xf, Yf) y sus confianzas, ordenadas por
+    confianza. `max_faces` <= 0 desactiva el límite de caras por frame.
+    """
+    dets = detections.reshape(-1, detections.shape[-1])
+    dets = dets[dets[:, 2] > confidence_threshold]
+
+    boxes = (dets[:, 3:7] * np.array([width, height, width, height])).astype(int)
+    return postprocess_boxes(
+        boxes, dets[:, 2], width, height,
+        nms_threshold=nms_threshold,
+        min_face_size=min_face_size,
+        max_faces=max_faces
+    )
@@ -0,0 +1,167 @@
+## @file app/utils/frame_buffer.py
+
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+class FrameRing:
+    """Anillo de buffers de frame preasignados con números de secuencia.
+
+    El productor (hilo de captura) escribe cada frame en el siguiente hueco
+    libre y los lectores reciben vistas de solo lectura sin copiar. Un hueco
+    que un lector tiene fijado (`acquire`) no se reutiliza hasta liberarlo;
+    el último frame publicado tampoco se sobrescribe nunca. Si todos los
+    huecos están ocupados el frame se descarta y se cuenta en `overruns`.
+    """
+
+    def __init__(self, slots: int = 4):
+        self.slots = max(2, slots)
+        self._buffers: List[Optional[np.ndarray]] = [None] * self.slots
+        self._views: List[Optional[np.ndarray]] = [None] * self.slots
+        self._slot_seq = [0] * self.slots
+        self._pins = [0] * self.slots
+        self._latest = -1
+        self._cursor = 0
+        self.seq = 0
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+        # Métricas
+        self.allocations = 0
+        self.overruns = 0
+
+    def _next_slot(self) -> Optional[int]:
+        for offset in range(self.slots):
+            index = (self._cursor + offset) % self.slots
+            if index != self._latest and self._pins[index] == 0:
+                self._cursor = (index + 1) % self.slots
+                return index
+        return None
+
+    def _buffer(self, index: int, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        buffer = self._buffers[index]
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._set_buffer(index, buffer)
+        return buffer
+
+    def _set_buffer(self, index: int, buffer: np.ndarray) -> None:
+        view = buffer.view()
+        view.flags.writeable = False
+        self._buffers[index] = buffer
+        self._views[index] = view
+        self.allocations += 1
+
+    def write(self, frame: np.ndarray) -> Optional[int]:
+        """Copia `frame` a un hueco libre y lo publica; devuelve su secuencia"""
+        def fill(buffer: np.ndarray) -> np.ndarray:
+            np.copyto(buffer, frame)
+            return buffer
+        return self.write_with(fill, frame.shape, frame.dtype)
+
+    def write_with(
+        self,
+        fill: Callable[[np.ndarray], Optional[np.ndarray]],
+        shape: Tuple[int, ...],
+        dtype=np.uint8
+    ) -> Optional[int]:
+        """Rellena un hueco libre in situ con `fill(buffer)` y lo publica.
+
+        `fill` devuelve el array con el frame (normalmente el propio buffer,
+        p. ej. `cap.read(buffer)`) o None si no hay frame. Si devuelve otro
+        array, este pasa a ser el buffer del hueco.
+        """
+        with self._cond:
+            index = self._next_slot()
+            if index is None:
+                self.overruns += 1
+                return None
+            buffer = self._buffer(index, tuple(shape), np.dtype(dtype))
+            # Mientras se rellena, el hueco queda fijado para que nadie lo reutilice
+            self._pins[index] += 1
+        try:
+            frame = fill(buffer)
+        finally:
+            with self._cond:
+                self._pins[index] -= 1
+
+        if frame is None:
+            return None
+        with self._cond:
+            if frame is not buffer:
+                self._set_buffer(index, frame)
+            self.seq += 1
+            self._slot_seq[index] = self.seq
+            self._latest = index
+            seq = self.seq
+            waiters, self._waiters = self._waiters, []
+            self._cond.notify_all()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, seq)
+        return seq
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray]]:
+        """Último frame (vista de solo lectura) y su secuencia, sin fijarlo.
+
+        La vista es válida mientras sea el último frame; para usarla durante
+        más tiempo (inferencia, codificación) hay que usar `acquire`.
+        """
+        with self._cond:
+            if self._latest < 0:
+                return 0, None
+            return self._slot_seq[self._latest], self._views[self._latest]
+
+    @contextmanager
+    def acquire(self) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+        """Fija el último frame mientras dura el bloque `with`"""
+        with self._cond:
+            index = self._latest
+            if index < 0:
+                seq, view = 0, None
+            else:
+                self._pins[index] += 1
+                seq, view = self._slot_seq[index], self._views[index]
+        try:
+            yield seq, view
+        finally:
+            if index >= 0:
+                with self._cond:
+                    self._pins[index] -= 1
+
+    def wait(self, after_seq: int, timeout: Optional[float] = None) -> int:
+        """Bloquea el hilo hasta que haya un frame con secuencia mayor que `after_seq`"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq > after_seq, timeout)
+            return self.seq
+
+    async def wait_async(self, after_seq: int, timeout: Optional[float] = None) -> int:
+        """Versión para el event loop de `wait`; al vencer el plazo devuelve la secuencia actual"""
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self.seq > after_seq:
+                return self.seq
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with self._cond:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+                return self.seq
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "seq": self.seq,
+                "pinned": sum(1 for pins in self._pins if pins),
+                "allocations": self.allocations,
+                "overruns": self.overruns
+            }
+
+def _resolve(future: asyncio.Future, seq: int) -> None:
+    if not future.done():
+        future.set_result(seq)
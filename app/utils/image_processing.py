@@ -0,0 +1,76 @@
+## @file app/utils/image_processing.py
+
+import cv2
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+
+# Tamaño de entrada del clasificador RESNET50V2
+CLASSIFIER_INPUT_SIZE = (224, 224)
+
+def preprocess_faces(
+    frame: np.ndarray,
+    boxes: Sequence[Tuple[int, int, int, int]],
+    input_size: Tuple[int, int] = CLASSIFIER_INPUT_SIZE
+) -> np.ndarray:
+    """Recorta y normaliza todas las caras de un frame en un único tensor float32.
+
+    `boxes` contiene tuplas (Xi, Yi, Xf, Yf). El resultado tiene forma
+    (N, alto, ancho, 3), en RGB y escalado a [0, 1], igual que el
+    preprocesamiento cara a cara original.
+    """
+    width, height = input_size
+    batch = np.empty((len(boxes), height, width, 3), dtype=np.float32)
+
+    for i, (Xi, Yi, Xf, Yf) in enumerate(boxes):
+        face = cv2.cvtColor(frame[Yi:Yf, Xi:Xf], cv2.COLOR_BGR2RGB)
+        batch[i] = cv2.resize(face, (width, height))
+
+    batch /= 255.0
+    return batch
+
+def decode_image(image: bytes) -> Optional[np.ndarray]:
+    """Decodifica los bytes de una imagen a un frame BGR (None si no es válida)"""
+    if not image:
+        return None
+    nparr = np.frombuffer(image, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+def encode_jpeg(
+    frame: np.ndarray,
+    quality: int = 80,
+    size: Optional[Tuple[int, int]] = None
+) -> bytes:
+    """Codifica un frame como JPEG, redimensionándolo antes si se indica `size`"""
+    if size is not None and (frame.shape[1], frame.shape[0]) != size:
+        frame = cv2.resize(frame, size)
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes()
+
+def draw_detections(frame: np.ndarray, faces: Sequence[Dict]) -> np.ndarray:
+    """Copia del frame con la caja y la emoción dominante de cada rostro"""
+    annotated = frame.copy()
+    for face in faces:
+        box = face["box"]
+        x, y = int(box["x"]), int(box["y"])
+        w, h = int(box["width"]), int(box["height"])
+        label = str(face["dominant_emotion"])
+        if "track_id" in face:
+            label = f"#{face['track_id']} {label}"
+        cv2.rectangle(annotated, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.putText(annotated, label, (x, max(12, y - 6)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1, cv2.LINE_AA)
+    return annotated
+
+def encode_annotated_jpeg(frame: np.ndarray, faces: Sequence[Dict], quality: int = 80) -> bytes:
+    return encode_jpeg(draw_detections(frame, faces), quality)
+
+def frame_signature(frame: np.ndarray, size: Tuple[int, int] = (64, 48)) -> np.ndarray:
+    """Miniatura en escala de grises usada como huella barata de la escena"""
+    small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small
+
+def signature_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Diferencia absoluta media entre dos huellas (0-255)"""
+    return float(cv2.absdiff(a, b).mean())
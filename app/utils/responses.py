@@ -0,0 +1,38 @@
+## @file app/utils/responses.py
+
+from typing import Any
+import numpy as np
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+def _default(obj: Any) -> Any:
+    """Tipos que orjson no serializa por sí mismo"""
+    if isinstance(obj, np.ndarray):
+        # Arrays no contiguos o de tipos no soportados por OPT_SERIALIZE_NUMPY
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+
+class FastJSONResponse(JSONResponse):
+    """Respuesta JSON serializada en una sola pasada con orjson.
+
+    Admite escalares y arrays NumPy, datetimes, enums y modelos Pydantic
+    directamente. Devolverla desde una ruta evita también el paso de
+    `jsonable_encoder` de FastAPI.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
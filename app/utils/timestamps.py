@@ -0,0 +1,13 @@
+## @file app/utils/timestamps.py
+
+from datetime import datetime, timezone
+
+def to_epoch(timestamp: datetime) -> float:
+    """Los timestamps sin zona horaria se interpretan como UTC (datetime.utcnow)"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+def from_epoch(value: float) -> datetime:
+    """Epoch a datetime UTC sin zona horaria, como los timestamps del historial"""
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
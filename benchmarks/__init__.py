@@ -0,0 +1 @@
+"""Benchmarks reproducibles del servicio (no forman parte de la suite de tests)."""
@@ -0,0 +1,83 @@
+## @file benchmarks/asgi.py
+"""Cliente ASGI mínimo en proceso para los escenarios de carga.
+
+Llama a la aplicación directamente (sin sockets ni servidor), de modo que la
+latencia medida es la de FastAPI más el pipeline, sin ruido de red.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+@dataclass
+class ASGIResponse:
+    status: int = 0
+    headers: List[Tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+
+def multipart_body(field_name: str, filename: str, content: bytes, content_type: str = "image/jpeg") -> Tuple[bytes, str]:
+    """Cuerpo multipart/form-data con un único fichero -> (cuerpo, cabecera Content-Type)"""
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+async def request(
+    app,
+    method: str,
+    path: str,
+    params: Optional[Dict] = None,
+    body: bytes = b"",
+    headers: Optional[Dict[str, str]] = None
+) -> ASGIResponse:
+    headers = {"host": "bench", **(headers or {})}
+    if body:
+        headers["content-length"] = str(len(body))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(params or {}).encode(),
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80)
+    }
+    response = ASGIResponse()
+    chunks: List[bytes] = []
+    done = asyncio.Event()
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # El cliente sólo "se desconecta" cuando la respuesta ha terminado
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response.status = message["status"]
+            response.headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        done.set()
+    response.body = b"".join(chunks)
+    return response
@@ -0,0 +1,139 @@
+## @file benchmarks/bench_classifier_parity.py
+"""Paridad, latencia y memoria de clasificadores exportados frente al modelo Keras.
+
+Uso:
+    python -m benchmarks.bench_classifier_parity --keras models/RESNET50/emotion_recognition_resnet50v2.keras
+        --candidates modelo.tflite modelo_int8.tflite [--images caras/] [--detect-faces]
+        [--samples 200] [--batch-sizes 1 8 32] [--repeat 5] [--json out.json]
+
+Para cada candidato informa de la desviación de los scores normalizados
+(máxima, media y p99 de la diferencia absoluta), el porcentaje de caras con
+la misma emoción dominante que Keras, la latencia por lote y por cara, el
+tamaño del fichero y el RSS que añade al cargarse. Sin `--images` se usan
+recortes sintéticos, que solo sirven para comprobar que la exportación
+funciona: para decidir el paso a producción hay que usar caras reales.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Dict, List
+import numpy as np
+from app.models.classifiers import EmotionClassifier, load_classifier
+from app.models.export_tflite import iter_calibration_faces
+from benchmarks.report import write_report
+
+def _rss_mb() -> float:
+    """Memoria residente actual del proceso (Linux); 0 si no se puede leer"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return 0.0
+
+def load_samples(images: str, samples: int, detect_faces: bool) -> np.ndarray:
+    if images:
+        faces = list(iter_calibration_faces(images, samples, detect_faces))
+        if faces:
+            return np.concatenate(faces)
+    rng = np.random.default_rng(0)
+    return rng.random((samples, 224, 224, 3), dtype=np.float32)
+
+def predict_all(classifier: EmotionClassifier, faces: np.ndarray, batch_size: int = 32) -> np.ndarray:
+    preds = np.concatenate([
+        classifier.predict(faces[i:i + batch_size]) for i in range(0, len(faces), batch_size)
+    ])
+    # Misma normalización que EmotionModel.build_results
+    probs = np.asarray(preds, dtype=np.float64)
+    return probs / probs.sum(axis=1, keepdims=True)
+
+def measure(classifier: EmotionClassifier, faces: np.ndarray, batch_sizes: List[int], repeat: int) -> Dict:
+    latency = {}
+    for batch_size in batch_sizes:
+        batch = faces[:batch_size]
+        if len(batch) < batch_size:
+            batch = np.resize(faces, (batch_size, *faces.shape[1:]))
+        classifier.predict(batch)  # ajusta el tamaño de lote antes de medir
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            classifier.predict(batch)
+            timings.append((time.perf_counter() - started) * 1000)
+        median = statistics.median(timings)
+        latency[str(batch_size)] = {"batch_ms": median, "face_ms": median / batch_size}
+    return latency
+
+def evaluate(path: str, faces: np.ndarray, batch_sizes: List[int], repeat: int) -> Dict:
+    rss_before = _rss_mb()
+    classifier = load_classifier(path)
+    classifier.predict(faces[:1])
+    latency = measure(classifier, faces, batch_sizes, repeat)
+    return {
+        "name": f"classifier_parity/{os.path.basename(path)}",
+        "model": path,
+        "backend": classifier.backend,
+        "file_mb": os.path.getsize(path) / 1e6,
+        "rss_delta_mb": _rss_mb() - rss_before,
+        "latency": latency,
+        # Copia plana de la latencia para poder comparar informes
+        **{f"b{size}_face_ms": v["face_ms"] for size, v in latency.items()},
+        "_classifier": classifier
+    }
+
+def run(
+    keras_path: str,
+    candidates: List[str],
+    faces: np.ndarray,
+    batch_sizes: List[int],
+    repeat: int = 5
+) -> List[Dict]:
+    results = []
+    reference = None
+    for path in [keras_path, *candidates]:
+        result = evaluate(path, faces, batch_sizes, repeat)
+        probs = predict_all(result.pop("_classifier"), faces)
+        if reference is None:
+            reference = probs
+        else:
+            diff = np.abs(probs - reference)
+            result["max_abs_diff"] = float(diff.max())
+            result["mean_abs_diff"] = float(diff.mean())
+            result["p99_abs_diff"] = float(np.percentile(diff.max(axis=1), 99))
+            result["dominant_agreement"] = float(np.mean(probs.argmax(axis=1) == reference.argmax(axis=1)))
+        results.append(result)
+
+        latency = "  ".join(f"b{size}: {v['face_ms']:.2f} ms/cara" for size, v in result["latency"].items())
+        parity = (
+            f"  acuerdo {result['dominant_agreement'] * 100:6.2f}%  max|d| {result['max_abs_diff']:.4f}"
+            if "dominant_agreement" in result else "  (referencia)"
+        )
+        print(f"{os.path.basename(path):45s} {result['file_mb']:8.1f} MB  +{result['rss_delta_mb']:7.1f} MB RSS  "
+              f"{latency}{parity}")
+    print(f"{len(faces)} caras comparadas")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keras", required=True, help="Modelo .keras de referencia")
+    parser.add_argument("--candidates", nargs="+", required=True, help="Modelos exportados a comparar")
+    parser.add_argument("--images", help="Carpeta con recortes de caras (o imágenes completas con --detect-faces)")
+    parser.add_argument("--detect-faces", action="store_true", help="Buscar las caras en imágenes completas")
+    parser.add_argument("--samples", type=int, default=200, help="Caras comparadas como máximo")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 32], help="Tamaños de lote para la latencia")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por tamaño de lote")
+    parser.add_argument("--json", help="Fichero donde guardar el informe")
+    args = parser.parse_args()
+
+    faces = load_samples(args.images, args.samples, args.detect_faces)
+    results = run(args.keras, args.candidates, faces, args.batch_sizes, max(1, args.repeat))
+    if args.json:
+        write_report(args.json, "classifier_parity", results, {
+            "keras": args.keras,
+            "samples": len(faces),
+            "batch_sizes": args.batch_sizes,
+            "repeat": args.repeat
+        })
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+## @file benchmarks/bench_face_detectors.py
+"""Latencia y recall de los detectores de rostros sobre las mismas imágenes.
+
+Uso:
+    python -m benchmarks.bench_face_detectors --images carpeta/ [--detectors ssd haar haar-downscaled]
+        [--ssd-sizes 200 160] [--reference ssd] [--iou 0.5] [--repeat 3] [--json out.json]
+
+El recall se mide contra el detector de referencia (por defecto la SSD a
+300x300): fracción de sus cajas que el detector evaluado también encuentra
+con IoU >= `--iou`. `extra` cuenta las cajas que la referencia no tiene.
+`--ssd-sizes` añade variantes de la SSD con otro tamaño de entrada
+("ssd@160"). Hay que ejecutarlo desde la raíz del repositorio para que
+se encuentren los ficheros de `face_detector/`.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Dict, List, Tuple
+import cv2
+import numpy as np
+from app.models.face_detectors import FACE_DETECTOR_NAMES, FaceDetector, SSDFaceDetector, create_face_detector
+from app.services.face_tracker import iou_matrix
+from benchmarks.report import write_report
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+def load_images(directory: str) -> List[Tuple[str, np.ndarray]]:
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        frame = cv2.imread(os.path.join(directory, name))
+        if frame is not None:
+            images.append((name, frame))
+    return images
+
+def build_detector(name: str) -> FaceDetector:
+    if name.startswith("ssd@"):
+        detector = SSDFaceDetector(input_size=int(name[4:]))
+        detector.name = name
+        return detector
+    return create_face_detector(name)
+
+def match(reference: np.ndarray, found: np.ndarray, iou_threshold: float) -> int:
+    """Número de cajas de referencia emparejadas uno a uno con IoU suficiente"""
+    ious = iou_matrix(reference.tolist(), found.tolist())
+    matched = 0
+    used = set()
+    for i in range(ious.shape[0]):
+        for j in np.argsort(-ious[i]):
+            if ious[i, j] < iou_threshold:
+                break
+            if j not in used:
+                used.add(j)
+                matched += 1
+                break
+    return matched
+
+def run(
+    images: List[Tuple[str, np.ndarray]],
+    detector_names: List[str],
+    reference_name: str = "ssd",
+    iou_threshold: float = 0.5,
+    repeat: int = 3
+) -> List[Dict]:
+    reference = build_detector(reference_name)
+    reference.warmup()
+    reference_boxes = [reference.detect(frame)[0] for _, frame in images]
+    total_reference = sum(len(boxes) for boxes in reference_boxes)
+
+    results = []
+    for name in detector_names:
+        detector = build_detector(name)
+        detector.warmup()
+        latencies = []
+        matched = found_total = 0
+        for (_, frame), expected in zip(images, reference_boxes):
+            for _ in range(repeat):
+                started = time.perf_counter()
+                boxes, _ = detector.detect(frame)
+                latencies.append((time.perf_counter() - started) * 1000)
+            found_total += len(boxes)
+            matched += match(expected, boxes, iou_threshold)
+
+        latencies.sort()
+        result = {
+            "name": f"face_detectors/{name}",
+            "detector": name,
+            "images": len(images),
+            "median_ms": statistics.median(latencies),
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "faces": found_total,
+            "recall": matched / total_reference if total_reference else None,
+            "extra": found_total - matched
+        }
+        results.append(result)
+        recall = f"{result['recall']:.3f}" if result["recall"] is not None else "  -  "
+        print(f"{name:20s} mediana {result['median_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+              f"caras {found_total:5d}  recall {recall}  extra {result['extra']:4d}")
+    print(f"Referencia '{reference_name}': {total_reference} caras en {len(images)} imágenes")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", required=True, help="Carpeta con las imágenes de prueba")
+    parser.add_argument("--detectors", nargs="+", default=list(FACE_DETECTOR_NAMES), help="Detectores a comparar")
+    parser.add_argument("--ssd-sizes", nargs="*", type=int, default=[], help="Tamaños de entrada extra para la SSD")
+    parser.add_argument("--reference", default="ssd", help="Detector de referencia para el recall")
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU mínimo para contar una cara como encontrada")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por imagen para la latencia")
+    parser.add_argument("--json", help="Fichero donde guardar el informe")
+    args = parser.parse_args()
+
+    images = load_images(args.images)
+    if not images:
+        parser.error(f"No hay imágenes en {args.images}")
+    detectors = args.detectors + [f"ssd@{size}" for size in args.ssd_sizes]
+
+    results = run(images, detectors, args.reference, args.iou, max(1, args.repeat))
+    if args.json:
+        write_report(args.json, "face_detectors", results, {
+            "images": args.images,
+            "reference": args.reference,
+            "iou": args.iou,
+            "repeat": args.repeat
+        })
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+## @file benchmarks/bench_history_sqlite.py
+"""Latencia de las consultas de página del historial SQLite según crece la tabla.
+
+Uso:
+    python -m benchmarks.bench_history_sqlite --sizes 10000 100000 1000000 [--json out.json]
+
+Inserta registros sintéticos por lotes y, en cada tamaño, mide la mediana de:
+primera página, primera página filtrada por tipo, página por cursor en mitad
+de la tabla, la misma página por OFFSET (para comparar) y los conteos.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from app.services.sqlite_history_repository import SQLiteHistoryRepository
+from benchmarks.report import write_report
+
+EMOTIONS = ["joy", "sadness", "anger", "surprise", "fear", "disgust", "neutral"]
+
+def _rows(n: int, start_ts: float):
+    rng = random.Random(n)
+    for i in range(n):
+        scores = [rng.random() for _ in EMOTIONS]
+        total = sum(scores)
+        scores = {e: s / total for e, s in zip(EMOTIONS, scores)}
+        yield (
+            str(uuid.uuid4()),
+            start_ts + i * 0.01,
+            "image" if rng.random() < 0.5 else "video",
+            max(scores, key=scores.get),
+            json.dumps(scores),
+            None
+        )
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(timings)
+
+def run(sizes, per_page: int = 50, repeat: int = 20, chunk: int = 50_000):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = SQLiteHistoryRepository(os.path.join(tmp, "history.sqlite3"))
+        inserted = 0
+        ts = time.time() - 86400 * 30
+        for size in sorted(sizes):
+            while inserted < size:
+                n = min(chunk, size - inserted)
+                repo.insert_rows(list(_rows(n, ts + inserted * 0.01)))
+                inserted += n
+
+            middle = repo.query_page(size // (2 * per_page), per_page, None, None)[0].id
+            results.append({
+                "name": f"history_sqlite/{size}rows",
+                "rows": size,
+                "first_page_ms": _median_ms(lambda: repo.query_page(None, per_page, None, None), repeat),
+                "first_page_filtered_ms": _median_ms(lambda: repo.query_page(None, per_page, "video", None), repeat),
+                "cursor_page_middle_ms": _median_ms(lambda: repo.query_page(None, per_page, None, middle), repeat),
+                "offset_page_middle_ms": _median_ms(
+                    lambda: repo.query_page(size // (2 * per_page), per_page, None, None), repeat
+                ),
+                "count_ms": _median_ms(lambda: repo.count_sync(), repeat),
+                "count_filtered_ms": _median_ms(lambda: repo.count_sync("image"), repeat)
+            })
+            print(json.dumps(results[-1]))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="Fichero donde guardar el informe")
+    args = parser.parse_args()
+
+    results = run(args.sizes, per_page=args.per_page, repeat=args.repeat)
+    if args.json:
+        write_report(args.json, "history_sqlite", results, {
+            "sizes": args.sizes,
+            "per_page": args.per_page,
+            "repeat": args.repeat
+        })
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+## @file benchmarks/bench_load.py
+"""Escenarios de carga contra la aplicación completa, en proceso (ASGI).
+
+Uso:
+    python -m benchmarks.bench_load [--models stub|real] [--concurrency 1 8 32]
+        [--requests 200] [--detect-ms 0] [--classify-ms 0] [--json reports/load.json]
+
+Arranca la app con sus eventos de startup/shutdown y lanza, para cada nivel
+de concurrencia, las peticiones de cada escenario: imágenes distintas
+(`process_image_unique`), la misma imagen (`process_image_cached`), página y
+estadísticas del historial, último frame de la webcam (fuente de vídeo
+sintética en bucle) y métricas. Se informa de peticiones por segundo,
+percentiles de latencia y errores. Con `--detect-ms`/`--classify-ms` los
+modelos simulados imitan el coste de los reales.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+import cv2
+from benchmarks.asgi import multipart_body, request
+from benchmarks.report import print_results, summarize, write_report
+from benchmarks.synthetic import synthetic_frame, synthetic_jpeg
+
+WIDTH, HEIGHT, FACES = 640, 480, 3
+
+async def run_scenario(
+    name: str,
+    call: Callable[[int], Awaitable[int]],
+    total: int,
+    concurrency: int
+) -> Dict:
+    """Lanza `total` llamadas con `concurrency` clientes; `call(i)` devuelve el código HTTP"""
+    samples: List[float] = []
+    errors = 0
+    next_index = iter(range(total))
+
+    async def client():
+        nonlocal errors
+        for i in next_index:
+            started = time.perf_counter()
+            try:
+                status = await call(i)
+            except Exception:
+                status = 599
+            samples.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stats = summarize(samples)
+    return {
+        "name": f"{name}/c{concurrency}",
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": total / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": stats.get("median_ms"),
+        "p95_ms": stats.get("p95_ms"),
+        "p99_ms": stats.get("p99_ms"),
+        "mean_ms": stats.get("mean_ms")
+    }
+
+def _write_video(path: str, frames: int = 30) -> None:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (WIDTH, HEIGHT))
+    for i in range(frames):
+        writer.write(synthetic_frame(WIDTH, HEIGHT, FACES, seed=i // 10)[0])
+    writer.release()
+
+async def run(
+    models: str,
+    concurrency: List[int],
+    total: int,
+    stub_options: Dict
+) -> List[Dict]:
+    # Importaciones tardías: la configuración se lee del entorno al importar la app
+    from app.main import app
+    from benchmarks.stubs import install_model, load_model
+
+    install_model(load_model(models, **stub_options) if models == "stub" else load_model(models))
+    await app.router.startup()
+    results = []
+    try:
+        cached_body, cached_type = multipart_body("file", "cached.jpg", synthetic_jpeg(WIDTH, HEIGHT, FACES))
+
+        for level, clients in enumerate(concurrency):
+            # Imágenes pregeneradas y distintas en cada nivel para no acertar en la caché
+            images = [
+                multipart_body("file", f"{i}.jpg", synthetic_jpeg(WIDTH, HEIGHT, FACES, seed=(level + 1) * 100000 + i))
+                for i in range(total)
+            ]
+
+            async def unique(i):
+                body, content_type = images[i]
+                return (await request(app, "POST", "/api/v1/detection/process-image", body=body,
+                                      headers={"content-type": content_type})).status
+
+            async def cached(i):
+                return (await request(app, "POST", "/api/v1/detection/process-image", body=cached_body,
+                                      headers={"content-type": cached_type})).status
+
+            async def history_page(i):
+                return (await request(app, "GET", "/api/v1/history/", params={"limit": 50})).status
+
+            async def history_stats(i):
+                return (await request(app, "GET", "/api/v1/history/stats")).status
+
+            async def webcam(i):
+                return (await request(app, "GET", "/api/v1/webcam/process-latest-frame")).status
+
+            async def metrics(i):
+                return (await request(app, "GET", "/api/v1/metrics/")).status
+
+            scenarios = {
+                "process_image_unique": unique,
+                "process_image_cached": cached,
+                "history_page": history_page,
+                "history_stats": history_stats,
+                "webcam_latest_frame": webcam,
+                "metrics": metrics
+            }
+            for name, call in scenarios.items():
+                results.append(await run_scenario(name, call, total, clients))
+    finally:
+        await app.router.shutdown()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", choices=("stub", "real"), default="stub")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="Peticiones por escenario y nivel")
+    parser.add_argument("--detect-ms", type=float, default=0.0, help="Coste simulado del detector")
+    parser.add_argument("--classify-ms", type=float, default=0.0, help="Coste simulado del clasificador por lote")
+    parser.add_argument("--json", help="Fichero donde guardar el informe")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        video = os.path.join(workdir, "camera.avi")
+        _write_video(video)
+        # Sin procesos de inferencia ni cámara física; el resto de la configuración se respeta
+        os.environ.setdefault("INFERENCE_WORKERS", "0")
+        os.environ.setdefault("CAMERA_SOURCES", f"default=loop:{video}")
+        os.environ.setdefault("HISTORY_SQLITE_PATH", os.path.join(workdir, "history.sqlite3"))
+
+        stub_options = {"detect_ms": args.detect_ms, "classify_ms": args.classify_ms}
+        results = asyncio.run(run(args.models, args.concurrency, max(1, args.requests), stub_options))
+
+    print_results(results, metrics=("rps", "p50_ms", "p95_ms", "p99_ms", "errors"))
+    if args.json:
+        write_report(args.json, "load", results, {
+            "models": args.models,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "detect_ms": args.detect_ms,
+            "classify_ms": args.classify_ms,
+            "image": f"{WIDTH}x{HEIGHT}/{FACES}f"
+        })
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+## @file benchmarks/bench_serialization.py
+"""Rendimiento de la serialización de respuestas JSON: ruta anterior frente a FastJSONResponse.
+
+Uso:
+    python -m benchmarks.bench_serialization [--seconds 1.0] [--json out.json]
+
+La ruta anterior reproduce lo que hacía cada respuesta con el middleware de
+serialización: jsonable_encoder + json.dumps en FastAPI, y después json.loads,
+conversión recursiva de tipos NumPy y un segundo json.dumps en el middleware.
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.schemas.api.history import HistoryRecord, HistoryResponse
+from app.utils.responses import FastJSONResponse
+from benchmarks.report import write_report
+
+EMOTIONS = ["joy", "sadness", "anger", "surprise", "fear", "disgust", "neutral"]
+
+def _convert_numpy_types(obj: Any) -> Any:
+    """Copia de la conversión recursiva del middleware eliminado"""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, dict):
+        return {k: _convert_numpy_types(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_convert_numpy_types(item) for item in obj]
+    return obj
+
+def legacy_render(content: Any) -> bytes:
+    body = JSONResponse(content=jsonable_encoder(content)).body
+    converted = _convert_numpy_types(json.loads(body.decode("utf-8")))
+    return JSONResponse(content=converted).body
+
+def fast_render(content: Any) -> bytes:
+    if isinstance(content, HistoryResponse):
+        content = content.dict()
+    return FastJSONResponse(content).body
+
+def detection_payload(faces: int) -> Dict:
+    rng = np.random.default_rng(faces)
+    detections = []
+    for _ in range(faces):
+        scores = rng.dirichlet(np.ones(len(EMOTIONS)))
+        detections.append({
+            "faceId": str(uuid.uuid4()),
+            "emotions": {e: float(s) for e, s in zip(EMOTIONS, scores)},
+            "dominantEmotion": EMOTIONS[int(np.argmax(scores))],
+            "timestamp": datetime.utcnow().isoformat(),
+            "boundingBox": {"x": 10, "y": 20, "width": 120, "height": 140}
+        })
+    return {"detections": detections, "frameInfo": {"height": 480, "width": 640, "channels": 3}}
+
+def history_payload(records: int, snapshot_bytes: int = 0):
+    rng = np.random.default_rng(records)
+    items = []
+    for _ in range(records):
+        scores = rng.dirichlet(np.ones(len(EMOTIONS)))
+        items.append(HistoryRecord(
+            id=str(uuid.uuid4()),
+            dominant_emotion=EMOTIONS[int(np.argmax(scores))],
+            emotion_scores=dict(zip(EMOTIONS, scores.tolist())),
+            detection_type="video",
+            snapshot_id=uuid.uuid4().hex
+        ))
+    response = HistoryResponse(records=items, total=records, page=1, per_page=records)
+    if not snapshot_bytes:
+        return response
+    # Páginas como las de antes, con el snapshot en base64 dentro de cada registro
+    snapshot = base64.b64encode(os.urandom(snapshot_bytes)).decode("ascii")
+    content = response.dict()
+    for record in content["records"]:
+        record["image_snapshot"] = snapshot
+    return content
+
+def _throughput(fn: Callable[[Any], bytes], payload: Any, seconds: float) -> Dict:
+    size = len(fn(payload))
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        fn(payload)
+        calls += 1
+    elapsed = time.perf_counter() - started
+    return {"ops_per_s": calls / elapsed, "mb_per_s": calls * size / elapsed / 1e6, "bytes": size}
+
+def run(seconds: float = 1.0):
+    payloads = {
+        "detection_1_face": detection_payload(1),
+        "detection_10_faces": detection_payload(10),
+        "history_page_50": history_payload(50),
+        "history_page_50_snapshots_30kb": history_payload(50, 30_000)
+    }
+    results = []
+    for name, payload in payloads.items():
+        legacy = _throughput(legacy_render, payload, seconds)
+        fast = _throughput(fast_render, payload, seconds)
+        results.append({
+            "name": f"serialization/{name}",
+            "payload": name,
+            "bytes": fast["bytes"],
+            "legacy_ops_per_s": legacy["ops_per_s"],
+            "fast_ops_per_s": fast["ops_per_s"],
+            "speedup": fast["ops_per_s"] / legacy["ops_per_s"]
+        })
+        print(f"{name:34s} {fast['bytes']:>9d} B  legacy {legacy['ops_per_s']:>10.0f}/s  "
+              f"fast {fast['ops_per_s']:>10.0f}/s  x{results[-1]['speedup']:.1f}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=1.0, help="Duración de cada medición")
+    parser.add_argument("--json", help="Fichero donde guardar el informe")
+    args = parser.parse_args()
+
+    results = run(args.seconds)
+    if args.json:
+        write_report(args.json, "serialization", results, {"seconds": args.seconds})
+
+if __name__ == "__main__":
+    main()
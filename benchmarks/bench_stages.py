@@ -0,0 +1,181 @@
+## @file benchmarks/bench_stages.py
+"""Latencia por etapa de `process_image` y `WebcamService.process_frame`.
+
+Uso:
+    python -m benchmarks.bench_stages [--models stub|real] [--sizes 640x480 1280x720]
+        [--faces 1 5] [--repeat 50] [--json reports/stages.json]
+
+Cada etapa se mide por separado con las mismas funciones que usa el
+pipeline (decodificación, detección, recorte, clasificación, construcción
+del resultado, codificación del snapshot, inserción en el historial en
+memoria y SQLite, y serialización de la respuesta), y después se mide la
+llamada completa. Con `--models stub` (por defecto) se usan los modelos
+simulados de `benchmarks.stubs` y el informe comprueba que se encuentra el
+número esperado de caras; con `--models real`, el modelo configurado.
+Las etapas asíncronas incluyen la espera en el pool de CPU.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+from typing import Dict, List, Tuple
+import cv2
+from app.schemas.api.history import HistoryRecordCreate
+from app.schemas.core import DetectionType
+from app.services.executor import cpu_executor
+from app.services.history_repository import InMemoryHistoryRepository
+from app.services.history_writer import history_writer
+from app.services.image_processing_service import process_image
+from app.services.inference_scheduler import inference_scheduler
+from app.services.result_cache import result_cache
+from app.services.snapshot_store import encode_snapshot
+from app.services.sqlite_history_repository import SQLiteHistoryRepository
+from app.services.video_processing_service import WebcamService
+from app.utils.image_processing import decode_image, preprocess_faces
+from app.utils.responses import FastJSONResponse
+from benchmarks.report import print_results, time_async, time_call, write_report
+from benchmarks.stubs import load_model
+from benchmarks.synthetic import synthetic_frame, synthetic_jpeg
+
+def parse_size(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+def _records(faces: int) -> List[HistoryRecordCreate]:
+    scores = {"joy": 0.7, "neutral": 0.2, "sadness": 0.1}
+    return [
+        HistoryRecordCreate(dominant_emotion="joy", emotion_scores=scores, detection_type=DetectionType.IMAGE)
+        for _ in range(faces)
+    ]
+
+async def bench_image(model, width: int, height: int, faces: int, repeat: int, workdir: str) -> List[Dict]:
+    prefix = f"process_image/{width}x{height}/{faces}f"
+    image = synthetic_jpeg(width, height, faces, seed=faces)
+    frame = decode_image(image)
+    boxes = model.locate_faces(frame)
+    batch = preprocess_faces(frame, boxes)
+    preds = model.classify_faces(batch)
+
+    stages = {
+        "decode": time_call(lambda: decode_image(image), repeat),
+        "detect": time_call(lambda: model.locate_faces(frame), repeat),
+        "preprocess": time_call(lambda: preprocess_faces(frame, boxes), repeat),
+        "classify": time_call(lambda: model.classify_faces(batch), repeat),
+        "build_results": time_call(lambda: model.build_results(boxes, preds), repeat),
+        "snapshot_encode": time_call(lambda: encode_snapshot(frame), repeat)
+    }
+
+    memory_repo = InMemoryHistoryRepository()
+    stages["history_insert_memory"] = await time_async(lambda: memory_repo.create_records(_records(faces)), repeat)
+    sqlite_repo = SQLiteHistoryRepository(os.path.join(workdir, f"history_{width}x{height}_{faces}.sqlite3"))
+    try:
+        stages["history_insert_sqlite"] = await time_async(lambda: sqlite_repo.create_records(_records(faces)), repeat)
+    finally:
+        await sqlite_repo.close()
+
+    # Llamada completa sin caché (el historial se escribe en segundo plano)
+    cache_enabled = result_cache.enabled
+    result_cache.enabled = False
+    try:
+        response = await process_image(image, model)
+        stages["serialize"] = time_call(lambda: FastJSONResponse(response).body, repeat)
+        stages["end_to_end"] = await time_async(lambda: process_image(image, model), repeat)
+    finally:
+        result_cache.enabled = cache_enabled
+    if result_cache.enabled:
+        stages["end_to_end_cached"] = await time_async(lambda: process_image(image, model), repeat)
+
+    results = [{"name": f"{prefix}/{stage}", **timing} for stage, timing in stages.items()]
+    results.append({
+        "name": f"{prefix}/faces",
+        "expected_faces": faces,
+        "found_faces": len(response["detections"])
+    })
+    return results
+
+async def bench_webcam(model, width: int, height: int, faces: int, repeat: int, workdir: str) -> List[Dict]:
+    prefix = f"process_frame/{width}x{height}/{faces}f"
+    # Fuente de vídeo de un frame: el hilo de captura no se arranca, los frames se escriben a mano
+    path = os.path.join(workdir, f"source_{width}x{height}.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+    writer.write(synthetic_frame(width, height, faces)[0])
+    writer.release()
+    service = WebcamService(source=path, source_id="bench")
+
+    # Escenas con las caras en sitios distintos para forzar detección y clasificación
+    frames = [synthetic_frame(width, height, faces, seed=i)[0] for i in range(8)]
+    boxes = model.locate_faces(frames[0])
+    stages = {
+        "frame_ring_write": time_call(lambda: service.frames.write(frames[0]), repeat)
+    }
+    if service.motion_gate is not None:
+        stages["motion_signature"] = time_call(lambda: service.motion_gate.signature(frames[0]), repeat)
+    if service.tracker is not None:
+        stages["tracker_update"] = time_call(lambda: service.tracker.update(boxes), repeat)
+
+    # Escena estática: el motion gate reutiliza el resultado anterior
+    service.frames.write(frames[0])
+    stages["end_to_end_static"] = await time_async(lambda: service.process_frame(model), repeat)
+
+    counter = iter(range(10 ** 9))
+
+    async def moving():
+        service.frames.write(frames[next(counter) % len(frames)])
+        return await service.process_frame(model)
+
+    stages["end_to_end_moving"] = await time_async(moving, repeat)
+    result = await moving()
+    service.stop()
+
+    results = [{"name": f"{prefix}/{stage}", **timing} for stage, timing in stages.items()]
+    results.append({"name": f"{prefix}/faces", "expected_faces": faces, "found_faces": len(result["faces"])})
+    return results
+
+async def run(
+    models: str = "stub",
+    sizes: List[Tuple[int, int]] = ((640, 480), (1280, 720)),
+    face_counts: List[int] = (1, 5),
+    repeat: int = 50
+) -> List[Dict]:
+    model = load_model(models)
+    cpu_executor.start()
+    inference_scheduler.start()
+    history_writer.start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for width, height in sizes:
+                for faces in face_counts:
+                    results += await bench_image(model, width, height, faces, repeat, workdir)
+                    results += await bench_webcam(model, width, height, faces, repeat, workdir)
+    finally:
+        await history_writer.stop()
+        await inference_scheduler.stop()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", choices=("stub", "real"), default="stub")
+    parser.add_argument("--sizes", nargs="+", default=["640x480", "1280x720"], help="Resoluciones AnchoxAlto")
+    parser.add_argument("--faces", nargs="+", type=int, default=[1, 5], help="Caras por imagen")
+    parser.add_argument("--repeat", type=int, default=50, help="Repeticiones por etapa")
+    parser.add_argument("--json", help="Fichero donde guardar el informe")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes]
+    results = asyncio.run(run(args.models, sizes, args.faces, max(1, args.repeat)))
+    print_results(results)
+    for result in results:
+        if "expected_faces" in result and result["expected_faces"] != result["found_faces"]:
+            print(f"AVISO {result['name']}: {result['found_faces']} caras de {result['expected_faces']}")
+    if args.json:
+        write_report(args.json, "stages", results, {
+            "models": args.models,
+            "sizes": args.sizes,
+            "faces": args.faces,
+            "repeat": args.repeat
+        })
+
+if __name__ == "__main__":
+    main()
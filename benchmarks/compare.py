@@ -0,0 +1,100 @@
+## @file benchmarks/compare.py
+"""Compara dos informes JSON de benchmarks (p. ej. de dos commits).
+
+Uso:
+    python -m benchmarks.compare base.json nuevo.json [--threshold 10] [--metrics median_ms p95_ms rps]
+
+Empareja los resultados por `name` y muestra la variación de cada métrica.
+Las métricas `*_ms`/`*_mb` empeoran al subir; `rps`, `*_per_s`, `speedup`,
+`recall` y `agreement` empeoran al bajar. Sale con código 1 si alguna
+empeora más que `--threshold` (en %), para poder usarlo en CI.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+HIGHER_IS_BETTER = ("rps", "per_s", "speedup", "recall", "agreement")
+LOWER_IS_BETTER = ("_ms", "_mb")
+
+def direction(metric: str) -> int:
+    """1 = mayor es mejor, -1 = menor es mejor, 0 = no se compara"""
+    if any(key in metric for key in HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+def load_results(path: str) -> Tuple[Dict, Dict[str, Dict]]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    results = {}
+    for result in report.get("results", []):
+        # Los informes antiguos no tienen `name`: se identifica por sus campos de texto
+        key = result.get("name") or "/".join(
+            f"{k}={v}" for k, v in result.items() if isinstance(v, str)
+        )
+        results[key] = result
+    return report, results
+
+def compare(
+    base: Dict[str, Dict],
+    new: Dict[str, Dict],
+    metrics: Optional[Sequence[str]] = None,
+    threshold: float = 10.0
+) -> List[Dict]:
+    """Filas con la variación porcentual; `regression` marca los empeoramientos > threshold"""
+    rows = []
+    for name in [n for n in base if n in new]:
+        for metric, old in base[name].items():
+            value = new[name].get(metric)
+            sign = direction(metric)
+            if metrics and metric not in metrics:
+                continue
+            if sign == 0 or not isinstance(old, (int, float)) or not isinstance(value, (int, float)):
+                continue
+            change = (value - old) / old * 100 if old else 0.0
+            rows.append({
+                "name": name,
+                "metric": metric,
+                "base": old,
+                "new": value,
+                "change_pct": change,
+                "regression": -sign * change > threshold
+            })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", help="Informe de referencia")
+    parser.add_argument("new", help="Informe a comparar")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Empeoramiento máximo tolerado (%%)")
+    parser.add_argument("--metrics", nargs="+", help="Métricas a comparar (por defecto, todas)")
+    args = parser.parse_args()
+
+    base_report, base = load_results(args.base)
+    new_report, new = load_results(args.new)
+    if base_report.get("benchmark") != new_report.get("benchmark"):
+        print(f"AVISO: benchmarks distintos ({base_report.get('benchmark')} / {new_report.get('benchmark')})")
+    print(f"Base: {base_report.get('commit')}  Nuevo: {new_report.get('commit')}")
+
+    rows = compare(base, new, args.metrics, args.threshold)
+    width = max((len(row["name"]) for row in rows), default=10)
+    for row in rows:
+        mark = "  REGRESIÓN" if row["regression"] else ""
+        print(
+            f"{row['name']:{width}s}  {row['metric']:12s} {row['base']:12.3f} -> {row['new']:12.3f}"
+            f"  {row['change_pct']:+7.1f}%{mark}"
+        )
+    missing = set(base) ^ set(new)
+    if missing:
+        print(f"{len(missing)} resultados sin pareja en el otro informe")
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} métricas empeoran más de un {args.threshold:g}%")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+## @file benchmarks/report.py
+"""Medición de tiempos e informes JSON comparables entre commits.
+
+Todos los informes tienen la forma
+`{"benchmark", "commit", "created_at", "environment", "config", "results"}`,
+donde `results` es una lista de diccionarios con un campo `name` único y
+métricas numéricas (`*_ms` menor es mejor, `*_per_s`/`rps` mayor es mejor).
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+def summarize(samples_ms: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"samples": 0}
+
+    def pct(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        "samples": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "median_ms": statistics.median(ordered),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "min_ms": ordered[0]
+    }
+
+def time_call(fn: Callable[[], Any], repeat: int = 50, warmup: int = 3) -> Dict[str, float]:
+    """Latencia de `fn()` repetida `repeat` veces tras `warmup` llamadas de calentamiento"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+async def time_async(fn: Callable[[], Awaitable[Any]], repeat: int = 50, warmup: int = 3) -> Dict[str, float]:
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> Dict[str, Any]:
+    import cv2
+    import numpy as np
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__
+    }
+
+def write_report(path: str, benchmark: str, results: List[Dict], config: Optional[Dict] = None) -> Dict:
+    report = {
+        "benchmark": benchmark,
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": environment(),
+        "config": config or {},
+        "results": results
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+def print_results(results: List[Dict], metrics: Sequence[str] = ("median_ms", "p95_ms")) -> None:
+    width = max((len(r["name"]) for r in results), default=10)
+    for result in results:
+        values = "  ".join(
+            f"{metric} {result[metric]:10.3f}" for metric in metrics if isinstance(result.get(metric), (int, float))
+        )
+        print(f"{result['name']:{width}s}  {values}")
@@ -0,0 +1,87 @@
+## @file benchmarks/stubs.py
+"""Modelos simulados deterministas para medir el pipeline sin ficheros de modelo.
+
+`StubEmotionModel` tiene la misma interfaz que `EmotionModel`: el detector
+encuentra las caras de `synthetic.synthetic_frame` por umbral y el
+clasificador calcula scores fijos a partir del color medio de cada cara.
+Con `classify_ms`/`detect_ms` se simula el coste de los modelos reales
+(`time.sleep` libera el GIL igual que TensorFlow y OpenCV).
+"""
+
+import time
+from typing import Optional
+import cv2
+import numpy as np
+from app.config import EMOTION_MODEL_PATH, EMOTION_MODEL_VERSION
+from app.models.classifiers import EmotionClassifier
+from app.models.emotion_model import EMOTION_MAPPING, EmotionModel
+from app.models.face_detectors import Detections, FaceDetector
+from benchmarks.synthetic import BACKGROUND_MAX
+
+class StubFaceDetector(FaceDetector):
+    name = "stub"
+
+    def __init__(self, detect_ms: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.detect_ms = detect_ms
+
+    def detect(self, frame: np.ndarray) -> Detections:
+        (h, w) = frame.shape[:2]
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        _, mask = cv2.threshold(gray, BACKGROUND_MAX + 30, 255, cv2.THRESH_BINARY)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        rects = np.array([cv2.boundingRect(c) for c in contours], dtype=int).reshape(-1, 4)
+        boxes = np.column_stack((rects[:, :2], rects[:, :2] + rects[:, 2:]))
+        if self.detect_ms > 0:
+            time.sleep(self.detect_ms / 1000)
+        return self._finish(boxes, (rects[:, 2] * rects[:, 3]).astype(np.float64), w, h)
+
+class StubClassifier(EmotionClassifier):
+    backend = "stub"
+
+    def __init__(self, classify_ms: float = 0.0, per_face_ms: float = 0.0, seed: int = 0):
+        self.classify_ms = classify_ms
+        self.per_face_ms = per_face_ms
+        self._projection = np.random.default_rng(seed).standard_normal((3, len(EMOTION_MAPPING)))
+
+    def predict(self, faces: np.ndarray) -> np.ndarray:
+        logits = faces.mean(axis=(1, 2)) @ self._projection * 10.0
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        delay = self.classify_ms + self.per_face_ms * len(faces)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return (exp / exp.sum(axis=1, keepdims=True)).astype(np.float32)
+
+class StubEmotionModel(EmotionModel):
+    """EmotionModel con detector y clasificador simulados (no carga ficheros)"""
+
+    def __init__(
+        self,
+        version: str = EMOTION_MODEL_VERSION,
+        model_path: str = EMOTION_MODEL_PATH,
+        detect_ms: float = 0.0,
+        classify_ms: float = 0.0,
+        per_face_ms: float = 0.0
+    ):
+        super().__init__(
+            model_path=model_path,
+            version=version,
+            classifier=StubClassifier(classify_ms, per_face_ms),
+            detectors={StubFaceDetector.name: StubFaceDetector(detect_ms)},
+            default_detector=StubFaceDetector.name
+        )
+
+def load_model(kind: str = "stub", **stub_options) -> EmotionModel:
+    """'stub' = modelos simulados; 'real' = el modelo configurado (EMOTION_MODEL_PATH)"""
+    if kind == "stub":
+        return StubEmotionModel(**stub_options)
+    if kind == "real":
+        model = EmotionModel(model_path=EMOTION_MODEL_PATH, version=EMOTION_MODEL_VERSION)
+        model.warmup()
+        return model
+    raise ValueError(f"Tipo de modelo no válido: {kind} (stub o real)")
+
+def install_model(model: EmotionModel, version: Optional[str] = None) -> None:
+    """Registra el modelo como versión activa para que la app no cargue otro al arrancar"""
+    from app.models.model_registry import model_registry
+    model_registry.register(version or model.version, model)
@@ -0,0 +1,53 @@
+## @file benchmarks/synthetic.py
+"""Imágenes sintéticas deterministas con un número conocido de "caras".
+
+Cada cara es un rectángulo claro con textura sobre un fondo oscuro con ruido,
+de modo que `stubs.StubFaceDetector` las encuentra exactamente y el número
+de caras esperado se puede comprobar en los informes.
+"""
+
+from typing import List, Tuple
+import cv2
+import numpy as np
+
+Box = Tuple[int, int, int, int]
+
+# Por debajo de este nivel de gris todo es fondo
+BACKGROUND_MAX = 60
+
+def synthetic_frame(
+    width: int = 640,
+    height: int = 480,
+    faces: int = 1,
+    seed: int = 0
+) -> Tuple[np.ndarray, List[Box]]:
+    """Frame BGR y cajas (Xi, Yi, Xf, Yf) de las caras dibujadas, sin solaparse"""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, BACKGROUND_MAX, (height, width, 3), dtype=np.uint8)
+    boxes: List[Box] = []
+    if faces <= 0:
+        return frame, boxes
+
+    # Rejilla con una celda por cara para que no se solapen
+    cols = int(np.ceil(np.sqrt(faces * width / height)))
+    rows = int(np.ceil(faces / cols))
+    cell_w, cell_h = width // cols, height // rows
+    side = max(24, int(min(cell_w, cell_h) * 0.6))
+    for i in range(faces):
+        row, col = divmod(i, cols)
+        x = col * cell_w + int(rng.integers(0, max(1, cell_w - side)))
+        y = row * cell_h + int(rng.integers(0, max(1, cell_h - side)))
+        face = rng.integers(120, 255, (side, side, 3), dtype=np.uint8)
+        frame[y:y + side, x:x + side] = cv2.GaussianBlur(face, (0, 0), 2)
+        boxes.append((x, y, x + side, y + side))
+    return frame, boxes
+
+def synthetic_jpeg(
+    width: int = 640,
+    height: int = 480,
+    faces: int = 1,
+    seed: int = 0,
+    quality: int = 90
+) -> bytes:
+    frame, _ = synthetic_frame(width, height, faces, seed)
+    return cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])[1].tobytes()
@@ -0,0 +1,84 @@
+## @file tests/test_emotion_rollups.py
+
+import asyncio
+import time
+from collections import defaultdict
+import numpy as np
+import pytest
+from app.schemas.api.history import HistoryRecordCreate
+from app.services.emotion_rollups import EMOTIONS, GRANULARITIES, EmotionRollups, emotion_rollups
+from app.services.sqlite_history_repository import SQLiteHistoryRepository
+from app.utils.timestamps import from_epoch, to_epoch
+
+def _records(n: int, now: float):
+    """Registros aleatorios repartidos por las últimas tres horas"""
+    rng = np.random.default_rng(0)
+    records = []
+    for _ in range(n):
+        scores = rng.dirichlet(np.ones(len(EMOTIONS)))
+        records.append(HistoryRecordCreate(
+            timestamp=from_epoch(now - rng.uniform(0, 3 * 3600)),
+            dominant_emotion=EMOTIONS[int(np.argmax(scores))],
+            emotion_scores=dict(zip(EMOTIONS, scores.tolist())),
+            detection_type=str(rng.choice(["image", "video"]))
+        ))
+    return records
+
+def _recount(records, size: int):
+    """Recuento completo registro a registro: tipo -> intervalo -> (n, dominantes, sumas)"""
+    totals = defaultdict(lambda: defaultdict(lambda: [0, defaultdict(int), np.zeros(len(EMOTIONS))]))
+    for record in records:
+        index = int(to_epoch(record.timestamp) // size)
+        bucket = totals[record.detection_type.value][index]
+        bucket[0] += 1
+        bucket[1][record.dominant_emotion] += 1
+        bucket[2] += [getattr(record.emotion_scores, e) for e in EMOTIONS]
+    return totals
+
+def _assert_matches(stats, records, size):
+    expected = _recount(records, size)
+    assert stats["total"]["count"] == len(records)
+    for kind, buckets in expected.items():
+        count = sum(b[0] for b in buckets.values())
+        assert stats["by_type"][kind]["count"] == count
+        means = sum(b[2] for b in buckets.values()) / count
+        assert list(stats["by_type"][kind]["mean_scores"].values()) == pytest.approx(means.tolist())
+
+    by_start = {bucket["start_s"]: bucket for bucket in stats["buckets"]}
+    indexes = {index for buckets in expected.values() for index in buckets}
+    assert sorted(by_start) == sorted(index * size for index in indexes)
+    for index in indexes:
+        bucket = by_start[index * size]
+        parts = [expected[kind][index] for kind in expected if index in expected[kind]]
+        assert bucket["count"] == sum(p[0] for p in parts)
+        for emotion in EMOTIONS:
+            assert bucket["dominant_counts"][emotion] == sum(p[1][emotion] for p in parts)
+
+@pytest.mark.parametrize("granularity", list(GRANULARITIES))
+def test_rollups_match_full_recount(granularity):
+    now = time.time()
+    records = _records(300, now)
+    rollups = EmotionRollups()
+    for record in records:
+        rollups.add_records([record])
+
+    stats = rollups.query(now - 4 * 3600, now + 60, granularity=granularity)
+    _assert_matches(stats, records, GRANULARITIES[granularity])
+
+def test_sqlite_rebuild_matches_full_recount(tmp_path):
+    now = time.time()
+    records = _records(200, now)
+    path = str(tmp_path / "history.sqlite3")
+    try:
+        repo = SQLiteHistoryRepository(path)
+        asyncio.run(repo.create_records(records))
+        asyncio.run(repo.close())
+
+        # Al reabrir, los agregados se reconstruyen desde la tabla con GROUP BY
+        emotion_rollups.clear()
+        repo = SQLiteHistoryRepository(path)
+        stats = emotion_rollups.query(now - 4 * 3600, now + 60, granularity="minute")
+        _assert_matches(stats, records, 60)
+        asyncio.run(repo.close())
+    finally:
+        emotion_rollups.clear()
@@ -0,0 +1,28 @@
+## @file tests/test_executor.py
+
+import asyncio
+import pytest
+from app.services import executor
+from app.services.executor import CPUExecutor
+from benchmarks.stubs import StubEmotionModel
+
+class FakeModel:
+    def __init__(self, model_path: str, version: str):
+        self.model_path = model_path
+        self.version = version
+
+def test_worker_keeps_only_the_latest_model(monkeypatch):
+    monkeypatch.setattr(executor, "EmotionModel", FakeModel)
+    monkeypatch.setattr(executor, "_worker_models", {})
+
+    first = executor._worker_model("models/a.keras", "a")
+    assert executor._worker_model("models/a.keras", "a") is first
+    second = executor._worker_model("models/b.keras", "b")
+
+    assert second is not first
+    assert list(executor._worker_models) == ["models/b.keras"]
+
+def test_process_executor_rejects_injected_models():
+    pool = CPUExecutor(kind="process", max_workers=1)
+    with pytest.raises(ValueError):
+        asyncio.run(pool.run_model(StubEmotionModel(), "classify_faces", None))
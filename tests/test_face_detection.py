@@ -0,0 +1,63 @@
+## @file tests/test_face_detection.py
+
+import numpy as np
+from app.utils.face_detection import non_max_suppression, postprocess_boxes, postprocess_detections
+
+def test_nms_suppresses_overlaps_and_orders_by_score():
+    boxes = np.array([
+        [10, 10, 110, 110],
+        [12, 12, 112, 112],    # solapa con la primera y tiene menos score
+        [200, 200, 300, 300],
+        [205, 195, 305, 295]   # solapa con la tercera y tiene más score
+    ])
+    scores = np.array([0.9, 0.8, 0.7, 0.95])
+    keep = non_max_suppression(boxes, scores, iou_threshold=0.3)
+    assert keep.tolist() == [3, 0]
+
+def test_nms_keeps_boxes_below_iou_threshold():
+    boxes = np.array([[0, 0, 100, 100], [60, 0, 160, 100]])   # IoU = 0.25
+    scores = np.array([0.5, 0.9])
+    assert non_max_suppression(boxes, scores, iou_threshold=0.3).tolist() == [1, 0]
+    assert non_max_suppression(boxes, scores, iou_threshold=0.2).tolist() == [1]
+
+def test_postprocess_clips_to_frame_edges():
+    boxes = np.array([[-20, -10, 100, 90], [550, 400, 700, 520]])
+    out, _ = postprocess_boxes(boxes, np.array([0.9, 0.8]), width=640, height=480)
+    assert out.tolist() == [[0, 0, 100, 90], [550, 400, 639, 479]]
+
+def test_postprocess_does_not_modify_caller_boxes():
+    boxes = np.array([[-20, -10, 700, 520]], dtype=int)
+    original = boxes.copy()
+    postprocess_boxes(boxes, np.array([0.9]), width=640, height=480)
+    assert np.array_equal(boxes, original)
+
+def test_postprocess_drops_small_and_degenerate_boxes():
+    boxes = np.array([
+        [0, 0, 50, 50],
+        [100, 100, 115, 160],   # 15 px de ancho
+        [700, 10, 800, 60],     # fuera del frame: degenerada tras recortar
+        [200, 200, 200, 260]    # ancho cero
+    ])
+    out, scores = postprocess_boxes(boxes, np.array([0.5, 0.9, 0.9, 0.9]), 640, 480, min_face_size=20)
+    assert out.tolist() == [[0, 0, 50, 50]]
+    assert scores.tolist() == [0.5]
+
+def test_postprocess_limits_faces_keeping_the_best():
+    boxes = np.array([[i * 60, 0, i * 60 + 50, 50] for i in range(5)])
+    scores = np.array([0.1, 0.5, 0.3, 0.9, 0.7])
+    out, kept_scores = postprocess_boxes(boxes, scores, 640, 480, max_faces=3)
+    assert kept_scores.tolist() == [0.9, 0.7, 0.5]
+    assert out[:, 0].tolist() == [180, 240, 60]
+
+def test_postprocess_detections_applies_threshold_and_scales():
+    detections = np.array([[[
+        [0, 1, 0.9, 0.25, 0.25, 0.5, 0.5],
+        [0, 1, 0.3, 0.0, 0.0, 0.5, 0.5]
+    ]]], dtype=np.float32)
+    boxes, scores = postprocess_detections(detections, 400, 200, confidence_threshold=0.4)
+    assert boxes.tolist() == [[100, 50, 200, 100]]
+    assert scores.tolist() == [np.float32(0.9)]
+
+def test_postprocess_empty_input():
+    boxes, scores = postprocess_boxes(np.empty((0, 4)), np.empty(0), 640, 480)
+    assert boxes.shape == (0, 4) and scores.shape == (0,)
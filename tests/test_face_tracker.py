@@ -0,0 +1,62 @@
+## @file tests/test_face_tracker.py
+
+import pytest
+from app.services.face_tracker import FaceTracker, iou_matrix
+
+SCORES_JOY = {"joy": 0.8, "sadness": 0.2}
+SCORES_SAD = {"joy": 0.1, "sadness": 0.9}
+
+def _classify_all(tracker, boxes, scores=SCORES_JOY):
+    tracks, to_classify = tracker.update(boxes)
+    for i in to_classify:
+        tracker.observe(tracks[i], scores)
+    return tracks, to_classify
+
+def test_iou_matrix():
+    ious = iou_matrix([(0, 0, 10, 10)], [(0, 0, 10, 10), (5, 0, 15, 10), (20, 20, 30, 30)])
+    assert ious[0].tolist() == pytest.approx([1.0, 1 / 3, 0.0])
+    assert iou_matrix([], [(0, 0, 1, 1)]).shape == (0, 1)
+
+def test_new_faces_are_classified_and_static_faces_reused():
+    tracker = FaceTracker(refresh_frames=10)
+    first, to_classify = _classify_all(tracker, [(0, 0, 100, 100), (200, 0, 300, 100)])
+    assert to_classify == [0, 1]
+
+    # Mismas caras con un desplazamiento mínimo: mismo id y sin clasificar
+    second, to_classify = tracker.update([(202, 1, 302, 101), (1, 1, 101, 101)])
+    assert to_classify == []
+    assert [t.track_id for t in second] == [first[1].track_id, first[0].track_id]
+    assert tracker.stats()["reused"] == 2
+
+def test_moved_face_is_reclassified():
+    tracker = FaceTracker(reclassify_iou=0.6, iou_threshold=0.3)
+    first, _ = _classify_all(tracker, [(0, 0, 100, 100)])
+    tracks, to_classify = tracker.update([(30, 0, 130, 100)])   # IoU ~0.54
+    assert tracks[0] is first[0]
+    assert to_classify == [0]
+
+def test_periodic_refresh():
+    tracker = FaceTracker(refresh_frames=3)
+    _classify_all(tracker, [(0, 0, 100, 100)])
+    needs = [tracker.update([(0, 0, 100, 100)])[1] for _ in range(3)]
+    assert needs == [[], [], [0]]
+
+def test_lost_track_expires_after_max_misses():
+    tracker = FaceTracker(max_misses=2)
+    first, _ = _classify_all(tracker, [(0, 0, 100, 100)])
+    tracker.update([])
+    tracker.update([])
+    assert tracker.stats()["active_tracks"] == 1
+    tracker.update([])
+    assert tracker.stats()["active_tracks"] == 0
+
+    tracks, to_classify = tracker.update([(0, 0, 100, 100)])
+    assert tracks[0].track_id != first[0].track_id
+    assert to_classify == [0]
+
+def test_observe_smooths_scores():
+    tracker = FaceTracker(smoothing=0.5)
+    tracks, _ = _classify_all(tracker, [(0, 0, 100, 100)], SCORES_JOY)
+    tracker.observe(tracks[0], SCORES_SAD)
+    assert tracks[0].scores == pytest.approx({"joy": 0.45, "sadness": 0.55})
+    assert tracks[0].dominant_emotion == "sadness"
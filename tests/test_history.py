@@ -0,0 +1,88 @@
+## @file tests/test_history.py
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.routes import history_router
+from app.schemas.api.history import HistoryRecordCreate
+from app.services.emotion_rollups import emotion_rollups
+from app.services.history_repository import InMemoryHistoryRepository
+from app.services.sqlite_history_repository import SQLiteHistoryRepository
+
+BASE = datetime(2024, 1, 1, 12, 0, 0)
+
+def _record(minute: int, detection_type: str = "image") -> HistoryRecordCreate:
+    return HistoryRecordCreate(
+        timestamp=BASE + timedelta(minutes=minute),
+        dominant_emotion="joy",
+        emotion_scores={"joy": 1.0},
+        detection_type=detection_type
+    )
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo(request, tmp_path):
+    if request.param == "memory":
+        repository = InMemoryHistoryRepository(max_records=1000, retention_days=0)
+    else:
+        repository = SQLiteHistoryRepository(str(tmp_path / "history.sqlite3"))
+    asyncio.run(repository.create_records([_record(minute) for minute in range(5)]))
+    yield repository
+    asyncio.run(repository.close())
+    emotion_rollups.clear()
+
+async def _collect(iterator):
+    return [record async for record in iterator]
+
+@pytest.mark.parametrize("tzinfo", [None, timezone.utc, timezone(timedelta(hours=2))])
+def test_iter_records_accepts_naive_and_aware_bounds(repo, tzinfo):
+    start = BASE + timedelta(minutes=1)
+    end = BASE + timedelta(minutes=3)
+    if tzinfo is not None:
+        # Mismo instante expresado en otra zona horaria
+        start = start.replace(tzinfo=timezone.utc).astimezone(tzinfo)
+        end = end.replace(tzinfo=timezone.utc).astimezone(tzinfo)
+
+    records = asyncio.run(_collect(repo.iter_records(start=start, end=end)))
+    assert [record.timestamp for record in records] == [BASE + timedelta(minutes=1), BASE + timedelta(minutes=2)]
+
+def test_get_history_without_page_or_cursor_returns_first_page(repo):
+    records = asyncio.run(repo.get_history(per_page=2))
+    assert [record.timestamp.minute for record in records] == [4, 3]
+
+def test_cursor_pages_match_offset_pages(repo):
+    by_offset = [asyncio.run(repo.get_history(page=page, per_page=2)) for page in (1, 2, 3)]
+    by_cursor = [asyncio.run(repo.get_history(per_page=2))]
+    while len(by_cursor) < 3:
+        by_cursor.append(asyncio.run(repo.get_history(per_page=2, cursor=by_cursor[-1][-1].id)))
+
+    assert [[r.id for r in page] for page in by_cursor] == [[r.id for r in page] for page in by_offset]
+    assert [len(page) for page in by_cursor] == [2, 2, 1]
+    assert asyncio.run(repo.get_history(per_page=2, cursor="no-existe")) == []
+
+@pytest.mark.parametrize("per_page, pages", [(2, [2, 2, 1]), (5, [5]), (1, [1, 1, 1, 1, 1])])
+def test_read_history_next_cursor(repo, monkeypatch, per_page, pages):
+    monkeypatch.setattr(history_router, "history_repo", repo)
+    sizes, cursor = [], None
+    while True:
+        body = json.loads(asyncio.run(history_router.read_history(
+            page=None, per_page=per_page, detection_type=None, cursor=cursor
+        )).body)
+        sizes.append(len(body["records"]))
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    # Una última página exacta no anuncia una página siguiente vacía
+    assert sizes == pages
+
+def test_read_history_offset_pages_report_next_cursor(repo, monkeypatch):
+    monkeypatch.setattr(history_router, "history_repo", repo)
+
+    def read(page):
+        return json.loads(asyncio.run(history_router.read_history(
+            page=page, per_page=5 if page == 1 else 2, detection_type=None, cursor=None
+        )).body)
+
+    assert read(1)["next_cursor"] is None
+    assert read(2)["next_cursor"] is not None
+    assert read(3)["next_cursor"] is None
@@ -0,0 +1,50 @@
+## @file tests/test_history_writer.py
+
+import asyncio
+import logging
+import numpy as np
+from app.schemas.core import DetectionType
+from app.services import history_writer as history_writer_module
+from app.services.emotion_rollups import emotion_rollups
+from app.services.history_repository import InMemoryHistoryRepository
+from app.services.history_writer import HistoryJob, HistoryWriter
+from app.services.snapshot_store import snapshot_store
+
+SCORES = {"joy": 0.9, "neutral": 0.1}
+
+def test_failures_are_isolated_per_job(monkeypatch, caplog):
+    repo = InMemoryHistoryRepository(max_records=100, retention_days=0)
+    monkeypatch.setattr(history_writer_module, "history_repo", repo)
+
+    broken_frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    put_frame = snapshot_store.put_frame
+
+    async def flaky_put_frame(frame):
+        if frame is broken_frame:
+            raise OSError("disco lleno")
+        return await put_frame(frame)
+
+    monkeypatch.setattr(snapshot_store, "put_frame", flaky_put_frame)
+    writer = HistoryWriter(enabled=False)
+    batch = [
+        HistoryJob(DetectionType.IMAGE, [("joy", SCORES)], frame=np.full((8, 8, 3), 90, dtype=np.uint8)),
+        HistoryJob(DetectionType.IMAGE, [("no-es-una-emocion", SCORES)]),
+        HistoryJob(DetectionType.VIDEO, [("joy", SCORES), ("joy", SCORES)], frame=broken_frame)
+    ]
+    with caplog.at_level(logging.ERROR, logger=history_writer_module.__name__):
+        asyncio.run(writer._write(batch))
+
+    records = asyncio.run(repo.get_history(per_page=None))
+    try:
+        # El registro inválido se pierde; el snapshot fallido solo deja sin imagen a su trabajo
+        assert [(r.detection_type, r.snapshot_id is not None) for r in records] == [
+            (DetectionType.VIDEO, False),
+            (DetectionType.VIDEO, False),
+            (DetectionType.IMAGE, True)
+        ]
+        assert writer.written == 3 and writer.errors == 1
+        assert all(record.exc_info is not None for record in caplog.records)
+        assert "disco lleno" in caplog.text
+    finally:
+        asyncio.run(repo.clear_history())
+        emotion_rollups.clear()
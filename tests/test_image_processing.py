@@ -0,0 +1,98 @@
+## @file tests/test_image_processing.py
+
+import cv2
+import numpy as np
+import pytest
+from app.models.emotion_model import EMOTION_MAPPING, EmotionModel
+from app.models.face_detectors import SSDFaceDetector
+from benchmarks.stubs import StubClassifier
+
+WIDTH, HEIGHT = 640, 480
+
+# Salida cruda (1, 1, K, 7) de la SSD: [_, _, confianza, Xi, Yi, Xf, Yf] normalizados
+RAW_DETECTIONS = np.array([[[
+    [0, 1, 0.90, 0.10, 0.10, 0.30, 0.40],
+    [0, 1, 0.30, 0.50, 0.50, 0.70, 0.80],  # por debajo del umbral
+    [0, 1, 0.80, 1.20, 0.10, 1.40, 0.30],  # fuera del frame: recorte vacío
+    [0, 1, 0.70, 0.60, 0.50, 1.10, 0.95],  # se sale por la derecha
+    [0, 1, 0.95, 0.375, 0.05, 0.55, 0.35]
+]]], dtype=np.float32)
+
+class FakeNet:
+    def __init__(self, detections):
+        self.detections = detections
+
+    def setInput(self, blob):
+        pass
+
+    def forward(self):
+        return self.detections
+
+@pytest.fixture
+def frame():
+    return np.random.default_rng(0).integers(0, 255, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+@pytest.fixture
+def model(monkeypatch):
+    monkeypatch.setattr(cv2.dnn, "readNet", lambda *args: FakeNet(RAW_DETECTIONS))
+    return EmotionModel(
+        classifier=StubClassifier(),
+        detectors={"ssd": SSDFaceDetector(confidence_threshold=0.4)},
+        default_detector="ssd"
+    )
+
+def per_face_predictions(frame, detections, classifier, classes):
+    """Ruta original: una pasada del clasificador por cada cara por encima del umbral"""
+    (h, w) = frame.shape[:2]
+    faces = []
+    for i in range(detections.shape[2]):
+        confidence = detections[0, 0, i, 2]
+        if confidence > 0.4:
+            box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
+            (Xi, Yi, Xf, Yf) = box.astype("int")
+            Xi, Yi = max(0, Xi), max(0, Yi)
+            Xf, Yf = min(w - 1, Xf), min(h - 1, Yf)
+
+            face = frame[Yi:Yf, Xi:Xf]
+            if face.size == 0:
+                continue
+            face = cv2.cvtColor(face, cv2.COLOR_BGR2RGB)
+            face = cv2.resize(face, (224, 224)).astype(np.float32)
+            face = np.expand_dims(face, axis=0) / 255.0
+            pred = classifier.predict(face)[0]
+
+            scores = {EMOTION_MAPPING[classes[j]]: float(pred[j]) for j in range(len(classes))}
+            total = sum(scores.values())
+            faces.append({
+                "box": {"x": Xi, "y": Yi, "width": Xf - Xi, "height": Yf - Yi},
+                "scores": {k: v / total for k, v in scores.items()},
+                "dominant_emotion": EMOTION_MAPPING[classes[int(np.argmax(pred))]]
+            })
+    return faces
+
+def _by_box(faces):
+    return {tuple(face["box"].values()): face for face in faces}
+
+def test_batched_predict_emotion_matches_per_face_path(model, frame):
+    expected = _by_box(per_face_predictions(frame, RAW_DETECTIONS, model.classifier, model.classes))
+    actual = _by_box(model.predict_emotion(frame))
+
+    # Se descartan la cara bajo el umbral y la de recorte vacío
+    assert len(expected) == 3
+    assert actual.keys() == expected.keys()
+    for box, face in actual.items():
+        assert face["dominant_emotion"] == expected[box]["dominant_emotion"]
+        assert face["scores"].keys() == expected[box]["scores"].keys()
+        for label, score in face["scores"].items():
+            assert score == pytest.approx(expected[box]["scores"][label], abs=1e-5)
+
+def test_predict_emotion_orders_by_confidence(model, frame):
+    faces = model.predict_emotion(frame)
+    assert [face["box"]["x"] for face in faces] == [240, 64, 384]
+
+def test_predict_emotion_without_faces(monkeypatch, frame):
+    empty = RAW_DETECTIONS.copy()
+    empty[..., 2] = 0.1
+    monkeypatch.setattr(cv2.dnn, "readNet", lambda *args: FakeNet(empty))
+    model = EmotionModel(classifier=StubClassifier(), detectors={"ssd": SSDFaceDetector()}, default_detector="ssd")
+    assert model.predict_emotion(frame) == []
@@ -0,0 +1,68 @@
+## @file tests/test_inference_gate.py
+
+import asyncio
+from app.services.inference_gate import FairInferenceGate
+
+async def _use(gate, key, order, hold=0.0):
+    async with gate.slot(key):
+        order.append(key)
+        await asyncio.sleep(hold)
+
+def test_busy_key_does_not_starve_the_others():
+    gate = FairInferenceGate(max_concurrent=1)
+    order = []
+
+    async def scenario():
+        async with gate.slot("init"):
+            tasks = [asyncio.ensure_future(_use(gate, "a", order)) for _ in range(4)]
+            tasks += [asyncio.ensure_future(_use(gate, key, order)) for key in ("b", "c")]
+            await asyncio.sleep(0)
+            assert gate.stats()["waiting"] == {"a": 4, "b": 1, "c": 1}
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    # Por turnos: la fuente con más peticiones no acapara los huecos
+    assert order == ["a", "b", "c", "a", "a", "a"]
+    assert gate.stats()["granted"] == {"init": 1, "a": 4, "b": 1, "c": 1}
+
+def test_concurrency_is_bounded():
+    gate = FairInferenceGate(max_concurrent=2)
+    peak = 0
+
+    async def work(key):
+        nonlocal peak
+        async with gate.slot(key):
+            peak = max(peak, gate.stats()["active"])
+            await asyncio.sleep(0.005)
+
+    async def scenario():
+        await asyncio.gather(*(work(f"src{i % 3}") for i in range(12)))
+
+    asyncio.run(scenario())
+    assert peak == 2
+    assert gate.stats()["active"] == 0 and gate.stats()["waiting"] == {}
+
+def test_cancelled_waiters_do_not_leak_slots():
+    gate = FairInferenceGate(max_concurrent=1)
+    order = []
+
+    async def scenario():
+        async with gate.slot("init"):
+            cancelled = asyncio.ensure_future(_use(gate, "a", order))
+            kept = asyncio.ensure_future(_use(gate, "b", order))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+        await kept
+
+        # Cancelada justo después de recibir el hueco: lo cede al siguiente
+        async with gate.slot("init"):
+            granted = asyncio.ensure_future(_use(gate, "c", order))
+            waiting = asyncio.ensure_future(_use(gate, "d", order))
+            await asyncio.sleep(0)
+        granted.cancel()
+        await asyncio.gather(granted, waiting, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert order == ["b", "d"]
+    assert gate.stats()["active"] == 0
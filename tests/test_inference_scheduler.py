@@ -0,0 +1,120 @@
+## @file tests/test_inference_scheduler.py
+
+import asyncio
+import numpy as np
+import pytest
+from app.services.inference_scheduler import InferenceScheduler
+
+class RecordingModel:
+    """Devuelve en cada fila el valor con el que se rellenó la cara y anota los lotes"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    def classify_faces(self, faces: np.ndarray) -> np.ndarray:
+        self.batches.append(len(faces))
+        if self.fail:
+            raise RuntimeError("fallo del modelo")
+        return np.repeat(faces[:, :1, 0, 0], 7, axis=1)
+
+def faces(n: int, value: float) -> np.ndarray:
+    return np.full((n, 2, 2, 3), value, dtype=np.float32)
+
+async def _with_scheduler(scheduler, coro):
+    scheduler.start()
+    try:
+        return await asyncio.wait_for(coro, 5)
+    finally:
+        await scheduler.stop()
+
+def test_flushes_when_batch_is_full():
+    model = RecordingModel()
+    scheduler = InferenceScheduler(max_batch_size=4, max_wait_ms=10_000)
+
+    async def scenario():
+        return await asyncio.gather(
+            scheduler.classify(model, faces(2, 1.0)),
+            scheduler.classify(model, faces(2, 2.0))
+        )
+
+    first, second = asyncio.run(_with_scheduler(scheduler, scenario()))
+    # Un solo lote y cada petición recibe sus propias filas
+    assert model.batches == [4]
+    assert first.shape == (2, 7) and np.all(first == 1.0)
+    assert second.shape == (2, 7) and np.all(second == 2.0)
+    assert scheduler.stats()["batch_fill_ratio"] == 1.0
+
+def test_flushes_partial_batch_after_max_wait():
+    model = RecordingModel()
+    scheduler = InferenceScheduler(max_batch_size=32, max_wait_ms=20)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        preds = await scheduler.classify(model, faces(1, 3.0))
+        return preds, loop.time() - started
+
+    preds, elapsed = asyncio.run(_with_scheduler(scheduler, scenario()))
+    assert model.batches == [1]
+    assert np.all(preds == 3.0)
+    assert elapsed >= 0.015
+
+def test_requests_are_not_split_across_batches():
+    model = RecordingModel()
+    scheduler = InferenceScheduler(max_batch_size=4, max_wait_ms=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            scheduler.classify(model, faces(3, 1.0)),
+            scheduler.classify(model, faces(3, 2.0))
+        )
+
+    first, second = asyncio.run(_with_scheduler(scheduler, scenario()))
+    assert model.batches == [3, 3]
+    assert np.all(first == 1.0) and np.all(second == 2.0)
+
+def test_cancelled_request_is_skipped():
+    model = RecordingModel()
+    scheduler = InferenceScheduler(max_batch_size=32, max_wait_ms=50)
+
+    async def scenario():
+        cancelled = asyncio.ensure_future(scheduler.classify(model, faces(2, 1.0)))
+        kept = asyncio.ensure_future(scheduler.classify(model, faces(1, 2.0)))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await kept
+
+    preds = asyncio.run(_with_scheduler(scheduler, scenario()))
+    assert model.batches == [1]
+    assert np.all(preds == 2.0)
+
+def test_model_error_fails_every_request_in_the_batch():
+    model = RecordingModel(fail=True)
+    scheduler = InferenceScheduler(max_batch_size=4, max_wait_ms=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            scheduler.classify(model, faces(1, 1.0)),
+            scheduler.classify(model, faces(1, 2.0)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(_with_scheduler(scheduler, scenario()))
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert scheduler.stats()["errors"] == 1
+
+def test_stop_fails_pending_requests():
+    model = RecordingModel()
+    scheduler = InferenceScheduler(max_batch_size=32, max_wait_ms=10_000)
+
+    async def scenario():
+        scheduler.start()
+        pending = asyncio.ensure_future(scheduler.classify(model, faces(1, 1.0)))
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+        with pytest.raises(RuntimeError):
+            await pending
+
+    asyncio.run(scenario())
+    assert model.batches == []
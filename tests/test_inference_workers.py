@@ -0,0 +1,112 @@
+## @file tests/test_inference_workers.py
+
+import asyncio
+import queue
+import threading
+from collections import OrderedDict
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+from app.services import inference_workers as workers
+from app.services.inference_workers import InferenceWorkerPool
+
+class FakeModel:
+    loaded = []
+
+    def __init__(self, model_path: str, version: str):
+        self.model_path = model_path
+        self.version = version
+        self.from_files = True
+        self.warm = False
+        FakeModel.loaded.append(model_path)
+
+    def warmup(self):
+        self.warm = True
+
+def test_worker_keeps_two_warm_models(monkeypatch):
+    monkeypatch.setattr(workers, "EmotionModel", FakeModel)
+    FakeModel.loaded = []
+    models = OrderedDict()
+
+    old = workers._worker_model(models, "old.keras", "v1")
+    new = workers._worker_model(models, "new.keras", "v2")
+    # Tareas de ambas versiones intercaladas durante el cambio: sin recargas
+    for _ in range(3):
+        assert workers._worker_model(models, "old.keras", "v1") is old
+        assert workers._worker_model(models, "new.keras", "v2") is new
+    assert FakeModel.loaded == ["old.keras", "new.keras"]
+    assert old.warm and new.warm
+
+    workers._worker_model(models, "newest.keras", "v3")
+    assert list(models) == ["new.keras", "newest.keras"]
+
+class FakeSlot:
+    name = "slot-0"
+
+    def __init__(self, size: int):
+        self.buf = bytearray(size)
+
+class FailingQueue:
+    def put(self, task):
+        raise OSError("cola cerrada")
+
+def test_run_releases_slot_when_submission_fails():
+    pool = InferenceWorkerPool(num_workers=1, num_slots=1, slot_bytes=1024)
+
+    async def scenario():
+        pool._running = True
+        pool._slots = [FakeSlot(1024)]
+        pool._task_queues = [FailingQueue()]
+        pool._free_slots = asyncio.Queue()
+        pool._free_slots.put_nowait(0)
+        model = FakeModel("model.keras", "v1")
+        with pytest.raises(OSError):
+            await pool.run("locate", np.zeros((8, 8, 3), dtype=np.uint8), model)
+        return pool._free_slots.qsize()
+
+    assert asyncio.run(scenario()) == 1
+    assert pool._inflight == {}
+
+class FailingModel(FakeModel):
+    def predict_emotion(self, frame, detector=None):
+        if detector == "bogus":
+            raise ValueError(f"Detector de rostros no válido: {detector}")
+        raise KeyError("fallo interno")
+
+def test_worker_errors_keep_their_type(monkeypatch):
+    # El bucle del worker y el recolector en hilos, con colas y bloques reales del pool
+    monkeypatch.setattr(workers, "EmotionModel", FailingModel)
+    pool = InferenceWorkerPool(num_workers=1, num_slots=1, slot_bytes=1024)
+    task_queue, pool._result_queue = queue.Queue(), queue.Queue()
+    pool._task_queues = [task_queue]
+    pool._processes = [None]
+    pool._slots = [shared_memory.SharedMemory(create=True, size=pool.slot_bytes)]
+    worker = threading.Thread(
+        target=workers._worker_main, args=(0, task_queue, pool._result_queue, "model.keras", "v1")
+    )
+    worker.start()
+    collector = threading.Thread(target=pool._collect_results)
+    collector.start()
+    model = FailingModel("model.keras", "v1")
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+
+    async def scenario():
+        pool._running = True
+        pool._free_slots = asyncio.Queue()
+        pool._free_slots.put_nowait(0)
+        with pytest.raises(ValueError, match="no válido: bogus"):
+            await pool.predict_emotion(frame, model, "bogus")
+        with pytest.raises(RuntimeError, match="KeyError"):
+            await pool.predict_emotion(frame, model, "ssd")
+        return pool._free_slots.qsize()
+
+    try:
+        assert asyncio.run(scenario()) == 1
+    finally:
+        task_queue.put(None)
+        pool._result_queue.put(None)
+        worker.join(5)
+        collector.join(5)
+        for shm in pool._slots:
+            shm.close()
+            shm.unlink()
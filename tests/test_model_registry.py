@@ -0,0 +1,40 @@
+## @file tests/test_model_registry.py
+
+import asyncio
+import os
+import pytest
+from fastapi import HTTPException
+from app.models.model_registry import model_registry, resolve_model_path
+from app.routes.model_router import reload_model
+from app.schemas.api.models import ModelReloadRequest
+
+def test_resolve_model_path_inside_dir(tmp_path):
+    model_file = tmp_path / "v2" / "model.keras"
+    model_file.parent.mkdir()
+    model_file.touch()
+    assert resolve_model_path(str(model_file), str(tmp_path)) == os.path.realpath(model_file)
+
+@pytest.mark.parametrize("model_path", ["/etc/passwd", "../outside.keras", "{root}/../outside.keras"])
+def test_resolve_model_path_rejects_outside_dir(tmp_path, model_path):
+    root = tmp_path / "models"
+    root.mkdir()
+    with pytest.raises(PermissionError):
+        resolve_model_path(model_path.format(root=root), str(root))
+
+def test_resolve_model_path_rejects_symlink_escape(tmp_path):
+    root = tmp_path / "models"
+    root.mkdir()
+    (tmp_path / "evil.keras").touch()
+    (root / "link.keras").symlink_to(tmp_path / "evil.keras")
+    with pytest.raises(PermissionError):
+        resolve_model_path(str(root / "link.keras"), str(root))
+
+def test_reload_rejects_path_outside_models_dir(monkeypatch):
+    def fail_swap(*args, **kwargs):
+        raise AssertionError("no se debe cargar un modelo fuera del directorio")
+
+    monkeypatch.setattr(model_registry, "swap", fail_swap)
+    request = ModelReloadRequest(model_path="/etc/passwd", version="evil")
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(reload_model(request))
+    assert exc_info.value.status_code == 403
@@ -0,0 +1,48 @@
+## @file tests/test_motion_gate.py
+
+import numpy as np
+from app.services import motion_gate
+from app.services.motion_gate import MotionGate
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((240, 320, 3), value, dtype=np.uint8)
+
+def test_static_scene_reuses_result():
+    gate = MotionGate(threshold=4.0, max_age_s=60)
+    signature = gate.signature(_frame(100))
+    assert gate.lookup(signature) is None
+
+    result = {"faces": []}
+    gate.store(signature, result)
+    assert gate.lookup(gate.signature(_frame(102))) is result
+    assert gate.stats()["hits"] == 1 and gate.stats()["misses"] == 1
+
+def test_scene_change_misses():
+    gate = MotionGate(threshold=4.0, max_age_s=60)
+    gate.store(gate.signature(_frame(100)), {"faces": []})
+    assert gate.lookup(gate.signature(_frame(140))) is None
+
+def test_slow_drift_is_measured_against_inferred_frame():
+    gate = MotionGate(threshold=4.0, max_age_s=60)
+    gate.store(gate.signature(_frame(100)), {"faces": []})
+    # Cada paso es pequeño, pero la distancia se mide contra el frame inferido
+    hits = [gate.lookup(gate.signature(_frame(100 + step))) is not None for step in range(0, 10, 2)]
+    assert hits == [True, True, True, False, False]
+
+def test_result_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(motion_gate.time, "monotonic", lambda: now[0])
+    gate = MotionGate(threshold=4.0, max_age_s=5)
+    signature = gate.signature(_frame(100))
+    gate.store(signature, {"faces": []})
+    now[0] += 4
+    assert gate.lookup(signature) is not None
+    now[0] += 2
+    assert gate.lookup(signature) is None
+
+def test_reset_forgets_result():
+    gate = MotionGate(threshold=4.0, max_age_s=60)
+    gate.store(gate.signature(_frame(100)), {"faces": []})
+    gate.reset()
+    assert gate.lookup(gate.signature(_frame(100))) is None
+    assert gate.stats()["hit_ratio"] == 0.0
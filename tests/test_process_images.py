@@ -0,0 +1,71 @@
+## @file tests/test_process_images.py
+
+import asyncio
+import io
+import json
+import zipfile
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from app.routes import image_processing_router
+from app.routes.image_processing_router import process_images_route
+from benchmarks.stubs import StubEmotionModel
+from benchmarks.synthetic import synthetic_jpeg
+
+SMALL = synthetic_jpeg(320, 240, faces=1)
+LARGE = synthetic_jpeg(1280, 960, faces=1)
+
+class RecordingFile(io.BytesIO):
+    """Anota el tamaño de cada lectura para comprobar que no se lee el fichero entero"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return super().read(size)
+
+def _upload(filename: str, data: bytes, content_type: str = "image/jpeg") -> UploadFile:
+    return UploadFile(
+        RecordingFile(data),
+        filename=filename,
+        headers=Headers({"content-type": content_type})
+    )
+
+def _zip(entries) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+async def _lines(response):
+    return [json.loads(line) async for line in response.body_iterator]
+
+def test_process_images_streams_results_and_enforces_size_limit(monkeypatch):
+    limit = len(SMALL) + 10
+    assert len(LARGE) > limit
+    monkeypatch.setattr(image_processing_router, "BATCH_MAX_IMAGE_BYTES", limit)
+
+    large = _upload("grande.jpg", LARGE)
+    files = [
+        _upload("pequeña.jpg", SMALL),
+        large,
+        _upload("lote.zip", _zip([("a.jpg", SMALL), ("b.jpg", LARGE), ("notas.txt", b"x")]), "application/zip")
+    ]
+
+    async def scenario():
+        response = await process_images_route(files, StubEmotionModel(), detector=None)
+        return await _lines(response)
+
+    lines = {line["filename"]: line for line in asyncio.run(scenario())}
+    assert set(lines) == {"pequeña.jpg", "grande.jpg", "a.jpg", "b.jpg"}
+    assert sorted(line["index"] for line in lines.values()) == [0, 1, 2, 3]
+    for name in ("pequeña.jpg", "a.jpg"):
+        assert lines[name]["error"] is None
+        assert len(lines[name]["result"]["detections"]) == 1
+    for name in ("grande.jpg", "b.jpg"):
+        assert lines[name]["result"] is None and "tamaño máximo" in lines[name]["error"]
+
+    # El fichero que no es zip nunca se lee más allá del límite
+    assert large.file.reads == [limit + 1]
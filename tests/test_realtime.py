@@ -0,0 +1,49 @@
+## @file tests/test_realtime.py
+
+import asyncio
+from app.services import realtime_service
+from app.services.realtime_service import RealtimeManager
+from benchmarks.stubs import StubEmotionModel
+
+class FakeWebSocket:
+    """Acepta tras ceder el control al event loop y se desconecta al recibir"""
+
+    def __init__(self):
+        self.accepted = False
+        self.close_code = None
+
+    async def accept(self):
+        await asyncio.sleep(0.01)
+        self.accepted = True
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+    async def receive(self):
+        await asyncio.sleep(0.01)
+        return {"type": "websocket.disconnect"}
+
+def test_concurrent_connections_respect_the_limit(monkeypatch):
+    model = StubEmotionModel()
+    monkeypatch.setattr(realtime_service, "get_emotion_model", lambda: model)
+    manager = RealtimeManager(max_connections=2)
+    sockets = [FakeWebSocket() for _ in range(5)]
+
+    async def scenario():
+        await asyncio.gather(*(manager.handle(websocket) for websocket in sockets))
+
+    asyncio.run(scenario())
+    assert sum(websocket.accepted for websocket in sockets) == 2
+    assert [websocket.close_code for websocket in sockets].count(1013) == 3
+    assert manager.stats()["rejected"] == 3
+    assert manager.stats()["connections"] == 0
+
+def test_invalid_detector_is_rejected_without_reserving(monkeypatch):
+    model = StubEmotionModel()
+    monkeypatch.setattr(realtime_service, "get_emotion_model", lambda: model)
+    manager = RealtimeManager(max_connections=1)
+    websocket = FakeWebSocket()
+
+    asyncio.run(manager.handle(websocket, detector="no-existe"))
+    assert websocket.close_code == 1008 and not websocket.accepted
+    assert manager.stats()["connections"] == 0
@@ -0,0 +1,44 @@
+## @file tests/test_result_cache.py
+
+import asyncio
+from app.services import image_processing_service, result_cache
+from app.services.image_processing_service import process_image
+from app.services.result_cache import ResultCache
+from benchmarks.stubs import StubEmotionModel
+from benchmarks.synthetic import synthetic_jpeg
+
+def test_reloaded_weights_do_not_reuse_cached_results(monkeypatch):
+    cache = ResultCache(enabled=True, max_entries=8, disk_dir="")
+    monkeypatch.setattr(image_processing_service, "result_cache", cache)
+    image = synthetic_jpeg()
+
+    old = StubEmotionModel(version="v1", model_path="models/a.keras")
+    asyncio.run(process_image(image, old))
+    asyncio.run(process_image(image, old))
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Misma versión recargada desde otro fichero: la entrada anterior no vale
+    new = StubEmotionModel(version="v1", model_path="models/b.keras")
+    asyncio.run(process_image(image, new))
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_disk_tier_round_trip_with_model_path(tmp_path):
+    writer = ResultCache(enabled=True, max_entries=8, disk_dir=str(tmp_path))
+    key = asyncio.run(writer.key(b"imagen", "v1@models/RESNET50/model.keras+ssd"))
+    asyncio.run(writer.put(key, {"faces": [], "frameInfo": {"height": 1}}))
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"{key}.json"]
+
+    # Otra instancia (p. ej. tras reiniciar) solo puede acertar desde el disco
+    reader = ResultCache(enabled=True, max_entries=8, disk_dir=str(tmp_path))
+    assert asyncio.run(reader.get(key)) == {"faces": [], "frameInfo": {"height": 1}}
+    assert reader.disk_hits == 1
+
+def test_failed_disk_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache = ResultCache(enabled=True, max_entries=8, disk_dir=str(tmp_path))
+
+    def fail_replace(src, dst):
+        raise OSError("sin espacio")
+
+    monkeypatch.setattr(result_cache.os, "replace", fail_replace)
+    asyncio.run(cache.put("clave", {"faces": []}))
+    assert list(tmp_path.iterdir()) == []
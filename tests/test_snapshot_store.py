@@ -0,0 +1,56 @@
+## @file tests/test_snapshot_store.py
+
+import asyncio
+import numpy as np
+from app.schemas.core import DetectionType
+from app.services import history_writer as history_writer_module
+from app.services.emotion_rollups import emotion_rollups
+from app.services.history_repository import InMemoryHistoryRepository
+from app.services.history_writer import HistoryJob, HistoryWriter
+from app.services.snapshot_store import SnapshotStore, encode_snapshot, snapshot_store
+
+SCORES = {"joy": 0.7, "neutral": 0.3}
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((32, 32, 3), value, dtype=np.uint8)
+
+def test_identical_frames_are_stored_once():
+    store = SnapshotStore()
+    first = store.put_encoded(encode_snapshot(_frame(10)))
+    second = store.put_encoded(encode_snapshot(_frame(10)))
+    other = store.put_encoded(encode_snapshot(_frame(200)))
+
+    assert first == second != other
+    assert store.stats()["entries"] == 2 and store.stats()["deduplicated"] == 1
+
+    # Cada put toma una referencia: el snapshot vive hasta la última liberación
+    store.release(first)
+    assert store.get(first) is not None
+    store.release(first)
+    assert store.get(first) is None
+    assert not store.acquire(first)
+
+def test_snapshots_are_released_with_their_history_records(monkeypatch):
+    repo = InMemoryHistoryRepository(max_records=2, retention_days=0)
+    monkeypatch.setattr(history_writer_module, "history_repo", repo)
+    writer = HistoryWriter(enabled=False)
+
+    async def write(value):
+        # Dos caras del mismo frame comparten un único snapshot
+        await writer.submit(HistoryJob(DetectionType.VIDEO, [("joy", SCORES)] * 2, frame=_frame(value)))
+        return (await repo.get_history(per_page=1))[0].snapshot_id
+
+    try:
+        first = asyncio.run(write(50))
+        assert snapshot_store.get(first) is not None
+
+        # El límite de registros expulsa los dos registros del primer frame y su snapshot
+        second = asyncio.run(write(150))
+        assert snapshot_store.get(first) is None
+        assert snapshot_store.get(second) is not None
+
+        asyncio.run(repo.clear_history())
+        assert snapshot_store.get(second) is None
+    finally:
+        asyncio.run(repo.clear_history())
+        emotion_rollups.clear()
@@ -0,0 +1,75 @@
+## @file tests/test_video_analysis.py
+
+import asyncio
+import os
+import threading
+import time
+import cv2
+import pytest
+from app.services import video_analysis_service as service
+from app.services.video_analysis_service import VideoReader, analyze_video
+from benchmarks.synthetic import synthetic_frame
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (160, 120))
+    for i in range(20):
+        writer.write(synthetic_frame(160, 120, 1, seed=i)[0])
+    writer.release()
+    return path
+
+def test_close_waits_for_inflight_read(monkeypatch, video_path):
+    events = []
+    read_started = threading.Event()
+
+    def slow_read(cap, skip):
+        read_started.set()
+        time.sleep(0.2)
+        events.append(("read", cap.isOpened()))
+        return None
+
+    monkeypatch.setattr(service, "_read_sampled_frame", slow_read)
+    reader = VideoReader(video_path)
+    original_release = reader._release
+    monkeypatch.setattr(reader, "_release", lambda: (events.append(("release", None)), original_release()))
+
+    async def scenario():
+        read = asyncio.ensure_future(reader.read(0))
+        await asyncio.get_running_loop().run_in_executor(None, read_started.wait)
+        # Desconexión del cliente: se cancela la espera, pero la lectura sigue en su hilo
+        read.cancel()
+        reader.close()
+
+    asyncio.run(scenario())
+    reader._thread.shutdown(wait=True)
+    assert events == [("read", True), ("release", None)]
+    assert not os.path.exists(video_path)
+
+def test_closing_analysis_awaits_cancelled_inferences(monkeypatch, video_path):
+    started, finished = [], []
+
+    async def slow_predict(frame, model, detector=None):
+        started.append(1)
+        try:
+            await asyncio.sleep(0 if len(started) == 1 else 10)
+            return []
+        finally:
+            finished.append(1)
+
+    monkeypatch.setattr(service, "predict_emotion", slow_predict)
+    reader = VideoReader(video_path)
+
+    async def scenario():
+        items = analyze_video(reader, None, sample_fps=10, max_concurrency=4)
+        first = await items.__anext__()
+        await items.aclose()
+        return first
+
+    try:
+        first = asyncio.run(scenario())
+    finally:
+        reader.close()
+    assert first["type"] == "frame"
+    assert len(started) > 1
+    assert len(finished) == len(started)
@@ -0,0 +1,121 @@
+## @file tests/test_video_processing.py
+
+import asyncio
+import json
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from app.routes.video_processing_router import _process_latest_frame
+from app.services.video_processing_service import WebcamService
+from app.utils.frame_buffer import FrameRing
+from benchmarks.stubs import StubEmotionModel
+
+class FakeCapture:
+    """Captura que escribe en el buffer recibido un valor distinto por frame"""
+
+    def __init__(self):
+        self.frames = 0
+        self.grabbed = 0
+
+    def read(self, buffer):
+        self.frames += 1
+        buffer[...] = self.frames
+        return True, buffer
+
+    def grab(self):
+        self.frames += 1
+        self.grabbed += 1
+        return True
+
+    def release(self):
+        pass
+
+@pytest.fixture
+def service(tmp_path):
+    # Sin fuente real se usa el simulador; el hilo de captura no se arranca
+    return WebcamService(source=str(tmp_path / "no-existe.mp4"), source_id="test")
+
+def test_black_frame_before_first_capture(service):
+    result = asyncio.run(service.process_frame(StubEmotionModel()))
+    assert result["faces"] == []
+    assert result["frame_size"] == {"height": 480, "width": 640, "channels": 3}
+
+    frame = service.get_latest_frame()
+    assert frame.shape == (480, 640, 3) and not frame.any()
+
+def test_get_latest_frame_returns_writable_copy(service):
+    service.frames.write(np.full((4, 4, 3), 7, dtype=np.uint8))
+    frame = service.get_latest_frame()
+    frame[...] = 0
+    with service.acquire_frame() as (_, latest):
+        assert np.all(latest == 7)
+    assert service.frames.stats()["pinned"] == 0
+
+def test_read_frame_discards_when_ring_is_full(service):
+    service.frames = FrameRing(2)
+    service.cap = FakeCapture()
+    service._frame_shape = (4, 4, 3)
+
+    assert service._read_frame() is True
+    with service.acquire_frame() as (seq, pinned):
+        # Un hueco fijado por un lector y el otro es el último frame: no hay hueco libre
+        assert service._read_frame() is True
+        assert service._read_frame() is None
+        assert service.cap.grabbed == 1
+        assert service.frames.stats()["overruns"] == 1
+        assert np.all(pinned == 1)
+    with service.acquire_frame() as (_, latest):
+        assert np.all(latest == 2)
+
+    # Al liberar el hueco se vuelve a leer con normalidad, sin arrastrar frames viejos
+    assert service._read_frame() is True
+    with service.acquire_frame() as (_, latest):
+        assert np.all(latest == 4)
+
+def test_after_seq_requires_background_inference(service):
+    source = SimpleNamespace(service=service)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(_process_latest_frame(source, StubEmotionModel(), after_seq=0, timeout=1))
+    assert exc_info.value.status_code == 409
+
+    # Sin 'after_seq' se procesa el último frame como siempre
+    response = asyncio.run(_process_latest_frame(source, StubEmotionModel(), after_seq=None, timeout=1))
+    assert json.loads(response.body)["seq"] == 1
+
+def test_wait_result_skips_results_not_newer_than_after_seq(service):
+    async def scenario():
+        service._publish_result({"faces": []}, frame_seq=1)
+        waiter = asyncio.ensure_future(service.wait_result(after_seq=2, timeout=5))
+        await asyncio.sleep(0)
+        service._publish_result({"faces": []}, frame_seq=2)  # seq 2: todavía no basta
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        service._publish_result({"faces": []}, frame_seq=3)
+        return await waiter
+
+    assert asyncio.run(scenario())["seq"] == 3
+
+def test_long_poll_timeout_and_missing_result(service):
+    source = SimpleNamespace(service=service)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        # Simula la inferencia continua en marcha
+        service._inference_task = loop.create_future()
+        started = loop.time()
+        with pytest.raises(HTTPException) as exc_info:
+            await _process_latest_frame(source, StubEmotionModel(), after_seq=None, timeout=30)
+        # Sin resultados y sin 'after_seq' no se espera al plazo completo
+        assert exc_info.value.status_code == 503
+        assert loop.time() - started < 1
+
+        service._publish_result({"faces": []}, frame_seq=1)
+        timed_out = await _process_latest_frame(source, StubEmotionModel(), after_seq=1, timeout=0.05)
+        fresh = await _process_latest_frame(source, StubEmotionModel(), after_seq=0, timeout=0.05)
+        service._inference_task.cancel()
+        return timed_out, fresh
+
+    timed_out, fresh = asyncio.run(scenario())
+    assert timed_out.status_code == 204 and timed_out.body == b""
+    assert json.loads(fresh.body)["seq"] == 1